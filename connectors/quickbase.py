@@ -2,12 +2,50 @@
 Quickbase API Client
 Handles connection to Quickbase for historical negotiation data
 """
+import threading
 import requests
 import pandas as pd
 from datetime import datetime
 from typing import Optional, List, Dict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import QUICKBASE_REALM, QUICKBASE_TOKEN, QUICKBASE_TABLE_ID
 
+# (connect, read) seconds: fail fast when Quickbase can't be reached
+REQUEST_TIMEOUT = (3, 20)
+
+# One pooled HTTP session per (realm, token), shared by every QuickbaseClient
+# in the process so TCP/TLS connections are reused across calls
+_sessions: Dict[tuple, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _get_session(realm: str, token: str) -> requests.Session:
+    """Get (or create) the shared session for a realm/token, with auth headers attached"""
+    key = (realm, token)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                session.headers.update({
+                    'QB-Realm-Hostname': realm,
+                    'Authorization': f'QB-USER-TOKEN {token}',
+                    'Content-Type': 'application/json'
+                })
+                # Record queries are reads, so POST is safe to retry
+                retry = Retry(
+                    total=2,
+                    backoff_factor=0.2,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset({'GET', 'POST'}),
+                    raise_on_status=False
+                )
+                session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=retry))
+                _sessions[key] = session
+    return session
+
 
 class QuickbaseClient:
     """Client for interacting with Quickbase API"""
@@ -22,6 +60,7 @@ class QuickbaseClient:
             'Authorization': f'QB-USER-TOKEN {self.token}',
             'Content-Type': 'application/json'
         }
+        self.session = _get_session(self.realm, self.token)
 
     def query_negotiations(
         self,
@@ -72,11 +111,10 @@ class QuickbaseClient:
             payload['where'] = where_clause
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 f'{self.base_url}/records/query',
                 json=payload,
-                headers=self.headers,
-                timeout=30
+                timeout=REQUEST_TIMEOUT
             )
             response.raise_for_status()
 
@@ -139,11 +177,10 @@ class QuickbaseClient:
         """Get field definitions for the table"""
 
         try:
-            response = requests.get(
+            response = self.session.get(
                 f'{self.base_url}/fields',
-                headers=self.headers,
                 params={'tableId': self.table_id},
-                timeout=30
+                timeout=REQUEST_TIMEOUT
             )
             response.raise_for_status()
 
@@ -209,11 +246,10 @@ class QuickbaseClient:
         }
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 f'{self.base_url}/records/query',
                 json=query,
-                headers=self.headers,
-                timeout=30
+                timeout=REQUEST_TIMEOUT
             )
 
             if response.status_code == 200:
@@ -327,11 +363,10 @@ class QuickbaseClient:
         }
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 f'{self.base_url}/records/query',
                 json=query,
-                headers=self.headers,
-                timeout=30
+                timeout=REQUEST_TIMEOUT
             )
 
             if response.status_code == 200:
@@ -383,11 +418,10 @@ class QuickbaseClient:
         }
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 f'{self.base_url}/records/query',
                 json=query,
-                headers=self.headers,
-                timeout=30
+                timeout=REQUEST_TIMEOUT
             )
 
             if response.status_code == 200:
@@ -464,11 +498,10 @@ class QuickbaseClient:
         }
 
         try:
-            response = requests.post(
+            response = self.session.post(
                 f'{self.base_url}/records/query',
                 json=query,
-                headers=self.headers,
-                timeout=30
+                timeout=REQUEST_TIMEOUT
             )
 
             if response.status_code == 200:
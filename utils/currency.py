@@ -27,7 +27,7 @@ def get_usd_to_brl_rate():
     try:
         # Using exchangerate-api.com free tier (no API key needed)
         url = "https://api.exchangerate-api.com/v4/latest/USD"
-        response = requests.get(url, timeout=5)
+        response = requests.get(url, timeout=(2, 4))  # (connect, read) seconds
 
         if response.status_code == 200:
             data = response.json()
@@ -10,6 +10,8 @@ Usage:
 
 from connectors.neo4j_client import Neo4jClient
 from connectors.quickbase import QuickbaseClient
+from utils.scoring import gm_status_icon, haversine_meters
+import numpy as np
 import sys
 
 
@@ -66,7 +68,7 @@ def show_negotiation_strategy(service, target_vq_qb_id, all_associated_vqs, all_
         if stats['avg_discount'] > 0:
             negotiated_mrc = current_mrc * (1 - stats['avg_discount']/100)
             negotiated_gm = ((client_mrc - negotiated_mrc) / client_mrc * 100) if client_mrc > 0 else 0
-            negotiated_status = '✅' if negotiated_gm >= 50 else '⚠️' if negotiated_gm >= 40 else '❌'
+            negotiated_status = gm_status_icon(negotiated_gm)
 
             print(f"\n   💡 PROYECCIÓN CON NEGOCIACIÓN:")
             print(f"      Aplicando descuento promedio del {stats['avg_discount']:.1f}%:")
@@ -87,32 +89,24 @@ def show_negotiation_strategy(service, target_vq_qb_id, all_associated_vqs, all_
         # Sort by MRC
         vendor_vpl.sort(key=lambda x: x.get('mrc', 0))
 
-        # Verify location match
-        import math
-        def haversine_distance(lat1, lon1, lat2, lon2):
-            R = 6371000
-            phi1 = math.radians(float(lat1))
-            phi2 = math.radians(float(lat2))
-            delta_phi = math.radians(float(lat2) - float(lat1))
-            delta_lambda = math.radians(float(lon2) - float(lon1))
-            a = math.sin(delta_phi/2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda/2)**2
-            c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-            return R * c
-
-        for i, v in enumerate(vendor_vpl, 1):
+        # Verify location match (distance to every option in one pass)
+        distances = haversine_meters(
+            float(service['latitude']), float(service['longitude']),
+            np.array([v.get('latitude') for v in vendor_vpl], dtype=np.float64),
+            np.array([v.get('longitude') for v in vendor_vpl], dtype=np.float64)
+        )
+
+        for i, (v, distance_m) in enumerate(zip(vendor_vpl, distances), 1):
             vpl_mrc = v.get('mrc', 0)
             vpl_nrc = v.get('nrc', 0)
             gm = ((client_mrc - vpl_mrc) / client_mrc * 100) if client_mrc > 0 and vpl_mrc > 0 else 0
-            gm_status = '✅' if gm >= 50 else '⚠️' if gm >= 40 else '❌'
+            gm_status = gm_status_icon(gm)
 
             bw_bps = v.get('bandwidth_bps')
             bw_display = f"{bw_bps / 1_000_000:.0f} Mbps" if bw_bps else v.get('bandwidth', 'N/A')
             service_type = v.get('service_type', 'N/A')
 
             # Check location
-            vpl_lat = v.get('latitude')
-            vpl_lon = v.get('longitude')
-            distance_m = haversine_distance(service['latitude'], service['longitude'], vpl_lat, vpl_lon)
             location_note = "✅ MISMA UBICACIÓN" if distance_m == 0 else f"⚠️ {distance_m:.0f}m de distancia"
 
             print(f"\n   Opción {i}:")
@@ -124,7 +118,7 @@ def show_negotiation_strategy(service, target_vq_qb_id, all_associated_vqs, all_
             if stats and stats.get('has_data') and stats['avg_discount'] > 0:
                 vpl_negotiated_mrc = vpl_mrc * (1 - stats['avg_discount']/100)
                 vpl_negotiated_gm = ((client_mrc - vpl_negotiated_mrc) / client_mrc * 100) if client_mrc > 0 else 0
-                vpl_negotiated_status = '✅' if vpl_negotiated_gm >= 50 else '⚠️' if vpl_negotiated_gm >= 40 else '❌'
+                vpl_negotiated_status = gm_status_icon(vpl_negotiated_gm)
                 print(f"      Con negociación ({stats['avg_discount']:.1f}% desc): ${vpl_negotiated_mrc:,.2f} (GM: {vpl_negotiated_gm:.1f}% {vpl_negotiated_status})")
     else:
         print(f"   ❌ No se encontraron VPLs de {vendor_name}")
@@ -229,7 +223,7 @@ def analyze_all_options(service, associated, vpl):
             vendor_name = vq.get('vendor_name', 'Unknown')
             vq_mrc = vq.get('mrc', 0)
             gm = ((client_mrc - vq_mrc) / client_mrc * 100) if client_mrc > 0 else 0
-            gm_status = '✅' if gm >= 50 else '⚠️' if gm >= 40 else '❌'
+            gm_status = gm_status_icon(gm)
 
             bw_bps = vq.get('bandwidth_bps')
             bw_display = f"{bw_bps / 1_000_000:.0f} Mbps" if bw_bps else vq.get('bandwidth', 'N/A')
@@ -251,7 +245,7 @@ def analyze_all_options(service, associated, vpl):
                     if stats['avg_discount'] > 0:
                         negotiated_mrc = vq_mrc * (1 - stats['avg_discount']/100)
                         negotiated_gm = ((client_mrc - negotiated_mrc) / client_mrc * 100) if client_mrc > 0 else 0
-                        negotiated_status = '✅' if negotiated_gm >= 50 else '⚠️' if negotiated_gm >= 40 else '❌'
+                        negotiated_status = gm_status_icon(negotiated_gm)
                         print(f"   💡 Con negociación: ${negotiated_mrc:,.2f} (GM: {negotiated_gm:.1f}% {negotiated_status})")
     else:
         print("\n❌ No se encontraron VendorQuotes asociados")
@@ -293,7 +287,7 @@ def analyze_all_options(service, associated, vpl):
                 vpl_mrc = opt.get('mrc', 0)
                 vpl_nrc = opt.get('nrc', 0)
                 gm = ((client_mrc - vpl_mrc) / client_mrc * 100) if client_mrc > 0 and vpl_mrc > 0 else 0
-                gm_status = '✅' if gm >= 50 else '⚠️' if gm >= 40 else '❌'
+                gm_status = gm_status_icon(gm)
 
                 bw_bps = opt.get('bandwidth_bps')
                 bw_display = f"{bw_bps / 1_000_000:.0f} Mbps" if bw_bps else opt.get('bandwidth', 'N/A')
@@ -305,7 +299,7 @@ def analyze_all_options(service, associated, vpl):
                 if stats and stats.get('has_data') and stats['avg_discount'] > 0:
                     negotiated_mrc = vpl_mrc * (1 - stats['avg_discount']/100)
                     negotiated_gm = ((client_mrc - negotiated_mrc) / client_mrc * 100) if client_mrc > 0 else 0
-                    negotiated_status = '✅' if negotiated_gm >= 50 else '⚠️' if negotiated_gm >= 40 else '❌'
+                    negotiated_status = gm_status_icon(negotiated_gm)
                     print(f"         Con negociación ({stats['avg_discount']:.1f}% desc): ${negotiated_mrc:,.2f} (GM: {negotiated_gm:.1f}% {negotiated_status})")
     else:
         print("\n❌ No se encontraron opciones de VPL")
@@ -4,497 +4,413 @@ Margin Optimizer - Web Interface
 Flask application for analyzing vendor quotes and generating negotiation strategies
 """
 
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, g, render_template, request, session, stream_with_context
+from flask.logging import default_handler
 from flask_cors import CORS
 from datetime import datetime
-import traceback
+import atexit
+import hashlib
+import heapq
+import logging
+import threading
 import uuid
+from collections import defaultdict, deque
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from itertools import groupby, islice
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import orjson
 from neo4j.time import DateTime as Neo4jDateTime
+from werkzeug.exceptions import HTTPException
 
+try:
+    from flask_compress import Compress
+except ImportError:  # Compression is optional, responses are sent uncompressed
+    Compress = None
+
+from config import EAGER_CLIENT_INIT
 from connectors.neo4j_client import Neo4jClient
 from connectors.quickbase import QuickbaseClient
 from analyze_service import analyze_service, show_negotiation_strategy, analyze_all_options
 from utils.negotiation_strategy import generate_negotiation_strategy
+from utils.scoring import (
+    argmin_where, closest_bandwidth_rows, column, gm_status, score_vpl_rows, warm_up as warm_up_scoring
+)
+from utils.analyze_pipeline import (
+    RenewalVPLOption, build_ctx, resolve_currency, resolve_vpl_exchange_rate, score_associated, score_nearby,
+    score_vpl
+)
 
 app = Flask(__name__)
 app.secret_key = 'margin-optimizer-secret-key-change-in-production'
 
+# app.logger records are queued and written by a listener thread, so request
+# threads never block on stderr writes
+_log_queue = SimpleQueue()
+_log_listener = QueueListener(_log_queue, default_handler, respect_handler_level=True)
+_log_listener.start()
+app.logger.removeHandler(default_handler)
+app.logger.addHandler(QueueHandler(_log_queue))
+atexit.register(_log_listener.stop)
+
 # Enable CORS
 CORS(app)
 
+# gzip/brotli-compress JSON responses of 1 KB or more (SSE streams are left alone)
+if Compress is not None:
+    app.config['COMPRESS_MIN_SIZE'] = 1024
+    Compress(app)
+
+# Compile the quote scoring kernel now instead of on the first /api/analyze call
+warm_up_scoring()
+
 # Initialize clients globally
 neo4j_client = None
 qb_client = None
 
-# Cache for vendor stats to avoid repeated Quickbase calls during same request
-# This dramatically improves performance when processing many VPL options from same vendor
-vendor_stats_cache = {}
-renewal_stats_cache = {}
-delivered_mrc_cache = {}
+# Values convert_neo4j_types() never needs to touch
+_PRIMITIVE_TYPES = (str, int, float, bool)
 
 
 def convert_neo4j_types(obj):
     """
-    Recursively convert Neo4j types (DateTime, Date, etc.) to JSON-serializable types
+    Convert Neo4j types (DateTime, Date, etc.) to JSON-serializable types
+
+    Walks nested dicts/lists iteratively and replaces temporal values in place,
+    so payloads without Neo4j types are returned as-is without being copied.
+    Tuples are converted to lists.
     """
-    if obj is None:
-        return None
+    neo4j_datetime = Neo4jDateTime
 
-    # Handle Neo4j DateTime explicitly
-    if isinstance(obj, Neo4jDateTime):
-        return obj.isoformat()
+    if type(obj) is tuple:
+        obj = list(obj)
+    elif not isinstance(obj, (dict, list)):
+        return _convert_neo4j_value(obj, neo4j_datetime)
 
-    # Handle other datetime-like objects
-    if hasattr(obj, 'isoformat') and callable(getattr(obj, 'isoformat')):
-        try:
-            return obj.isoformat()
-        except:
-            pass
+    stack = deque([obj])
+    while stack:
+        container = stack.pop()
+        items = container.items() if isinstance(container, dict) else enumerate(container)
 
-    # Handle dictionaries
-    if isinstance(obj, dict):
-        return {key: convert_neo4j_types(value) for key, value in obj.items()}
-
-    # Handle lists/tuples
-    if isinstance(obj, (list, tuple)):
-        return [convert_neo4j_types(item) for item in obj]
+        for key, value in items:
+            value_type = type(value)
+            if value is None or value_type in _PRIMITIVE_TYPES:
+                continue
+            if value_type is tuple:
+                value = container[key] = list(value)
+                stack.append(value)
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+            else:
+                converted = _convert_neo4j_value(value, neo4j_datetime)
+                if converted is not value:
+                    container[key] = converted
 
-    # Return as-is for primitives
     return obj
 
 
-def init_clients():
-    """Initialize database clients"""
-    global neo4j_client, qb_client
-    if neo4j_client is None:
-        neo4j_client = Neo4jClient()
-    if qb_client is None:
-        qb_client = QuickbaseClient()
-
-
-def get_vendor_stats_cached(vendor_name):
-    """Get vendor negotiation stats with caching"""
-    if vendor_name not in vendor_stats_cache:
-        vendor_stats_cache[vendor_name] = qb_client.get_vendor_negotiation_stats(vendor_name)
-    return vendor_stats_cache[vendor_name]
-
-
-def get_renewal_stats_cached(vendor_name):
-    """Get vendor renewal stats with caching"""
-    if vendor_name not in renewal_stats_cache:
-        renewal_stats_cache[vendor_name] = qb_client.get_vendor_renewal_stats(vendor_name)
-    return renewal_stats_cache[vendor_name]
-
-
-def get_delivered_mrc_cached(vendor_name):
-    """Get vendor delivered MRC with caching"""
-    if vendor_name not in delivered_mrc_cache:
-        delivered_mrc_cache[vendor_name] = qb_client.get_vendor_delivered_mrc_total(vendor_name)
-    return delivered_mrc_cache[vendor_name]
+def _convert_neo4j_value(value, neo4j_datetime=Neo4jDateTime):
+    """Convert a single non-container value (DateTime, Date, ...) to a string"""
+    if type(value) is neo4j_datetime:
+        return value.isoformat()
 
+    # Handle other datetime-like objects
+    if hasattr(value, 'isoformat'):
+        try:
+            return value.isoformat()
+        except Exception:
+            pass
 
-@app.route('/')
-def index():
-    """Main page"""
-    return render_template('index.html')
+    return value
 
 
-@app.route('/api/analyze', methods=['POST'])
-def api_analyze():
-    """API endpoint to analyze a service"""
-    try:
-        # Clear cache at start of each request
-        global vendor_stats_cache, renewal_stats_cache, delivered_mrc_cache
-        vendor_stats_cache = {}
-        renewal_stats_cache = {}
-        delivered_mrc_cache = {}
+def _orjson_default(obj):
+    """orjson fallback for types it doesn't handle natively (Neo4j temporal types)"""
+    converted = _convert_neo4j_value(obj)
+    if converted is obj:
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+    return converted
 
-        data = request.json
-        service_id = data.get('service_id', '').strip()
-        vq_qb_id = data.get('vq_qb_id', '').strip()
 
-        if not service_id:
-            return jsonify({'error': 'Service ID is required'}), 400
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
 
-        # Initialize clients
-        init_clients()
 
-        # Get service details
-        service = neo4j_client.get_service_details(service_id)
+def orjson_response(payload, status=200):
+    """
+    Drop-in replacement for jsonify() that encodes with orjson
 
-        if not service:
-            return jsonify({'error': f'Service {service_id} not found'}), 404
+    Used for every JSON response, including errors, so all endpoints share
+    one encoder (numpy values and Neo4j temporal types included).
 
-        # Get vendor quotes
-        vendor_quotes = neo4j_client.get_vendor_quotes_for_service(
-            service_id,
-            include_nearby=True,
-            radius_meters=2000  # 2km radius for nearby quotes
-        )
+    Successful GET responses carry an ETag of the body, so a repeated fetch
+    with a matching If-None-Match gets an empty 304.
+    """
+    body = orjson.dumps(payload, default=_orjson_default, option=_ORJSON_OPTIONS)
+    response = app.response_class(body, status=status, mimetype='application/json')
+    if status == 200 and request.method in ('GET', 'HEAD'):
+        response.set_etag(hashlib.blake2b(body, digest_size=16).hexdigest())
+        response.make_conditional(request)
+    return response
 
-        associated = vendor_quotes.get('associated', [])
-        nearby = vendor_quotes.get('nearby', [])
-        vpl = vendor_quotes.get('vpl', [])
 
-        # Limit VPL options to prevent timeout on services with hundreds of options
-        # This improves performance dramatically while keeping enough options for analysis
-        MAX_VPL_OPTIONS = 150
-        if len(vpl) > MAX_VPL_OPTIONS:
-            print(f"[Performance] Limiting VPL from {len(vpl)} to {MAX_VPL_OPTIONS} options")
-            vpl = vpl[:MAX_VPL_OPTIONS]
+_clients_lock = threading.Lock()
 
-        # Get Client MRC from VOC Lines (accurate source)
-        voc_line = qb_client.get_voc_line_by_service(service_id)
-        if voc_line.get('has_data'):
-            client_mrc = voc_line.get('client_mrc', 0)
-            service_currency = voc_line.get('currency') or service.get('service_currency', 'USD')
-        else:
-            # Fallback to Neo4j if no VOC Line found
-            client_mrc = service.get('client_mrc', 0)
-            service_currency = service.get('service_currency', 'USD')
 
-        service_is_usd = (service_currency == 'USD')
+@app.errorhandler(HTTPException)
+def handle_http_error(e):
+    """Return HTTP errors (unknown route, wrong method, bad JSON body...) on /api/ as JSON"""
+    if not request.path.startswith('/api/'):
+        return e
+    response = orjson_response({'error': e.description}, e.code)
+    for key, value in e.get_headers():  # e.g. Allow on 405
+        if key != 'Content-Type':
+            response.headers[key] = value
+    return response
 
-        # Prepare response
-        response = {
-            'service': {
-                'service_id': service['service_id'],
-                'customer': service['customer'],
-                'bandwidth_display': service['bandwidth_display'],
-                'client_mrc': client_mrc,
-                'currency': service_currency,
-                'address': service['address'][:100] if service['address'] else 'N/A',
-                'latitude': service['latitude'],
-                'longitude': service['longitude']
-            },
-            'counts': {
-                'associated': len(associated),
-                'nearby': len(nearby),
-                'vpl': len(vpl)
-            },
-            'vendor_quotes': [],
-            'nearby_quotes': [],
-            'vpl_options': []
-        }
 
-        # Process associated vendor quotes
-        for vq in associated:
-            vendor_name = vq.get('vendor_name', 'Unknown')
-            vq_mrc_raw = vq.get('mrc', 0)
-            vq_exchange_rate = vq.get('exchange_rate', 1.0)
+def init_clients():
+    """
+    Initialize database clients
 
-            # Convert VQ to service currency
-            if service_is_usd and vq_exchange_rate and vq_exchange_rate > 1:
-                # VQ is in local currency (BRL), service is in USD - convert to USD
-                vq_mrc = vq_mrc_raw / vq_exchange_rate
-            else:
-                # Both in same currency or no conversion needed
-                vq_mrc = vq_mrc_raw
+    Cheap no-op once both clients exist. The first call connects and warms
+    them up; concurrent callers wait for it instead of connecting twice.
+    Clients are only published once warmed up.
+    """
+    global neo4j_client, qb_client
+    if neo4j_client is not None and qb_client is not None:
+        return
 
-            gm = ((client_mrc - vq_mrc) / client_mrc * 100) if client_mrc > 0 else 0
+    with _clients_lock:
+        if qb_client is None:
+            client = QuickbaseClient()
+            client.warm_up()
+            qb_client = client
+        if neo4j_client is None:
+            client = Neo4jClient()
+            client.warm_up()
+            neo4j_client = client
 
-            bw_bps = vq.get('bandwidth_bps')
-            bw_display = f"{bw_bps / 1_000_000:.0f} Mbps" if bw_bps else vq.get('bandwidth', 'N/A')
 
-            # Get negotiation stats (for VQ creation)
-            stats = get_vendor_stats_cached(vendor_name)
+# Connect in the background at import so the first requests after a deploy
+# don't pay for the Neo4j/Quickbase handshakes
+if EAGER_CLIENT_INIT:
+    threading.Thread(target=init_clients, name='client-warmup', daemon=True).start()
 
-            # Get renewal stats (for renewals)
-            renewal_stats = get_renewal_stats_cached(vendor_name)
 
-            # Get delivered MRC total for this vendor
-            delivered_mrc_stats = get_delivered_mrc_cached(vendor_name)
+# Shared pool for concurrent Quickbase and Neo4j lookups (one per process).
+# Only request threads submit to it, so pooled tasks never wait on each other.
+_IO_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix='backend-io')
 
-            vq_data = {
-                'vendor_name': vendor_name,
-                'quickbase_id': vq.get('quickbase_id'),
-                'neo4j_id': vq.get('id'),
-                'mrc': round(vq_mrc, 2),
-                'mrc_currency': service_currency,
-                'mrc_original': round(vq_mrc_raw, 2) if vq_mrc_raw != vq_mrc else None,
-                'mrc_original_currency': 'BRL' if (vq_mrc_raw != vq_mrc and vq_exchange_rate and vq_exchange_rate > 1) else None,
-                'exchange_rate': vq_exchange_rate if vq_exchange_rate and vq_exchange_rate > 1 else None,
-                'gm': round(gm, 1),
-                'gm_status': 'success' if gm >= 50 else 'warning' if gm >= 40 else 'danger',
-                'bandwidth': bw_display,
-                'status': vq.get('status', 'N/A'),
-                'lead_time': vq.get('lead_time', 'N/A'),
-                'has_negotiation_history': stats and stats.get('has_data', False),
-                'negotiation_stats': None,
-                'projected_with_negotiation': None,
-                'has_renewal_history': renewal_stats and renewal_stats.get('has_data', False),
-                'renewal_stats': None,
-                'has_delivered_services': delivered_mrc_stats and delivered_mrc_stats.get('has_data', False),
-                'delivered_mrc_total': round(delivered_mrc_stats.get('total_mrc_usd', 0), 2) if delivered_mrc_stats else 0,
-                'delivered_count': delivered_mrc_stats.get('delivered_count', 0) if delivered_mrc_stats else 0
-            }
 
-            if stats and stats.get('has_data'):
-                vq_data['negotiation_stats'] = {
-                    'total_negotiations': stats['total_negotiations'],
-                    'successful_negotiations': stats['successful_negotiations'],
-                    'success_rate': round(stats['success_rate'], 1),
-                    'avg_discount': round(stats['avg_discount'], 1),
-                    'best_discount': round(stats['best_discount'], 1)
-                }
+def _request_cache(name):
+    """
+    Per-request cache of one kind of vendor stats
 
-                if stats['avg_discount'] > 0:
-                    negotiated_mrc = vq_mrc * (1 - stats['avg_discount']/100)
-                    negotiated_gm = ((client_mrc - negotiated_mrc) / client_mrc * 100) if client_mrc > 0 else 0
-
-                    vq_data['projected_with_negotiation'] = {
-                        'mrc': round(negotiated_mrc, 2),
-                        'gm': round(negotiated_gm, 1),
-                        'gm_status': 'success' if negotiated_gm >= 50 else 'warning' if negotiated_gm >= 40 else 'danger',
-                        'avg_discount': round(stats['avg_discount'], 1),
-                        'best_discount': round(stats['best_discount'], 1)
-                    }
-
-                    # Also calculate with best discount
-                    if stats['best_discount'] > 0:
-                        best_negotiated_mrc = vq_mrc * (1 - stats['best_discount']/100)
-                        best_negotiated_gm = ((client_mrc - best_negotiated_mrc) / client_mrc * 100) if client_mrc > 0 else 0
-
-                        vq_data['projected_with_negotiation']['best_mrc'] = round(best_negotiated_mrc, 2)
-                        vq_data['projected_with_negotiation']['best_gm'] = round(best_negotiated_gm, 1)
-                        vq_data['projected_with_negotiation']['best_gm_status'] = 'success' if best_negotiated_gm >= 50 else 'warning' if best_negotiated_gm >= 40 else 'danger'
-
-            # Add renewal stats if available
-            if renewal_stats and renewal_stats.get('has_data'):
-                vq_data['renewal_stats'] = {
-                    'total_renewals': renewal_stats['total_renewals'],
-                    'successful_renewals': renewal_stats['successful_renewals'],
-                    'success_rate': round(renewal_stats['success_rate'], 1),
-                    'avg_discount': round(renewal_stats['avg_discount'], 1)
-                }
+    Kept on flask.g, so concurrent requests (and a ?stream=1 response still
+    being generated) each see their own dict. It avoids repeated Quickbase
+    calls when many VPL options come from the same vendor.
+    """
+    return g.setdefault(name, {})
 
-            response['vendor_quotes'].append(vq_data)
 
-        # Process nearby vendor quotes (within 2000m, last 12 months)
-        # Convert Neo4j types first
-        nearby = convert_neo4j_types(nearby)
+def prefetch_vendor_stats(negotiation=(), renewal=(), delivered=()):
+    """
+    Fetch vendor stats concurrently into the per-request caches
 
-        for vq in nearby:
-            # Filter by distance: only include quotes within 2000 meters (2km)
-            distance_meters = vq.get('distance_meters', 0)
-            if distance_meters > 2000:
-                continue  # Skip this quote if it's too far
+    Each argument is an iterable of vendor names for that kind of stats.
+    Names already cached are skipped; the *_cached getters below then
+    return the prefetched values without another Quickbase round trip.
+    Each kind of stats for several vendors is fetched in one bulk query.
+    """
+    kinds = (
+        (_request_cache('vendor_stats'), qb_client.get_vendor_negotiation_stats,
+         qb_client.get_vendor_negotiation_stats_bulk, negotiation),
+        (_request_cache('renewal_stats'), qb_client.get_vendor_renewal_stats,
+         qb_client.get_vendor_renewal_stats_bulk, renewal),
+        (_request_cache('delivered_mrc'), qb_client.get_vendor_delivered_mrc_total,
+         qb_client.get_vendor_delivered_mrc_total_bulk, delivered)
+    )
+
+    work = []
+    bulk_work = []
+    for cache, fetch, fetch_bulk, vendor_names in kinds:
+        pending = [vendor_name for vendor_name in dict.fromkeys(vendor_names) if vendor_name not in cache]
+        if len(pending) > 1:
+            bulk_work.append((cache, fetch, pending, _IO_POOL.submit(fetch_bulk, pending)))
+        else:
+            work.extend((cache, fetch, vendor_name) for vendor_name in pending)
 
-            vendor_name = vq.get('vendor_name', 'Unknown')
-            vq_mrc_raw = vq.get('mrc', 0)
-            vq_exchange_rate = vq.get('exchange_rate', 1.0)
+    results = _IO_POOL.map(lambda item: item[1](item[2]), work)
+    for (cache, _, vendor_name), result in zip(work, results):
+        cache[vendor_name] = result
 
-            # Convert VQ to service currency
-            if service_is_usd and vq_exchange_rate and vq_exchange_rate > 1:
-                # VQ is in local currency (BRL), service is in USD - convert to USD
-                vq_mrc = vq_mrc_raw / vq_exchange_rate
-            else:
-                # Both in same currency or no conversion needed
-                vq_mrc = vq_mrc_raw
+    for cache, fetch, pending, bulk_future in bulk_work:
+        cache.update(bulk_future.result())
+        # Vendors the bulk query failed or couldn't fully cover: one lookup each
+        missing = [vendor_name for vendor_name in pending if vendor_name not in cache]
+        for vendor_name, result in zip(missing, _IO_POOL.map(fetch, missing)):
+            cache[vendor_name] = result
 
-            gm = ((client_mrc - vq_mrc) / client_mrc * 100) if client_mrc > 0 else 0
 
-            bw_bps = vq.get('bandwidth_bps')
-            bw_display = f"{bw_bps / 1_000_000:.0f} Mbps" if bw_bps else vq.get('bandwidth', 'N/A')
+def get_vendor_stats_cached(vendor_name):
+    """Get vendor negotiation stats with caching"""
+    vendor_stats_cache = _request_cache('vendor_stats')
+    if vendor_name not in vendor_stats_cache:
+        vendor_stats_cache[vendor_name] = qb_client.get_vendor_negotiation_stats(vendor_name)
+    return vendor_stats_cache[vendor_name]
 
-            # Get negotiation stats
-            stats = get_vendor_stats_cached(vendor_name)
 
-            vq_data = {
-                'vendor_name': vendor_name,
-                'quickbase_id': vq.get('quickbase_id'),
-                'neo4j_id': vq.get('vq_id'),
-                'mrc': round(vq_mrc, 2),
-                'mrc_currency': service_currency,
-                'mrc_original': round(vq_mrc_raw, 2) if vq_mrc_raw != vq_mrc else None,
-                'mrc_original_currency': 'BRL' if (vq_mrc_raw != vq_mrc and vq_exchange_rate and vq_exchange_rate > 1) else None,
-                'exchange_rate': vq_exchange_rate if vq_exchange_rate and vq_exchange_rate > 1 else None,
-                'gm': round(gm, 1),
-                'gm_status': 'success' if gm >= 50 else 'warning' if gm >= 40 else 'danger',
-                'bandwidth': bw_display,
-                'status': vq.get('status', 'N/A'),
-                'lead_time': vq.get('lead_time', 'N/A'),
-                'distance_meters': round(vq.get('distance_meters', 0)),
-                'date_created': vq.get('date_created', 'N/A'),
-                'has_negotiation_history': stats and stats.get('has_data', False),
-                'negotiation_stats': None,
-                'projected_with_negotiation': None
-            }
-
-            if stats and stats.get('has_data'):
-                vq_data['negotiation_stats'] = {
-                    'total_negotiations': stats['total_negotiations'],
-                    'successful_negotiations': stats['successful_negotiations'],
-                    'success_rate': round(stats['success_rate'], 1),
-                    'avg_discount': round(stats['avg_discount'], 1),
-                    'best_discount': round(stats['best_discount'], 1)
-                }
+def get_renewal_stats_cached(vendor_name):
+    """Get vendor renewal stats with caching"""
+    renewal_stats_cache = _request_cache('renewal_stats')
+    if vendor_name not in renewal_stats_cache:
+        renewal_stats_cache[vendor_name] = qb_client.get_vendor_renewal_stats(vendor_name)
+    return renewal_stats_cache[vendor_name]
 
-                if stats['avg_discount'] > 0:
-                    negotiated_mrc = vq_mrc * (1 - stats['avg_discount']/100)
-                    negotiated_gm = ((client_mrc - negotiated_mrc) / client_mrc * 100) if client_mrc > 0 else 0
-
-                    vq_data['projected_with_negotiation'] = {
-                        'mrc': round(negotiated_mrc, 2),
-                        'gm': round(negotiated_gm, 1),
-                        'gm_status': 'success' if negotiated_gm >= 50 else 'warning' if negotiated_gm >= 40 else 'danger',
-                        'avg_discount': round(stats['avg_discount'], 1),
-                        'best_discount': round(stats['best_discount'], 1)
-                    }
-
-                    # Also calculate with best discount
-                    if stats['best_discount'] > 0:
-                        best_negotiated_mrc = vq_mrc * (1 - stats['best_discount']/100)
-                        best_negotiated_gm = ((client_mrc - best_negotiated_mrc) / client_mrc * 100) if client_mrc > 0 else 0
-
-                        vq_data['projected_with_negotiation']['best_mrc'] = round(best_negotiated_mrc, 2)
-                        vq_data['projected_with_negotiation']['best_gm'] = round(best_negotiated_gm, 1)
-                        vq_data['projected_with_negotiation']['best_gm_status'] = 'success' if best_negotiated_gm >= 50 else 'warning' if best_negotiated_gm >= 40 else 'danger'
-
-            response['nearby_quotes'].append(vq_data)
-
-        # Process VPL options grouped by vendor
-        # Filter to show only most relevant bandwidth options per vendor
-        service_bw = service.get('bandwidth_bps')
-
-        # Get exchange rate for VPL conversion (if needed)
-        vpl_exchange_rate = None
-        if not service_is_usd:
-            # Service is in local currency, need exchange rate to convert VPL from USD to BRL
-            # Use live exchange rate from Google/API
-            from utils.currency import get_usd_to_brl_rate
-            vpl_exchange_rate = get_usd_to_brl_rate()
-
-        vpl_by_vendor = {}
-        for v in vpl:
-            vendor_name = v.get('vendor_name', 'Unknown')
-            if vendor_name not in vpl_by_vendor:
-                vpl_by_vendor[vendor_name] = {
-                    'vendor_name': vendor_name,
-                    'all_options': [],
-                    'options': [],
-                    'negotiation_stats': None
-                }
 
-            # VPL comes in USD from Neo4j (already converted from local currency)
-            # Now we need to match the service currency
-            vpl_mrc_usd = v.get('mrc', 0)  # This is already in USD
+def get_delivered_mrc_cached(vendor_name):
+    """Get vendor delivered MRC with caching"""
+    delivered_mrc_cache = _request_cache('delivered_mrc')
+    if vendor_name not in delivered_mrc_cache:
+        delivered_mrc_cache[vendor_name] = qb_client.get_vendor_delivered_mrc_total(vendor_name)
+    return delivered_mrc_cache[vendor_name]
 
-            if service_is_usd:
-                # Service is in USD, use VPL as-is (USD)
-                vpl_mrc = vpl_mrc_usd
-            else:
-                # Service is in local currency, convert VPL from USD to local
-                vpl_mrc = vpl_mrc_usd * vpl_exchange_rate
 
-            gm = ((client_mrc - vpl_mrc) / client_mrc * 100) if client_mrc > 0 and vpl_mrc > 0 else 0
+# Service fields copied as-is into the 'service' block of analysis responses
+_SVC_KEYS = ('service_id', 'customer', 'bandwidth_display', 'latitude', 'longitude')
+_ADDRESS_MAX_LEN = 100
 
-            bw_bps = v.get('bandwidth_bps')
-            bw_display = f"{bw_bps / 1_000_000:.0f} Mbps" if bw_bps else v.get('bandwidth', 'N/A')
 
-            vpl_nrc_usd = v.get('nrc', 0)
+def _service_view(service, client_mrc, currency, **overrides):
+    """'service' block of an analysis response (overrides replace/add fields)"""
+    view = {key: service[key] for key in _SVC_KEYS}
+    view['client_mrc'] = client_mrc
+    view['currency'] = currency
+    address = service['address']
+    view['address'] = address[:_ADDRESS_MAX_LEN] if address else 'N/A'
+    if overrides:
+        view.update(overrides)
+    return view
 
-            if service_is_usd:
-                # Service is in USD, use VPL NRC as-is (USD)
-                vpl_nrc = vpl_nrc_usd
-            else:
-                # Service is in local currency, convert VPL NRC from USD to local
-                vpl_nrc = vpl_nrc_usd * vpl_exchange_rate
-
-            option = {
-                'mrc': round(vpl_mrc, 2),
-                'mrc_currency': service_currency,
-                'mrc_usd': round(vpl_mrc_usd, 2) if not service_is_usd else None,  # Only show USD ref if service is not in USD
-                'nrc': round(vpl_nrc, 2),
-                'nrc_currency': service_currency,
-                'nrc_usd': round(vpl_nrc_usd, 2) if not service_is_usd else None,  # Only show USD ref if service is not in USD
-                'gm': round(gm, 1),
-                'gm_status': 'success' if gm >= 50 else 'warning' if gm >= 40 else 'danger',
-                'bandwidth': bw_display,
-                'bandwidth_bps': bw_bps,
-                'service_type': v.get('service_type', 'N/A')
-            }
-            vpl_by_vendor[vendor_name]['all_options'].append(option)
 
-        # Filter options per vendor to show only most relevant by bandwidth
-        for vendor_name, vendor_data in vpl_by_vendor.items():
-            all_opts = vendor_data['all_options']
+def _analyze_sections(service_id, service):
+    """
+    Build the /api/analyze response one section at a time
 
-            if not all_opts:
-                continue
+    Yields (section name, payload) pairs in the order they become available:
+    service, counts, vendor_quotes, nearby_quotes, vpl_options.
+    """
+    # Get Client MRC from VOC Lines (accurate source)
+    voc_line = qb_client.get_voc_line_by_service(service_id, mrc_only=True)
+    client_mrc, service_currency = resolve_currency(service, voc_line)
+    yield 'service', _service_view(service, client_mrc, service_currency)
+
+    # Get vendor quotes
+    vendor_quotes = neo4j_client.get_vendor_quotes_for_service(
+        service_id,
+        include_nearby=True,
+        radius_meters=2000  # 2km radius for nearby quotes
+    )
+
+    associated = vendor_quotes.get('associated', [])
+    nearby = vendor_quotes.get('nearby', [])
+    vpl = vendor_quotes.get('vpl', [])
+
+    # Limit VPL options to prevent timeout on services with hundreds of options
+    # This improves performance dramatically while keeping enough options for analysis
+    MAX_VPL_OPTIONS = 150
+    if len(vpl) > MAX_VPL_OPTIONS:
+        print(f"[Performance] Limiting VPL from {len(vpl)} to {MAX_VPL_OPTIONS} options")
+        vpl = vpl[:MAX_VPL_OPTIONS]
+
+    yield 'counts', {
+        'associated': len(associated),
+        'nearby': len(nearby),
+        'vpl': len(vpl)
+    }
+
+    # Fetch every vendor stat the scoring steps need in parallel
+    associated_vendors = [vq.get('vendor_name', 'Unknown') for vq in associated]
+    prefetch_vendor_stats(
+        negotiation=associated_vendors
+        + [vq.get('vendor_name', 'Unknown') for vq in nearby if vq.get('distance_meters', 0) <= 2000]
+        + [v.get('vendor_name', 'Unknown') for v in vpl],
+        renewal=associated_vendors,
+        delivered=associated_vendors
+    )
+
+    ctx = build_ctx(service, voc_line, vpl)
+
+    yield 'vendor_quotes', score_associated(
+        associated,
+        ctx,
+        get_vendor_stats_cached,
+        get_renewal_stats_cached,
+        get_delivered_mrc_cached
+    )
+
+    # Nearby vendor quotes within 2000m (Neo4j types converted first)
+    yield 'nearby_quotes', score_nearby(convert_neo4j_types(nearby), ctx, get_vendor_stats_cached, radius=2000)
+
+    # VPL options grouped by vendor, most relevant bandwidth per vendor
+    yield 'vpl_options', score_vpl(vpl, ctx, service.get('bandwidth_bps'), get_vendor_stats_cached)
+
+
+def _sse_events(sections):
+    """Encode (name, payload) sections as Server-Sent Events, ending with 'done' or 'error'"""
+    try:
+        for name, payload in sections:
+            data = orjson.dumps(payload, default=_orjson_default, option=_ORJSON_OPTIONS)
+            yield b'event: ' + name.encode() + b'\ndata: ' + data + b'\n\n'
+        yield b'event: done\ndata: {}\n\n'
+    except Exception as e:
+        app.logger.exception("api_analyze stream failed")
+        yield b'event: error\ndata: ' + orjson.dumps({'error': str(e)}) + b'\n\n'
 
-            # Sort by bandwidth
-            all_opts.sort(key=lambda x: x.get('bandwidth_bps') or 0)
 
-            if service_bw:
-                # Find exact match
-                exact_match = [o for o in all_opts if o.get('bandwidth_bps') == service_bw]
+@app.route('/')
+def index():
+    """Main page"""
+    return render_template('index.html')
 
-                if exact_match:
-                    # If multiple exact matches, keep only one (best GM)
-                    exact_match.sort(key=lambda x: x['gm'], reverse=True)
-                    vendor_data['options'].append(exact_match[0])
-                else:
-                    # Find closest higher bandwidth
-                    higher = [o for o in all_opts if o.get('bandwidth_bps', 0) > service_bw]
-                    if higher:
-                        vendor_data['options'].append(higher[0])  # First one (smallest higher)
-                    else:
-                        # No higher, use closest lower
-                        lower = [o for o in all_opts if o.get('bandwidth_bps', 0) < service_bw]
-                        if lower:
-                            vendor_data['options'].append(lower[-1])  # Last one (largest lower)
-            else:
-                # No service bandwidth, show only best GM option
-                all_opts.sort(key=lambda x: x['gm'], reverse=True)
-                if all_opts:
-                    vendor_data['options'].append(all_opts[0])
 
-            # Remove temporary all_options
-            del vendor_data['all_options']
+@app.route('/api/analyze', methods=['POST'])
+def api_analyze():
+    """API endpoint to analyze a service"""
+    try:
+        data = request.json
+        service_id = data.get('service_id', '').strip()
+        vq_qb_id = data.get('vq_qb_id', '').strip()
 
-        # Add negotiation stats to VPL vendors
-        for vendor_name, vendor_data in vpl_by_vendor.items():
-            stats = get_vendor_stats_cached(vendor_name)
-            if stats and stats.get('has_data'):
-                vendor_data['negotiation_stats'] = {
-                    'total_negotiations': stats['total_negotiations'],
-                    'success_rate': round(stats['success_rate'], 1),
-                    'avg_discount': round(stats['avg_discount'], 1),
-                    'best_discount': round(stats['best_discount'], 1)
-                }
+        if not service_id:
+            return orjson_response({'error': 'Service ID is required'}, 400)
 
-                # Add projected prices with negotiation for each option
-                if stats['avg_discount'] > 0:
-                    for option in vendor_data['options']:
-                        # Average discount projection
-                        negotiated_mrc = option['mrc'] * (1 - stats['avg_discount']/100)
-                        negotiated_gm = ((client_mrc - negotiated_mrc) / client_mrc * 100) if client_mrc > 0 else 0
-                        option['projected_with_negotiation'] = {
-                            'mrc': round(negotiated_mrc, 2),
-                            'gm': round(negotiated_gm, 1),
-                            'gm_status': 'success' if negotiated_gm >= 50 else 'warning' if negotiated_gm >= 40 else 'danger',
-                            'avg_discount': round(stats['avg_discount'], 1),
-                            'best_discount': round(stats['best_discount'], 1)
-                        }
+        # Initialize clients
+        init_clients()
 
-                        # Best discount projection
-                        if stats['best_discount'] > 0:
-                            best_negotiated_mrc = option['mrc'] * (1 - stats['best_discount']/100)
-                            best_negotiated_gm = ((client_mrc - best_negotiated_mrc) / client_mrc * 100) if client_mrc > 0 else 0
+        # Get service details
+        service = neo4j_client.get_service_details(service_id)
 
-                            option['projected_with_negotiation']['best_mrc'] = round(best_negotiated_mrc, 2)
-                            option['projected_with_negotiation']['best_gm'] = round(best_negotiated_gm, 1)
-                            option['projected_with_negotiation']['best_gm_status'] = 'success' if best_negotiated_gm >= 50 else 'warning' if best_negotiated_gm >= 40 else 'danger'
+        if not service:
+            return orjson_response({'error': f'Service {service_id} not found'}, 404)
 
-        response['vpl_options'] = list(vpl_by_vendor.values())
+        # ?stream=1 sends each section as a Server-Sent Event as soon as it is
+        # ready; the default is a single JSON document with the same sections
+        if request.args.get('stream') == '1':
+            return Response(
+                stream_with_context(_sse_events(_analyze_sections(service_id, service))),
+                mimetype='text/event-stream',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
 
-        return jsonify(response)
+        response = dict(_analyze_sections(service_id, service))
+        return orjson_response(response)
 
     except Exception as e:
-        print(f"Error in api_analyze: {e}")
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+        app.logger.exception("api_analyze failed")
+        return orjson_response({'error': str(e)}, 500)
 
 
 
@@ -502,32 +418,46 @@ def api_analyze():
 def api_analyze_renewal():
     """API endpoint to analyze a service for renewal negotiation"""
     try:
-        # Clear cache at start of each request
-        global vendor_stats_cache, renewal_stats_cache, delivered_mrc_cache
-        vendor_stats_cache = {}
-        renewal_stats_cache = {}
-        delivered_mrc_cache = {}
-
         data = request.json
         service_id = data.get('service_id', '').strip()
 
         if not service_id:
-            return jsonify({'error': 'Service ID is required'}), 400
+            return orjson_response({'error': 'Service ID is required'}, 400)
 
         # Initialize clients
         init_clients()
 
+        # Service details (Neo4j), VOC Line (Quickbase) and vendor quotes
+        # (associated, nearby and VPL options) are independent - fetch them in parallel
+        service_future = _IO_POOL.submit(neo4j_client.get_service_details, service_id)
+        voc_line_future = _IO_POOL.submit(qb_client.get_voc_line_by_service, service_id)
+        vendor_quotes_future = _IO_POOL.submit(
+            neo4j_client.get_vendor_quotes_for_service,
+            service_id,
+            include_nearby=True,
+            radius_meters=10000
+        )
+
         # Get service details from Neo4j
-        service = neo4j_client.get_service_details(service_id)
+        service = service_future.result()
 
         if not service:
-            return jsonify({'error': f'Service {service_id} not found'}), 404
+            return orjson_response({'error': f'Service {service_id} not found'}, 404)
+
+        # Get service bandwidth in bps for filtering
+        # Try Neo4j first, then fallback to Quickbase services table (requested
+        # now so it runs alongside the VOC Line and vendor stats lookups)
+        service_bandwidth_bps = service.get('bandwidth_bps')
+        service_bandwidth_display = service.get('bandwidth_display', 'N/A')
+        qb_bandwidth_future = None
+        if not service_bandwidth_bps or service_bandwidth_display == 'N/A':
+            qb_bandwidth_future = _IO_POOL.submit(qb_client.get_service_bandwidth, service_id)
 
         # Get VOC Line data (current vendor and margin)
-        voc_line = qb_client.get_voc_line_by_service(service_id)
+        voc_line = voc_line_future.result()
         
         if not voc_line.get('has_data'):
-            return jsonify({'error': f'No VOC Line found for service {service_id}'}), 404
+            return orjson_response({'error': f'No VOC Line found for service {service_id}'}, 404)
 
         current_vendor = voc_line['vendor_name']
         vendor_mrc = voc_line['vendor_mrc']  # In local currency
@@ -539,24 +469,24 @@ def api_analyze_renewal():
         client_mrc_usd = voc_line.get('client_mrc_usd', 0)  # In USD
         service_currency = voc_line.get('currency') or service.get('service_currency', 'USD')
 
-        # Alias for backward compatibility with recommendations code
-        current_mrc = vendor_mrc  # Vendor MRC in local currency
+        # All MRC comparisons below (nearby quotes, VPL rows, recommendations)
+        # are made in the service's local currency: the VOC Line MRC already
+        # is, and VPL prices are converted once when they are scored
+        current_mrc = vendor_mrc
         
-        # Get renewal statistics for current vendor
+        # Get detailed renewal history for this vendor (in parallel with the stats below)
+        renewal_history_future = _IO_POOL.submit(qb_client.get_renewal_history_by_vendor, current_vendor, service_id)
+
+        # Get renewal and negotiation statistics for current vendor in parallel
+        prefetch_vendor_stats(negotiation=[current_vendor], renewal=[current_vendor])
         renewal_stats = get_renewal_stats_cached(current_vendor)
-        
-        # Get detailed renewal history for this vendor
-        renewal_history = qb_client.get_renewal_history_by_vendor(current_vendor, service_id)
+        renewal_history = renewal_history_future.result()
         
         # Get negotiation stats for current vendor (from VQ creation)
         negotiation_stats = get_vendor_stats_cached(current_vendor)
         
-        # Get vendor quotes (associated, nearby and VPL options)
-        vendor_quotes = neo4j_client.get_vendor_quotes_for_service(
-            service_id,
-            include_nearby=True,
-            radius_meters=10000
-        )
+        # Vendor quotes were requested up front
+        vendor_quotes = vendor_quotes_future.result()
 
         associated = vendor_quotes.get('associated', [])
         nearby = vendor_quotes.get('nearby', [])
@@ -571,31 +501,22 @@ def api_analyze_renewal():
         all_nearby_quotes = associated + nearby
         app.logger.info(f"DEBUG: Total quotes to process (associated + nearby): {len(all_nearby_quotes)}")
 
-        # Get service bandwidth in bps for filtering
-        # Try Neo4j first, then fallback to Quickbase services table
-        service_bandwidth_bps = service.get('bandwidth_bps')
-        service_bandwidth_display = service.get('bandwidth_display', 'N/A')
-
-        if not service_bandwidth_bps or service_bandwidth_display == 'N/A':
-            # Bandwidth not in Neo4j, try Quickbase services table
-            qb_bandwidth = qb_client.get_service_bandwidth(service_id)
+        if qb_bandwidth_future is not None:
+            # Bandwidth not in Neo4j, use the Quickbase services table
+            qb_bandwidth = qb_bandwidth_future.result()
             if qb_bandwidth.get('has_data'):
                 service_bandwidth_bps = qb_bandwidth.get('bandwidth_bps')
                 service_bandwidth_display = qb_bandwidth.get('bandwidth_display', 'N/A')
 
         # Build response
         response = {
-            'service': {
-                'service_id': service['service_id'],
-                'customer': service['customer'],
-                'bandwidth_display': service_bandwidth_display,
-                'bandwidth_bps': service_bandwidth_bps,
-                'client_mrc': client_mrc,
-                'currency': service_currency,
-                'address': service['address'][:100] if service['address'] else 'N/A',
-                'latitude': service['latitude'],
-                'longitude': service['longitude']
-            },
+            'service': _service_view(
+                service,
+                client_mrc,
+                service_currency,
+                bandwidth_display=service_bandwidth_display,
+                bandwidth_bps=service_bandwidth_bps
+            ),
             'voc_line': {
                 'record_id': voc_line['record_id'],
                 'vendor_name': current_vendor,
@@ -648,6 +569,14 @@ def api_analyze_renewal():
         all_nearby_quotes = convert_neo4j_types(all_nearby_quotes)
         app.logger.info(f"DEBUG: After convert_neo4j_types, all_nearby_quotes has {len(all_nearby_quotes)} VQs")
 
+        # Client MRC check done once for every quote's GM
+        cm_pos = client_mrc > 0
+
+        # Lowest-MRC nearby quote from the current vendor and from the others,
+        # tracked while the list is built (used by recommendations 3 / 3b)
+        best_nearby = None
+        best_alt_nearby = None
+
         for vq in all_nearby_quotes:
             distance_meters = vq.get('distance_meters')
 
@@ -660,7 +589,7 @@ def api_analyze_renewal():
             # Include all vendors, not just current vendor
             vendor_name = vq.get('vendor_name', 'Unknown')
             vq_mrc = vq.get('mrc', 0)
-            gm = ((client_mrc - vq_mrc) / client_mrc * 100) if client_mrc > 0 else 0
+            gm = (client_mrc - vq_mrc) / client_mrc * 100 if cm_pos else 0
 
             # Mark if it's the same vendor
             is_same_vendor = (vendor_name == current_vendor)
@@ -670,7 +599,7 @@ def api_analyze_renewal():
 
             app.logger.info(f"DEBUG: Adding VQ - vendor: {vendor_name}, distance: {distance_meters}, is_associated: {is_associated}, is_same: {is_same_vendor}")
 
-            response['nearby_quotes'].append({
+            nearby_quote = {
                 'service_id': vq.get('service_id', service_id),  # Use current service_id if not set
                 'vendor_name': vendor_name,
                 'is_same_vendor': is_same_vendor,
@@ -682,17 +611,20 @@ def api_analyze_renewal():
                 'bandwidth': vq.get('bandwidth', 'N/A'),
                 'service_type': vq.get('service_type', 'N/A'),
                 'quickbase_id': vq.get('quickbase_id')
-            })
+            }
+            response['nearby_quotes'].append(nearby_quote)
+
+            if is_same_vendor:
+                if best_nearby is None or nearby_quote['mrc'] < best_nearby['mrc']:
+                    best_nearby = nearby_quote
+            elif best_alt_nearby is None or nearby_quote['mrc'] < best_alt_nearby['mrc']:
+                best_alt_nearby = nearby_quote
 
         app.logger.info(f"DEBUG: Final nearby_quotes count: {len(response['nearby_quotes'])}")
         
         # Process VPL options - filter by service bandwidth
         service_is_usd = (service_currency == 'USD')
-        if not service_is_usd:
-            from utils.currency import get_usd_to_brl_rate
-            vpl_exchange_rate = get_usd_to_brl_rate()
-        else:
-            vpl_exchange_rate = None
+        vpl_exchange_rate = resolve_vpl_exchange_rate(service_is_usd, vpl)
 
         # First pass: collect VPLs with exact bandwidth match
         exact_match_vpls = []
@@ -731,17 +663,18 @@ def api_analyze_renewal():
         else:
             # Service has NO bandwidth - show only most cost-effective bandwidth
             if exact_match_vpls:
-                from collections import defaultdict
-                bw_groups = defaultdict(list)
+                # Running [count, total MRC] per bandwidth
+                bw_groups = defaultdict(lambda: [0, 0.0])
                 for v in exact_match_vpls:
                     bw_bps = v.get('bandwidth_bps')
                     if bw_bps:
-                        bw_groups[bw_bps].append(v.get('mrc', float('inf')))
+                        group = bw_groups[bw_bps]
+                        group[0] += 1
+                        group[1] += v.get('mrc', float('inf'))
 
                 if bw_groups:
-                    # Find bandwidth with lowest average MRC
-                    best_bw = min(bw_groups.keys(),
-                                key=lambda bw: sum(bw_groups[bw]) / len(bw_groups[bw]) if bw_groups[bw] else float('inf'))
+                    # Find bandwidth with lowest average MRC (every group has count >= 1)
+                    best_bw = min(bw_groups, key=lambda bw: bw_groups[bw][1] / bw_groups[bw][0])
                     # Show all VPLs with that bandwidth
                     vpls_to_show = [v for v in exact_match_vpls if v.get('bandwidth_bps') == best_bw]
                 else:
@@ -749,40 +682,46 @@ def api_analyze_renewal():
             else:
                 vpls_to_show = []
 
-        # Process selected VPLs
-        for v in vpls_to_show:
-            vpl_mrc_usd = v.get('mrc', 0)
-
-            if service_is_usd:
-                vpl_mrc = vpl_mrc_usd
-            else:
-                vpl_mrc = vpl_mrc_usd * vpl_exchange_rate
-
-            gm = ((client_mrc - vpl_mrc) / client_mrc * 100) if client_mrc > 0 and vpl_mrc > 0 else 0
+        # Process selected VPLs: convert and score every row in one vectorized pass
+        vpl_scores = score_vpl_rows(
+            column(vpls_to_show, 'mrc'),
+            column(vpls_to_show, 'nrc'),
+            client_mrc,
+            vpl_exchange_rate
+        )
+        is_current_vpl = np.fromiter(
+            (v.get('vendor_name') == current_vendor for v in vpls_to_show),
+            dtype=bool,
+            count=len(vpls_to_show)
+        )
 
+        for i, v in enumerate(vpls_to_show):
             bw_bps = v.get('bandwidth_bps')
             bw_display = f"{bw_bps / 1_000_000:.0f} Mbps" if bw_bps else v.get('bandwidth', 'N/A')
 
-            response['vpl_options'].append({
-                'vendor_name': v.get('vendor_name', 'N/A'),
-                'bandwidth': bw_display,
-                'bandwidth_bps': bw_bps,
-                'mrc': round(vpl_mrc, 2),
-                'mrc_currency': service_currency,
-                'nrc': v.get('nrc', 0),
-                'gm': round(gm, 1),
-                'gm_status': 'success' if gm >= 50 else 'warning' if gm >= 40 else 'danger',
-                'service_type': v.get('service_type', 'N/A'),
-                'is_current_vendor': v.get('vendor_name') == current_vendor
-            })
-        
+            response['vpl_options'].append(RenewalVPLOption(
+                vendor_name=v.get('vendor_name', 'N/A'),
+                bandwidth=bw_display,
+                bandwidth_bps=bw_bps,
+                mrc=vpl_scores['mrc'][i],
+                mrc_currency=service_currency,
+                nrc=v.get('nrc', 0),
+                gm=vpl_scores['gm'][i],
+                gm_status=vpl_scores['gm_status'][i],
+                service_type=v.get('service_type', 'N/A'),
+                is_current_vendor=bool(is_current_vpl[i])
+            ))
+
+        # Cheapest current-vendor and alternative-vendor VPLs (first on ties)
+        vpl_mrc = np.array(vpl_scores['mrc'])
+        best_current_idx = argmin_where(vpl_mrc, is_current_vpl)
+        best_alt_idx = argmin_where(vpl_mrc, ~is_current_vpl)
+        best_current_vpl = response['vpl_options'][best_current_idx] if best_current_idx is not None else None
+        best_alt_vpl = response['vpl_options'][best_alt_idx] if best_alt_idx is not None else None
+
         # Generate renewal recommendations
         recommendations = []
 
-        # current_mrc is already in service currency (vendor_mrc from Quickbase)
-        # No conversion needed - it's already in the same currency as the service
-        current_mrc_in_service_currency = current_mrc
-
         # Recommendation 1 & 2: Based on renewal history
         if renewal_stats and renewal_stats.get('has_data'):
             # Scenario A: Using average discount
@@ -831,10 +770,7 @@ def api_analyze_renewal():
                 })
 
         # Recommendation 3: Based on nearby quotes from same vendor
-        same_vendor_nearby = [q for q in response['nearby_quotes'] if q.get('is_same_vendor')]
-        if same_vendor_nearby:
-            # Find the best (lowest MRC) nearby quote from same vendor
-            best_nearby = min(same_vendor_nearby, key=lambda x: x['mrc'])
+        if best_nearby is not None:
             # Only recommend if nearby MRC is lower than current MRC
             if best_nearby['mrc'] < current_mrc:
                 savings = current_mrc - best_nearby['mrc']
@@ -854,10 +790,7 @@ def api_analyze_renewal():
                 })
 
         # Recommendation 3b: Based on nearby quotes from alternative vendors
-        alt_vendor_nearby = [q for q in response['nearby_quotes'] if not q.get('is_same_vendor')]
-        if alt_vendor_nearby:
-            # Find the best (lowest MRC) nearby quote from alternative vendors
-            best_alt_nearby = min(alt_vendor_nearby, key=lambda x: x['mrc'])
+        if best_alt_nearby is not None:
             # Only recommend if nearby MRC is significantly lower
             if best_alt_nearby['mrc'] < current_mrc:
                 savings = current_mrc - best_alt_nearby['mrc']
@@ -877,55 +810,49 @@ def api_analyze_renewal():
                 })
 
         # Recommendation 4: Based on VPL availability from current vendor
-        current_vendor_vpls = [v for v in response['vpl_options'] if v['is_current_vendor']]
-        if current_vendor_vpls:
-            best_current_vpl = min(current_vendor_vpls, key=lambda x: x['mrc'])
-
-            app.logger.info(f"DEBUG Rec#4: VPL MRC={best_current_vpl['mrc']}, current_mrc_in_service_currency={current_mrc_in_service_currency}, current_mrc={current_mrc}, vendor_mrc={vendor_mrc}")
+        if best_current_vpl is not None:
+            app.logger.info(f"DEBUG Rec#4: VPL MRC={best_current_vpl.mrc}, current_mrc={current_mrc}")
 
             # Only recommend if VPL MRC is lower than current vendor MRC (NOT client MRC)
             # This is the price the vendor would charge vs what they're charging now
-            if best_current_vpl['mrc'] < current_mrc_in_service_currency:
-                savings = current_mrc_in_service_currency - best_current_vpl['mrc']
-                savings_pct = (savings / current_mrc_in_service_currency * 100) if current_mrc_in_service_currency > 0 else 0
+            if best_current_vpl.mrc < current_mrc:
+                savings = current_mrc - best_current_vpl.mrc
+                savings_pct = (savings / current_mrc * 100) if current_mrc > 0 else 0
                 # Calculate expected GM with VPL pricing
-                expected_gm_vpl = ((client_mrc - best_current_vpl['mrc']) / client_mrc * 100) if client_mrc > 0 else 0
+                expected_gm_vpl = ((client_mrc - best_current_vpl.mrc) / client_mrc * 100) if client_mrc > 0 else 0
 
                 recommendations.append({
                     'priority': 4,
                     'strategy': f"Request VPL pricing from {current_vendor}",
-                    'rationale': f"VPL available at {best_current_vpl['mrc']:.2f} {service_currency} ({best_current_vpl['bandwidth']}) - {savings_pct:.1f}% lower than current vendor MRC ({current_mrc_in_service_currency:.2f} {service_currency})",
-                    'expected_mrc': best_current_vpl['mrc'],
+                    'rationale': f"VPL available at {best_current_vpl.mrc:.2f} {service_currency} ({best_current_vpl.bandwidth}) - {savings_pct:.1f}% lower than current vendor MRC ({current_mrc:.2f} {service_currency})",
+                    'expected_mrc': best_current_vpl.mrc,
                     'expected_gm': round(expected_gm_vpl, 1),
                     'confidence': 'high',
                     'vendor_name': current_vendor
                 })
 
         # Recommendation 5: Based on alternative vendor VPLs at same location
-        alternative_vendor_vpls = [v for v in response['vpl_options'] if not v['is_current_vendor']]
-        if alternative_vendor_vpls:
-            # Find best alternative VPL (lowest MRC)
-            best_alt_vpl = min(alternative_vendor_vpls, key=lambda x: x['mrc'])
+        if best_alt_vpl is not None:
             # Only recommend if alternative VPL MRC is lower than current vendor MRC
-            if best_alt_vpl['mrc'] < current_mrc_in_service_currency:
-                savings = current_mrc_in_service_currency - best_alt_vpl['mrc']
-                savings_pct = (savings / current_mrc_in_service_currency * 100) if current_mrc_in_service_currency > 0 else 0
+            if best_alt_vpl.mrc < current_mrc:
+                savings = current_mrc - best_alt_vpl.mrc
+                savings_pct = (savings / current_mrc * 100) if current_mrc > 0 else 0
                 # Calculate expected GM with alternative VPL pricing
-                expected_gm_alt = ((client_mrc - best_alt_vpl['mrc']) / client_mrc * 100) if client_mrc > 0 else 0
+                expected_gm_alt = ((client_mrc - best_alt_vpl.mrc) / client_mrc * 100) if client_mrc > 0 else 0
 
                 recommendations.append({
                     'priority': 5,
-                    'strategy': f"Leverage {best_alt_vpl['vendor_name']} VPL as negotiation leverage",
-                    'rationale': f"Alternative vendor VPL at {best_alt_vpl['mrc']:.2f} {service_currency} ({best_alt_vpl['bandwidth']}) - {savings_pct:.1f}% lower. Use as leverage with {current_vendor} or consider switching",
-                    'expected_mrc': best_alt_vpl['mrc'],
+                    'strategy': f"Leverage {best_alt_vpl.vendor_name} VPL as negotiation leverage",
+                    'rationale': f"Alternative vendor VPL at {best_alt_vpl.mrc:.2f} {service_currency} ({best_alt_vpl.bandwidth}) - {savings_pct:.1f}% lower. Use as leverage with {current_vendor} or consider switching",
+                    'expected_mrc': best_alt_vpl.mrc,
                     'expected_gm': round(expected_gm_alt, 1),
                     'confidence': 'medium',
-                    'vendor_name': best_alt_vpl['vendor_name'],
+                    'vendor_name': best_alt_vpl.vendor_name,
                     'alternative_vendor': True
                 })
 
         # Recommendation 6: Market comparison - low margin alert
-        if current_gm < 40 and not alternative_vendor_vpls:
+        if current_gm < 40 and best_alt_vpl is None:
             recommendations.append({
                 'priority': 6,
                 'strategy': "Evaluate alternative vendors",
@@ -935,12 +862,11 @@ def api_analyze_renewal():
         
         response['recommendations'] = sorted(recommendations, key=lambda x: x['priority'])
         
-        return jsonify(response)
+        return orjson_response(response)
 
     except Exception as e:
-        print(f"Error in api_analyze_renewal: {e}")
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+        app.logger.exception("api_analyze_renewal failed")
+        return orjson_response({'error': str(e)}, 500)
 
 
 @app.route('/api/strategy/<service_id>/<int:vq_qb_id>', methods=['GET', 'POST'])
@@ -950,11 +876,21 @@ def api_strategy(service_id, vq_qb_id):
         # Initialize clients
         init_clients()
 
+        # Service details, vendor quotes and VOC Line are independent - fetch them in parallel
+        service_future = _IO_POOL.submit(neo4j_client.get_service_details, service_id)
+        vendor_quotes_future = _IO_POOL.submit(
+            neo4j_client.get_vendor_quotes_for_service,
+            service_id,
+            include_nearby=True,
+            radius_meters=2000  # 2km radius for nearby quotes
+        )
+        voc_line_future = _IO_POOL.submit(qb_client.get_voc_line_by_service, service_id, mrc_only=True)
+
         # Get service details
-        service = neo4j_client.get_service_details(service_id)
+        service = service_future.result()
 
         if not service:
-            return jsonify({'error': f'Service {service_id} not found'}), 404
+            return orjson_response({'error': f'Service {service_id} not found'}, 404)
 
         # Get VPL options from request body (if provided via POST)
         vpl_options_from_analyze = None
@@ -963,11 +899,7 @@ def api_strategy(service_id, vq_qb_id):
             vpl_options_from_analyze = request_data.get('vpl_options', [])
 
         # Get vendor quotes
-        vendor_quotes = neo4j_client.get_vendor_quotes_for_service(
-            service_id,
-            include_nearby=True,
-            radius_meters=2000  # 2km radius for nearby quotes
-        )
+        vendor_quotes = vendor_quotes_future.result()
 
         associated = vendor_quotes.get('associated', [])
         vpl = vendor_quotes.get('vpl', [])
@@ -980,10 +912,10 @@ def api_strategy(service_id, vq_qb_id):
                 break
 
         if not target_vq:
-            return jsonify({'error': f'VQ {vq_qb_id} not found for service'}), 404
+            return orjson_response({'error': f'VQ {vq_qb_id} not found for service'}, 404)
 
         # Get Client MRC from VOC Lines (accurate source)
-        voc_line = qb_client.get_voc_line_by_service(service_id)
+        voc_line = voc_line_future.result()
         if voc_line.get('has_data'):
             client_mrc = voc_line.get('client_mrc', 0)
             service_currency = voc_line.get('currency') or service.get('service_currency', 'USD')
@@ -997,6 +929,7 @@ def api_strategy(service_id, vq_qb_id):
         current_gm = ((client_mrc - current_mrc) / client_mrc * 100) if client_mrc > 0 else 0
 
         # Get negotiation and renewal history
+        prefetch_vendor_stats(negotiation=[vendor_name], renewal=[vendor_name])
         stats = get_vendor_stats_cached(vendor_name)
         renewal_stats = get_renewal_stats_cached(vendor_name)
 
@@ -1048,7 +981,7 @@ def api_strategy(service_id, vq_qb_id):
                 'quickbase_id': vq_qb_id,
                 'current_mrc': current_mrc,
                 'current_gm': round(current_gm, 1),
-                'gm_status': 'success' if current_gm >= 50 else 'warning' if current_gm >= 40 else 'danger',
+                'gm_status': gm_status(current_gm),
                 'lead_time': target_vq.get('lead_time', 'N/A'),
                 'status': target_vq.get('status', 'N/A')
             },
@@ -1081,7 +1014,7 @@ def api_strategy(service_id, vq_qb_id):
                 'avg_discount': round(stats['avg_discount'], 1),
                 'projected_mrc': round(negotiated_mrc, 2),
                 'projected_gm': round(negotiated_gm, 1),
-                'projected_gm_status': 'success' if negotiated_gm >= 50 else 'warning' if negotiated_gm >= 40 else 'danger'
+                'projected_gm_status': gm_status(negotiated_gm)
             }
 
         # Add vendor VPL options - use pre-calculated VPL options from analyze if available
@@ -1101,7 +1034,7 @@ def api_strategy(service_id, vq_qb_id):
                             'nrc': opt.get('nrc', 0),
                             'nrc_currency': opt.get('nrc_currency', 'USD'),
                             'gm': vpl_gm,
-                            'gm_status': 'success' if vpl_gm >= 50 else 'warning' if vpl_gm >= 40 else 'danger',
+                            'gm_status': gm_status(vpl_gm),
                             'bandwidth': opt.get('bandwidth', 'N/A'),
                             'service_type': opt.get('service_type', 'N/A'),
                             'savings': round(savings, 2),
@@ -1115,7 +1048,7 @@ def api_strategy(service_id, vq_qb_id):
                             'mrc': opt.get('mrc', 0),
                             'mrc_currency': opt.get('mrc_currency', 'USD'),
                             'gm': opt.get('gm', 0),
-                            'gm_status': 'success' if opt.get('gm', 0) >= 50 else 'warning' if opt.get('gm', 0) >= 40 else 'danger',
+                            'gm_status': gm_status(opt.get('gm', 0)),
                             'bandwidth': opt.get('bandwidth', 'N/A'),
                             'service_type': opt.get('service_type', 'N/A')
                         })
@@ -1127,25 +1060,15 @@ def api_strategy(service_id, vq_qb_id):
                 service_bw = service.get('bandwidth_bps')
 
                 if service_bw:
-                    # Find exact match
-                    exact_match = [v for v in vendor_vpl if v.get('bandwidth_bps') == service_bw]
-
-                    if exact_match:
-                        # If multiple, keep best GM
-                        vendor_vpl_filtered = sorted(exact_match, key=lambda x: ((client_mrc - x.get('mrc', 0)) / client_mrc * 100), reverse=True)[:1]
-                    else:
-                        # Find closest higher bandwidth
-                        vendor_vpl.sort(key=lambda x: x.get('bandwidth_bps') or 0)
-                        higher = [v for v in vendor_vpl if v.get('bandwidth_bps', 0) > service_bw]
-                        if higher:
-                            vendor_vpl_filtered = [higher[0]]
-                        else:
-                            # No higher, use closest lower
-                            lower = [v for v in vendor_vpl if v.get('bandwidth_bps', 0) < service_bw]
-                            vendor_vpl_filtered = [lower[-1]] if lower else []
+                    # Exact bandwidth match(es), else closest higher, else closest lower
+                    matches = [vendor_vpl[i] for i in closest_bandwidth_rows(column(vendor_vpl, 'bandwidth_bps'), service_bw).tolist()]
+                    # If multiple exact matches, keep best GM (first on ties)
+                    if len(matches) > 1:
+                        matches = [max(matches, key=lambda x: ((client_mrc - x.get('mrc', 0)) / client_mrc * 100))]
+                    vendor_vpl_filtered = matches
                 else:
-                    # No service bandwidth, show best GM option
-                    vendor_vpl_filtered = sorted(vendor_vpl, key=lambda x: ((client_mrc - x.get('mrc', 0)) / client_mrc * 100), reverse=True)[:1]
+                    # No service bandwidth, show best GM option (first on ties)
+                    vendor_vpl_filtered = [max(vendor_vpl, key=lambda x: ((client_mrc - x.get('mrc', 0)) / client_mrc * 100))]
 
                 for v in vendor_vpl_filtered:
                     vpl_mrc = v.get('mrc', 0)
@@ -1159,21 +1082,22 @@ def api_strategy(service_id, vq_qb_id):
                         'mrc': vpl_mrc,
                         'nrc': v.get('nrc', 0),
                         'gm': round(vpl_gm, 1),
-                        'gm_status': 'success' if vpl_gm >= 50 else 'warning' if vpl_gm >= 40 else 'danger',
+                        'gm_status': gm_status(vpl_gm),
                         'bandwidth': bw_display,
                         'service_type': v.get('service_type', 'N/A'),
                         'savings': round(savings, 2),
                         'savings_percent': round((savings / current_mrc * 100), 1) if current_mrc > 0 else 0
                     })
 
-            # Add alternatives from other vendors
-            other_vendors_vpl = [v for v in vpl if v.get('vendor_name') != vendor_name]
+            # Add alternatives from other vendors: (GM, row) pairs, GM computed once per row
+            other_vendors_vpl = [
+                ((client_mrc - v.get('mrc', 0)) / client_mrc * 100, v)
+                for v in vpl if v.get('vendor_name') != vendor_name
+            ]
             if other_vendors_vpl:
-                other_vendors_vpl.sort(key=lambda x: ((client_mrc - x.get('mrc', 0)) / client_mrc * 100), reverse=True)
-
-                for v in other_vendors_vpl[:5]:  # Top 5 alternatives
+                # Top 5 alternatives by GM, without sorting the whole list (ties keep row order)
+                for alt_gm, v in heapq.nlargest(5, other_vendors_vpl, key=itemgetter(0)):
                     alt_mrc = v.get('mrc', 0)
-                    alt_gm = ((client_mrc - alt_mrc) / client_mrc * 100)
 
                     bw_bps = v.get('bandwidth_bps')
                     bw_display = f"{bw_bps / 1_000_000:.0f} Mbps" if bw_bps else v.get('bandwidth', 'N/A')
@@ -1182,7 +1106,7 @@ def api_strategy(service_id, vq_qb_id):
                         'vendor_name': v.get('vendor_name', 'Unknown'),
                         'mrc': alt_mrc,
                         'gm': round(alt_gm, 1),
-                        'gm_status': 'success' if alt_gm >= 50 else 'warning' if alt_gm >= 40 else 'danger',
+                        'gm_status': gm_status(alt_gm),
                         'bandwidth': bw_display,
                         'service_type': v.get('service_type', 'N/A')
                     })
@@ -1300,12 +1224,11 @@ def api_strategy(service_id, vq_qb_id):
 
             response['recommendations'].append(rec)
 
-        return jsonify(response)
+        return orjson_response(response)
 
     except Exception as e:
-        print(f"Error in api_strategy: {e}")
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+        app.logger.exception("api_strategy failed")
+        return orjson_response({'error': str(e)}, 500)
 
 
 @app.route('/api/vendor-autocomplete', methods=['GET'])
@@ -1316,24 +1239,25 @@ def api_vendor_autocomplete():
 
         search_term = request.args.get('q', '').strip()
         if not search_term or len(search_term) < 2:
-            return jsonify({'vendors': []})
+            return orjson_response({'vendors': []})
 
-        # Get unique vendor names from Neo4j
-        neo4j_vendors = neo4j_client.get_vendor_names(search_term)
+        # Get vendor names from Quickbase (VOC Lines and Renewals tables, sorted)
+        # while Neo4j is queried, so a keystroke costs the slower of the two
+        qb_vendors_future = _IO_POOL.submit(qb_client.get_vendor_names, search_term)
 
-        # Get vendor names from Quickbase (VOC Lines and Renewals tables)
-        qb_vendors = qb_client.get_vendor_names(search_term)
+        # Get unique vendor names from Neo4j (sorted by the ORDER BY)
+        neo4j_vendors = neo4j_client.get_vendor_names(search_term)
+        qb_vendors = qb_vendors_future.result()
 
-        # Combine and deduplicate
-        all_vendors = set(neo4j_vendors + qb_vendors)
-        vendor_list = sorted(list(all_vendors))[:20]  # Limit to 20 results
+        # Merge the two sorted lists, dropping duplicates, and stop after 20
+        merged = heapq.merge(neo4j_vendors, qb_vendors)
+        vendor_list = list(islice((name for name, _ in groupby(merged)), 20))
 
-        return jsonify({'vendors': vendor_list})
+        return orjson_response({'vendors': vendor_list})
 
     except Exception as e:
-        print(f"Error in api_vendor_autocomplete: {e}")
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+        app.logger.exception("api_vendor_autocomplete failed")
+        return orjson_response({'error': str(e)}, 500)
 
 
 @app.route('/api/analyze-vendor', methods=['POST'])
@@ -1344,13 +1268,13 @@ def api_analyze_vendor():
 
         vendor_name = request.json.get('vendor_name', '').strip()
         if not vendor_name:
-            return jsonify({'error': 'Vendor name is required'}), 400
+            return orjson_response({'error': 'Vendor name is required'}, 400)
 
-        # Get renewal history from Quickbase
+        # Get renewal history from Quickbase and new contract history from
+        # Neo4j (VendorQuotes) in parallel
+        new_contract_future = _IO_POOL.submit(neo4j_client.get_vendor_contract_history, vendor_name)
         renewal_history = qb_client.get_vendor_renewal_history(vendor_name)
-
-        # Get new contract history from Neo4j (VendorQuotes)
-        new_contract_history = neo4j_client.get_vendor_contract_history(vendor_name)
+        new_contract_history = new_contract_future.result()
 
         # Calculate statistics
         total_renewals = len(renewal_history.get('records', []))
@@ -1386,12 +1310,11 @@ def api_analyze_vendor():
             'new_contract_history': new_contract_history
         }
 
-        return jsonify(response)
+        return orjson_response(response)
 
     except Exception as e:
-        print(f"Error in api_analyze_vendor: {e}")
-        traceback.print_exc()
-        return jsonify({'error': str(e)}), 500
+        app.logger.exception("api_analyze_vendor failed")
+        return orjson_response({'error': str(e)}, 500)
 
 
 @app.route('/health')
@@ -1399,9 +1322,9 @@ def health():
     """Health check endpoint"""
     try:
         init_clients()
-        return jsonify({'status': 'healthy', 'timestamp': datetime.utcnow().isoformat()})
+        return orjson_response({'status': 'healthy', 'timestamp': datetime.utcnow().isoformat()})
     except Exception as e:
-        return jsonify({'status': 'unhealthy', 'error': str(e)}), 500
+        return orjson_response({'status': 'unhealthy', 'error': str(e)}, 500)
 
 
 if __name__ == '__main__':
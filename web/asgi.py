@@ -0,0 +1,20 @@
+"""
+ASGI entry point for the web interface
+
+Runs the Flask app under an ASGI server:
+
+    uvicorn asgi:asgi_app --host 0.0.0.0 --port 5000
+
+Views stay synchronous WSGI code. a2wsgi runs each request on its own thread
+from a pool of WEB_THREADS workers (default 32), so requests - including
+long-lived ?stream=1 SSE responses, which hold their thread until the stream
+ends - are served concurrently, as under the threaded Flask server. The
+backend calls inside a request are issued concurrently as well (_IO_POOL).
+"""
+import os
+
+from a2wsgi import WSGIMiddleware
+
+from app import app
+
+asgi_app = WSGIMiddleware(app, workers=int(os.getenv('WEB_THREADS', '32')))
@@ -12,6 +12,29 @@ QUICKBASE_REALM = os.getenv('QUICKBASE_REALM', 'ignetworks.quickbase.com')
 QUICKBASE_TOKEN = os.getenv('QUICKBASE_TOKEN', 'b9kfn9_w4i_0_da9fbrhdqjiq9qe2pgcfkxcwpu')
 QUICKBASE_TABLE_ID = os.getenv('QUICKBASE_TABLE_ID', 'bqrc5mm8e')
 QUICKBASE_BASE_URL = f'https://{QUICKBASE_REALM}'
+# Seconds Quickbase vendor/service lookups are served from the in-process cache
+QUICKBASE_CACHE_TTL = float(os.getenv('QUICKBASE_CACHE_TTL', '300'))
+# Optional SQLite file that keeps service MRC / bandwidth lookups (near-static
+# reference data) across restarts for QUICKBASE_DISK_CACHE_TTL seconds
+QUICKBASE_DISK_CACHE_PATH = os.getenv('QUICKBASE_DISK_CACHE_PATH', '')
+QUICKBASE_DISK_CACHE_TTL = float(os.getenv('QUICKBASE_DISK_CACHE_TTL', '86400'))
+# Optional Quickbase summary report on VOC Lines (bkr26d56f) filtered to
+# Delivered lines and grouped by vendor name (245), with the total of MRC USD
+# Tax Included (135) and the count of Record ID# (3). When set, delivered MRC
+# totals come from this one pre-aggregated report instead of raw rows.
+QUICKBASE_DELIVERED_MRC_REPORT_ID = os.getenv('QUICKBASE_DELIVERED_MRC_REPORT_ID', '')
+# Quickbase request timeouts (connect, read) in seconds; connecting fails fast
+QUICKBASE_TIMEOUT = (
+    float(os.getenv('QUICKBASE_CONNECT_TIMEOUT', '3')),
+    float(os.getenv('QUICKBASE_READ_TIMEOUT', '20'))
+)
+# After this many consecutive failed Quickbase calls, skip the API for
+# QUICKBASE_BREAKER_RESET seconds and return the empty fallbacks immediately
+QUICKBASE_BREAKER_FAILURES = int(os.getenv('QUICKBASE_BREAKER_FAILURES', '5'))
+QUICKBASE_BREAKER_RESET = float(os.getenv('QUICKBASE_BREAKER_RESET', '30'))
+# Most Quickbase requests in flight at once per process; extra calls queue
+# instead of tripping the realm's rate limit (429) and its retry backoff
+QUICKBASE_MAX_CONCURRENT = int(os.getenv('QUICKBASE_MAX_CONCURRENT', '10'))
 
 # API VPLs Configuration
 VPL_API_BASE_URL = os.getenv('VPL_API_BASE_URL', 'https://igiq-api.ignetworks.com')
@@ -23,6 +46,43 @@ NEO4J_USER = os.getenv('NEO4J_USER', 'neo4j')
 NEO4J_PASSWORD = os.getenv('NEO4J_PASSWORD', 'bR3rStkBnA9vSZxCPnrnaKvPbwLvLsJFc67N')
 NEO4J_DATABASE = os.getenv('NEO4J_DATABASE', 'neo4j')
 
+# Neo4j driver pool: recycle connections before load balancers drop them
+# (avoids "defunct connection" retries) and size the pool for the web workers
+NEO4J_MAX_CONNECTION_LIFETIME = int(os.getenv('NEO4J_MAX_CONNECTION_LIFETIME', '300'))  # seconds
+NEO4J_MAX_CONNECTION_POOL_SIZE = int(os.getenv('NEO4J_MAX_CONNECTION_POOL_SIZE', '50'))
+NEO4J_CONNECTION_ACQUISITION_TIMEOUT = float(os.getenv('NEO4J_CONNECTION_ACQUISITION_TIMEOUT', '30'))  # seconds
+NEO4J_CONNECTION_TIMEOUT = float(os.getenv('NEO4J_CONNECTION_TIMEOUT', '15'))  # seconds
+
+# Create the indexes the hot Cypher queries rely on when the first client
+# starts (IF NOT EXISTS, so it is a no-op once they exist). Opt-in: enable it
+# for one deployment or run after a schema change, not on every web process.
+NEO4J_ENSURE_SCHEMA = os.getenv('NEO4J_ENSURE_SCHEMA', 'false').lower() in ('1', 'true', 'yes')
+
+# Seek nearby VendorQuotes through their precomputed vq.geohash6 property
+# (single-property index) instead of the latitude/longitude range scan.
+# Only enable once the loader populates geohash6 on every VendorQuote.
+NEO4J_NEARBY_GEOHASH = os.getenv('NEO4J_NEARBY_GEOHASH', 'false').lower() in ('1', 'true', 'yes')
+
+# Warm Neo4j's page cache in the background when the placeholder
+# neo4j_client_REAL.Neo4jClient is created: apoc.warmup.run (if APOC is
+# installed) plus one run of each lookup template with sentinel parameters
+NEO4J_WARMUP = os.getenv('NEO4J_WARMUP', 'false').lower() in ('1', 'true', 'yes')
+
+# Cypher runtime to pin on neo4j_client_REAL's query templates so a server
+# upgrade can't silently switch their plans, e.g. 'slotted'. Opt-in: the
+# default '' leaves the choice to the server (pipelined on Aura/Enterprise)
+NEO4J_CYPHER_RUNTIME = os.getenv('NEO4J_CYPHER_RUNTIME', '')
+
+# Read a quote's city/state/country from properties copied onto the
+# VendorQuote (city_name, state_name, country_name, loc_lat, loc_lon) instead
+# of walking the location hierarchy. Only enable once the nightly
+# refresh_denormalized_locations() job has populated them.
+NEO4J_DENORMALIZED_LOCATION = os.getenv('NEO4J_DENORMALIZED_LOCATION', 'false').lower() in ('1', 'true', 'yes')
+
+# Connect and warm up the Neo4j / Quickbase clients in the background when the
+# web app is imported, instead of on the first request
+EAGER_CLIENT_INIT = os.getenv('EAGER_CLIENT_INIT', 'true').lower() in ('1', 'true', 'yes')
+
 # Business Constants
 TARGET_GM = float(os.getenv('TARGET_GM', '0.55'))  # 55%
 MIN_ACCEPTABLE_GM = float(os.getenv('MIN_ACCEPTABLE_GM', '0.50'))  # 50%
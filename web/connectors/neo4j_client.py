@@ -3,35 +3,441 @@ Neo4j Client
 Provides helper methods for querying vendor quotes and related data from Neo4j
 Uses real connection based on DH - Quotes Identifier system
 """
-from typing import List, Dict, Optional
+from typing import Final, List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 from neo4j import GraphDatabase
+import atexit
+import math
 import sys
 import os
+import threading
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config import NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, NEO4J_DATABASE
+from config import (
+    NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, NEO4J_DATABASE,
+    NEO4J_MAX_CONNECTION_LIFETIME, NEO4J_MAX_CONNECTION_POOL_SIZE,
+    NEO4J_CONNECTION_ACQUISITION_TIMEOUT, NEO4J_CONNECTION_TIMEOUT,
+    NEO4J_ENSURE_SCHEMA, NEO4J_NEARBY_GEOHASH
+)
+from connectors.quickbase import QuickbaseClient
+from connectors.vpl_api import VPLAPIClient
+from utils.cache import TTLCache, ttl_cached
+from utils.geohash import cells_in_box
+
+# One driver (and connection pool) per process, shared by every Neo4jClient
+_driver = None
+_driver_lock = threading.Lock()
+
+
+def get_driver():
+    """
+    Get the process-wide Neo4j driver, creating it on first use
+
+    The connection is tested once when the driver is created. If Neo4j is
+    unreachable the error is raised and the next call tries again.
+    """
+    global _driver
+    if _driver is not None:
+        return _driver
+
+    with _driver_lock:
+        if _driver is None:
+            driver = GraphDatabase.driver(
+                NEO4J_URI,
+                auth=(NEO4J_USER, NEO4J_PASSWORD),
+                max_connection_lifetime=NEO4J_MAX_CONNECTION_LIFETIME,
+                max_connection_pool_size=NEO4J_MAX_CONNECTION_POOL_SIZE,
+                connection_acquisition_timeout=NEO4J_CONNECTION_ACQUISITION_TIMEOUT,
+                connection_timeout=NEO4J_CONNECTION_TIMEOUT,
+                keep_alive=True
+            )
+            try:
+                # Test connection (handshake + routing only, no query)
+                driver.verify_connectivity()
+            except Exception:
+                driver.close()
+                raise
+            print(f"✅ Neo4j connected successfully to {NEO4J_URI}")
+            _driver = driver
+    return _driver
+
+
+def close_driver():
+    """Close the shared driver (at process exit)"""
+    global _driver
+    with _driver_lock:
+        if _driver is not None:
+            _driver.close()
+            _driver = None
+
+
+atexit.register(close_driver)
+
+
+def _read_all(tx, query: str, params: Dict) -> List[Dict]:
+    """Transaction function: run a read query and return every record as a dict"""
+    return tx.run(query, params).data()
+
+
+def _read_single(tx, query: str, params: Dict) -> Optional[Dict]:
+    """Transaction function: run a read query and return its only record as a dict (or None)"""
+    record = tx.run(query, params).single()
+    return record.data() if record else None
+
+
+# Runs the independent branches of get_vendor_quotes_for_service in parallel
+_query_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='neo4j-query')
+
+# Quickbase / VPL API clients used by the lookups below, created on first use
+# and shared (their HTTP sessions are pooled)
+_qb_client = None
+_vpl_client = None
+_http_clients_lock = threading.Lock()
+
+
+def _get_qb_client() -> QuickbaseClient:
+    """Get the shared QuickbaseClient"""
+    global _qb_client
+    if _qb_client is None:
+        with _http_clients_lock:
+            if _qb_client is None:
+                _qb_client = QuickbaseClient()
+    return _qb_client
+
+
+def _get_vpl_client() -> VPLAPIClient:
+    """Get the shared VPLAPIClient"""
+    global _vpl_client
+    if _vpl_client is None:
+        with _http_clients_lock:
+            if _vpl_client is None:
+                _vpl_client = VPLAPIClient()
+    return _vpl_client
+
+# Vendor autocomplete / history results, shared across requests for a few
+# minutes (empty results, including error fallbacks, are not cached)
+_vendor_cache = TTLCache(maxsize=4096, ttl=300)
+
+# Service / vendor quote lookups by id, hit repeatedly by detail panels.
+# Kept short-lived so edits in the graph show up within a minute.
+_record_cache = TTLCache(maxsize=2048, ttl=60)
 
 
 class Neo4jClient:
     """Client for Neo4j operations using real database connection"""
 
+    # Cypher used on the /api/analyze hot path. Kept constant (byte-identical
+    # text on every call) and fully parameterized ($params only) so Neo4j
+    # reuses one cached plan per query.
+    SERVICE_DETAILS_QUERY: Final[str] = """
+        MATCH (s:Service {service_id: $service_id})
+        OPTIONAL MATCH (s)-[:RELATED_TO]->(q:Quote)
+        OPTIONAL MATCH (q)-[:BANDWIDTH_DOWN_OF]->(bw_down:Bandwidth)
+        OPTIONAL MATCH (q)-[:BANDWIDTH_UP_OF]->(bw_up:Bandwidth)
+        RETURN s.contracted_mrc as mrc,
+               s.customer as customer,
+               s.latitude as lat,
+               s.longitude as lon,
+               s.z_address as address,
+               s.service_id as service_id,
+               q.mrc as quote_mrc,
+               bw_down.bps_amount as bw_down_bps,
+               bw_down.label as bw_down_label,
+               bw_up.bps_amount as bw_up_bps,
+               bw_up.label as bw_up_label
+        LIMIT 1
+    """
+
+    ASSOCIATED_VQ_QUERY: Final[str] = """
+        MATCH (s:Service {service_id: $service_id})-[:RELATED_TO]->(q:Quote)
+        MATCH (q)-[:REQUIRES]->(t:Task)
+        MATCH (vq:VendorQuote)
+        WHERE vq.fk_task_id = t.id
+          AND vq.status IN ['desk_results_feasible', 'site_survey_results_feasible']
+          AND vq.mrc IS NOT NULL
+        OPTIONAL MATCH (vq)-[:OF_TYPE]->(st:ServiceType)
+        OPTIONAL MATCH (vq)-[:BANDWIDTH_DOWN_OF]->(bw:Bandwidth)
+        RETURN vq.id as vq_id,
+               vq.quickbase_id as quickbase_id,
+               vq.mrc as mrc,
+               vq.nrc as nrc,
+               vq.exchange_rate as exchange_rate,
+               vq.status as status,
+               vq.lead_time as lead_time,
+               vq.latitude as latitude,
+               vq.longitude as longitude,
+               vq.date_created as date_created,
+               vq.comments as comments,
+               st.name as service_type,
+               st.id as service_type_id,
+               bw.name as bandwidth,
+               bw.id as bandwidth_id,
+               t.id as task_id
+        ORDER BY vq.mrc ASC
+    """
+
+    # Vendor of every quote in $vq_ids, in one round trip
+    VQ_VENDORS_QUERY: Final[str] = """
+        UNWIND $vq_ids AS vq_id
+        MATCH (vq:VendorQuote {id: vq_id})<-[:PROVIDED_QUOTE]-(v:Vendor)
+        RETURN vq.id as vq_id, v.name as vendor_name, v.id as vendor_id
+    """
+
+    SERVICE_INFO_QUERY: Final[str] = """
+        MATCH (s:Service {service_id: $service_id})
+        OPTIONAL MATCH (s)-[:OF_TYPE]->(st:ServiceType)
+        OPTIONAL MATCH (s)-[:BANDWIDTH_DOWN_OF]->(bw:Bandwidth)
+        RETURN s.latitude as lat, s.longitude as lon,
+               st.id as service_type_id, bw.id as bandwidth_id,
+               bw.bps_amount as bandwidth_bps
+    """
+
+    # Nearby VendorQuotes (IGIQ data) from last 12 months within $radius meters.
+    # The bounding box lets the (latitude, longitude) index narrow candidates;
+    # point.distance then applies the exact radius before LIMIT. Quotes already
+    # associated with $service_id are skipped, and so are quotes with a known
+    # bandwidth outside [$bw_min, $bw_max] ($bw_min null disables the check).
+    NEARBY_VQ_QUERY: Final[str] = """
+        MATCH (vq:VendorQuote)
+        WHERE vq.latitude >= $lat_min AND vq.latitude <= $lat_max
+          AND vq.longitude >= $lon_min AND vq.longitude <= $lon_max
+          AND vq.status IN ['desk_results_feasible', 'site_survey_results_feasible']
+          AND vq.mrc IS NOT NULL
+          AND vq.date_created >= datetime() - duration({months: 12})
+        WITH vq, point.distance(
+                 point({latitude: vq.latitude, longitude: vq.longitude}),
+                 point({latitude: $lat, longitude: $lon})) as distance
+        WHERE distance <= $radius
+          AND NOT EXISTS {
+              MATCH (:Service {service_id: $service_id})-[:RELATED_TO]->(:Quote)-[:REQUIRES]->(t:Task)
+              WHERE t.id = vq.fk_task_id
+          }
+        OPTIONAL MATCH (vq)-[:OF_TYPE]->(st:ServiceType)
+        OPTIONAL MATCH (vq)-[:BANDWIDTH_DOWN_OF]->(bw:Bandwidth)
+        WHERE (st.id = $service_type_id OR $service_type_id IS NULL)
+        WITH vq, distance, st, bw
+        WHERE $bw_min IS NULL
+           OR coalesce(bw.bps_amount, 0) = 0
+           OR (bw.bps_amount >= $bw_min AND bw.bps_amount <= $bw_max)
+        RETURN vq.id as vq_id,
+               vq.quickbase_id as quickbase_id,
+               vq.mrc as mrc,
+               vq.nrc as nrc,
+               vq.exchange_rate as exchange_rate,
+               vq.status as status,
+               vq.lead_time as lead_time,
+               vq.latitude as latitude,
+               vq.longitude as longitude,
+               vq.date_created as date_created,
+               vq.comments as comments,
+               st.name as service_type,
+               st.id as service_type_id,
+               bw.name as bandwidth,
+               bw.id as bandwidth_id,
+               bw.bps_amount as bandwidth_bps,
+               distance as distance_meters
+        ORDER BY vq.mrc ASC
+        LIMIT 50
+    """
+
+    # Same query seeking candidates by geohash cell first (NEO4J_NEARBY_GEOHASH);
+    # the bounding box and radius still apply since cells overhang the box
+    NEARBY_VQ_GEOHASH_QUERY: Final[str] = NEARBY_VQ_QUERY.replace(
+        "WHERE vq.latitude >= $lat_min",
+        "WHERE vq.geohash6 IN $cells\n          AND vq.latitude >= $lat_min",
+        1
+    )
+
+    BANDWIDTH_BPS_QUERY: Final[str] = """
+        MATCH (bw:Bandwidth {id: $bandwidth_id})
+        RETURN bw.bps_amount as bps_amount
+    """
+
+    # Lookup helpers outside the hot path, parameterized for the same reason
+    # ($exclude_vendor may be null, so one plan covers both cases)
+    VQ_BY_LOCATION_QUERY: Final[str] = """
+        MATCH (vq:VendorQuote)
+        WHERE vq.service_type = $service_type
+          AND vq.bandwidth_bps >= $bw_min
+          AND vq.bandwidth_bps <= $bw_max
+          AND vq.created_at >= date($cutoff)
+          AND ($exclude_vendor IS NULL OR vq.vendor_name <> $exclude_vendor)
+        RETURN vq.uuid AS uuid,
+               vq.vendor_name AS vendor_name,
+               vq.mrc AS mrc,
+               vq.nrc AS nrc,
+               vq.bandwidth_bps AS bandwidth_bps,
+               vq.service_type AS service_type,
+               vq.created_at AS quote_date,
+               vq.status AS status,
+               vq.comments AS comments
+        ORDER BY vq.mrc ASC
+        LIMIT 50
+    """
+
+    VQ_BY_ID_QUERY: Final[str] = """
+        MATCH (vq:VendorQuote {uuid: $vq_id})
+        OPTIONAL MATCH (vq)-[:LOCATED_IN]->(city:City)
+        OPTIONAL MATCH (city)-[:IN_STATE]->(state:State)
+        OPTIONAL MATCH (state)-[:IN_COUNTRY]->(country:Country)
+        RETURN vq.uuid AS uuid,
+               vq.vendor_name AS vendor_name,
+               vq.mrc AS mrc,
+               vq.nrc AS nrc,
+               vq.bandwidth_bps AS bandwidth_bps,
+               vq.service_type AS service_type,
+               vq.created_at AS quote_date,
+               vq.status AS status,
+               city.name AS city,
+               city.latitude AS lat,
+               city.longitude AS lon,
+               state.name AS state,
+               country.name AS country
+    """
+
+    SERVICE_BY_ID_QUERY: Final[str] = """
+        MATCH (s:Service {service_id: $service_id})
+        OPTIONAL MATCH (s)-[:LOCATED_AT]->(loc:Location)
+        RETURN s.service_id AS service_id,
+               s.mrc AS mrc,
+               s.service_type AS service_type,
+               s.bandwidth_bps AS bandwidth_bps,
+               loc.address AS address,
+               loc.latitude AS lat,
+               loc.longitude AS lon,
+               loc.city AS city,
+               loc.state AS state,
+               loc.country AS country
+    """
+
+    # Vendor's quotes, those with an MRC first, newest first; one page at a time.
+    # quote_date comes back as a YYYY-MM-DD string ('N/A' when missing).
+    CONTRACT_HISTORY_QUERY: Final[str] = """
+        MATCH (v:Vendor {name: $vendor_name})-[:PROVIDED_QUOTE]->(vq:VendorQuote)
+        WITH vq
+        ORDER BY
+            CASE WHEN vq.mrc IS NOT NULL THEN 0 ELSE 1 END,
+            vq.date_created DESC
+        SKIP $skip
+        LIMIT $limit
+        OPTIONAL MATCH (vq)-[:BANDWIDTH_DOWN_OF]->(bw:Bandwidth)
+        RETURN vq.id as quote_id,
+               CASE WHEN vq.date_created IS NULL OR vq.date_created = ''
+                    THEN 'N/A' ELSE left(toString(vq.date_created), 10) END as quote_date,
+               vq.fk_task_id as task_id,
+               CASE WHEN vq.fk_task_id IS NULL OR vq.fk_task_id IN [0, '']
+                    THEN 'N/A' ELSE 'Task-' + toString(vq.fk_task_id) END as service_id,
+               vq.mrc as mrc,
+               vq.comments as comments,
+               bw.label as bandwidth
+    """
+
+    VENDOR_NAMES_QUERY: Final[str] = """
+        MATCH (v:Vendor)
+        WHERE toLower(v.name) CONTAINS toLower($search_term)
+        AND v.name IS NOT NULL
+        RETURN DISTINCT v.name as vendor_name
+        ORDER BY v.name
+        LIMIT $limit
+    """
+
+    # Query -> sentinel parameters used to pre-compile plans in warm_up()
+    WARMUP_QUERIES = (
+        (SERVICE_DETAILS_QUERY, {"service_id": ""}),
+        (ASSOCIATED_VQ_QUERY, {"service_id": ""}),
+        (VQ_VENDORS_QUERY, {"vq_ids": []}),
+        (SERVICE_INFO_QUERY, {"service_id": ""}),
+        (NEARBY_VQ_QUERY, {"lat_min": 0.0, "lat_max": 0.0, "lon_min": 0.0, "lon_max": 0.0,
+                           "lat": 0.0, "lon": 0.0, "radius": 0.0, "service_id": "",
+                           "service_type_id": None, "bw_min": None, "bw_max": None}),
+        (NEARBY_VQ_GEOHASH_QUERY, {"cells": [], "lat_min": 0.0, "lat_max": 0.0, "lon_min": 0.0, "lon_max": 0.0,
+                                   "lat": 0.0, "lon": 0.0, "radius": 0.0, "service_id": "",
+                                   "service_type_id": None, "bw_min": None, "bw_max": None}),
+        (BANDWIDTH_BPS_QUERY, {"bandwidth_id": -1}),
+        (VQ_BY_LOCATION_QUERY, {"service_type": "", "bw_min": 0, "bw_max": 0,
+                                "cutoff": "1970-01-01", "exclude_vendor": None}),
+        (VQ_BY_ID_QUERY, {"vq_id": ""}),
+        (SERVICE_BY_ID_QUERY, {"service_id": ""}),
+        (VENDOR_NAMES_QUERY, {"search_term": "", "limit": 0}),
+        (CONTRACT_HISTORY_QUERY, {"vendor_name": "", "skip": 0, "limit": 0}),
+    )
+
+    # Indexes behind the hot lookups above: id matches, the fk_task_id join,
+    # the status / date_created filters and the bounding-box range scan
+    SCHEMA_STATEMENTS = (
+        "CREATE INDEX service_service_id IF NOT EXISTS FOR (s:Service) ON (s.service_id)",
+        "CREATE INDEX vendor_quote_id IF NOT EXISTS FOR (vq:VendorQuote) ON (vq.id)",
+        "CREATE INDEX vendor_quote_fk_task_id IF NOT EXISTS FOR (vq:VendorQuote) ON (vq.fk_task_id)",
+        "CREATE INDEX vendor_quote_status IF NOT EXISTS FOR (vq:VendorQuote) ON (vq.status)",
+        "CREATE INDEX vendor_quote_date_created IF NOT EXISTS FOR (vq:VendorQuote) ON (vq.date_created)",
+        "CREATE INDEX vendor_quote_location IF NOT EXISTS FOR (vq:VendorQuote) ON (vq.latitude, vq.longitude)",
+        "CREATE INDEX bandwidth_id IF NOT EXISTS FOR (bw:Bandwidth) ON (bw.id)",
+    ) + ((
+        # Only seeked when the geohash variant of the nearby query is enabled
+        "CREATE INDEX vendor_quote_geohash6 IF NOT EXISTS FOR (vq:VendorQuote) ON (vq.geohash6)",
+    ) if NEO4J_NEARBY_GEOHASH else ())
+
+    # Set once SCHEMA_STATEMENTS have been applied in this process
+    _schema_ready = False
+    _schema_lock = threading.Lock()
+
     def __init__(self):
-        """Initialize Neo4j client with real connection"""
+        """Initialize Neo4j client on the shared process-wide driver"""
+        self.database = NEO4J_DATABASE
         try:
-            self.driver = GraphDatabase.driver(
-                NEO4J_URI,
-                auth=(NEO4J_USER, NEO4J_PASSWORD)
-            )
-            self.database = NEO4J_DATABASE
-            # Test connection
-            with self.driver.session(database=self.database) as session:
-                session.run("RETURN 1 as test")
-            print(f"✅ Neo4j connected successfully to {NEO4J_URI}")
+            self.driver = get_driver()
         except Exception as e:
             print(f"⚠️  Warning: Could not connect to Neo4j: {e}")
             self.driver = None
 
+        if self.driver and NEO4J_ENSURE_SCHEMA:
+            self.ensure_schema()
+
+    def ensure_schema(self):
+        """
+        Create the indexes used by the hot-path queries, once per process
+
+        Plain (non-unique) indexes are used so existing duplicate ids can't
+        make the bootstrap fail. Errors (e.g. a read-only user) are logged and
+        the client keeps working without them.
+        """
+        if Neo4jClient._schema_ready or not self.driver:
+            return
+
+        with Neo4jClient._schema_lock:
+            if Neo4jClient._schema_ready:
+                return
+            try:
+                with self.driver.session(database=self.database) as session:
+                    for statement in self.SCHEMA_STATEMENTS:
+                        session.execute_write(lambda tx, statement=statement: tx.run(statement).consume())
+                print(f"[Neo4j] Ensured {len(self.SCHEMA_STATEMENTS)} indexes")
+            except Exception as e:
+                print(f"[Neo4j] Warning: Could not create indexes: {e}")
+            # Don't retry on every new client, even after a failure
+            Neo4jClient._schema_ready = True
+
+    def warm_up(self):
+        """
+        Pre-compile the plans of every query constant
+
+        Runs EXPLAIN for each query so the first real request doesn't pay the
+        Cypher planning cost. EXPLAIN only plans the query; nothing is executed.
+        """
+        if not self.driver:
+            return
+
+        try:
+            with self.driver.session(database=self.database) as session:
+                for query, params in self.WARMUP_QUERIES:
+                    session.run("EXPLAIN " + query, params).consume()
+            print(f"[Neo4j] Warmed up {len(self.WARMUP_QUERIES)} query plans")
+        except Exception as e:
+            print(f"[Neo4j] Warning: Could not warm up query plans: {e}")
+
+    @ttl_cached(_record_cache, cache_if=bool)
     def get_service_details(self, service_id: str) -> Dict:
         """
         Get complete service details including bandwidth
@@ -45,75 +451,57 @@ class Neo4jClient:
         if not self.driver:
             return {}
 
-        with self.driver.session(database=self.database) as session:
-            # Get basic service info with bandwidth
-            result = session.run("""
-                MATCH (s:Service {service_id: $service_id})
-                OPTIONAL MATCH (s)-[:RELATED_TO]->(q:Quote)
-                OPTIONAL MATCH (q)-[:BANDWIDTH_DOWN_OF]->(bw_down:Bandwidth)
-                OPTIONAL MATCH (q)-[:BANDWIDTH_UP_OF]->(bw_up:Bandwidth)
-                RETURN s.contracted_mrc as mrc,
-                       s.customer as customer,
-                       s.latitude as lat,
-                       s.longitude as lon,
-                       s.z_address as address,
-                       s.service_id as service_id,
-                       q.mrc as quote_mrc,
-                       bw_down.bps_amount as bw_down_bps,
-                       bw_down.label as bw_down_label,
-                       bw_up.bps_amount as bw_up_bps,
-                       bw_up.label as bw_up_label
-                LIMIT 1
-            """, service_id=service_id)
-
-            rec = result.single()
-            if not rec:
-                return {}
-
-            # Determine bandwidth display
-            bandwidth_display = 'N/A'
-            bandwidth_bps = None
-
-            if rec['bw_down_label']:
-                bandwidth_display = rec['bw_down_label']
-                bandwidth_bps = rec['bw_down_bps']
-
-                # If there's also bandwidth up, add it
-                if rec['bw_up_label'] and rec['bw_up_label'] != rec['bw_down_label']:
-                    bandwidth_display = f"{rec['bw_down_label']} / {rec['bw_up_label']}"
-            elif rec['bw_down_bps']:
-                # Convert bps to Mbps for display
-                mbps = rec['bw_down_bps'] / 1_000_000
-                bandwidth_display = f"{mbps:.0f} Mbps"
-                bandwidth_bps = rec['bw_down_bps']
-
-            # Get Service MRC from Quickbase (this is the authoritative source)
-            from connectors.quickbase import QuickbaseClient
-            qb_client = QuickbaseClient()
-            qb_mrc_data = qb_client.get_service_mrc(service_id)
-
-            # Use Quickbase MRC if available, otherwise fall back to Neo4j contracted_mrc
-            if qb_mrc_data['found'] and qb_mrc_data['mrc'] is not None:
-                client_mrc = qb_mrc_data['mrc']
-                service_currency = qb_mrc_data['currency']
-            else:
-                # Fallback to Neo4j data if Quickbase doesn't have the service
-                client_mrc = rec['mrc'] or 0
-                service_currency = 'USD'  # contracted_mrc is in USD
-
-            service_details = {
-                'service_id': rec['service_id'],
-                'customer': rec['customer'],
-                'client_mrc': client_mrc,
-                'service_currency': service_currency,
-                'latitude': rec['lat'],
-                'longitude': rec['lon'],
-                'address': rec['address'],
-                'bandwidth_display': bandwidth_display,
-                'bandwidth_bps': bandwidth_bps
-            }
+        # Get Service MRC from Quickbase (this is the authoritative source)
+        # while Neo4j is queried; the two lookups are independent
+        qb_mrc_future = _query_pool.submit(_get_qb_client().get_service_mrc, service_id)
 
-            return service_details
+        # Get basic service info with bandwidth (session closed before waiting on Quickbase)
+        with self._session() as session:
+            rec = session.execute_read(_read_single, self.SERVICE_DETAILS_QUERY, {"service_id": service_id})
+        if not rec:
+            return {}
+
+        # Determine bandwidth display
+        bandwidth_display = 'N/A'
+        bandwidth_bps = None
+
+        if rec['bw_down_label']:
+            bandwidth_display = rec['bw_down_label']
+            bandwidth_bps = rec['bw_down_bps']
+
+            # If there's also bandwidth up, add it
+            if rec['bw_up_label'] and rec['bw_up_label'] != rec['bw_down_label']:
+                bandwidth_display = f"{rec['bw_down_label']} / {rec['bw_up_label']}"
+        elif rec['bw_down_bps']:
+            # Convert bps to Mbps for display
+            mbps = rec['bw_down_bps'] / 1_000_000
+            bandwidth_display = f"{mbps:.0f} Mbps"
+            bandwidth_bps = rec['bw_down_bps']
+
+        qb_mrc_data = qb_mrc_future.result()
+
+        # Use Quickbase MRC if available, otherwise fall back to Neo4j contracted_mrc
+        if qb_mrc_data['found'] and qb_mrc_data['mrc'] is not None:
+            client_mrc = qb_mrc_data['mrc']
+            service_currency = qb_mrc_data['currency']
+        else:
+            # Fallback to Neo4j data if Quickbase doesn't have the service
+            client_mrc = rec['mrc'] or 0
+            service_currency = 'USD'  # contracted_mrc is in USD
+
+        service_details = {
+            'service_id': rec['service_id'],
+            'customer': rec['customer'],
+            'client_mrc': client_mrc,
+            'service_currency': service_currency,
+            'latitude': rec['lat'],
+            'longitude': rec['lon'],
+            'address': rec['address'],
+            'bandwidth_display': bandwidth_display,
+            'bandwidth_bps': bandwidth_bps
+        }
+
+        return service_details
 
     def get_vendor_quotes_by_location(
         self,
@@ -146,38 +534,18 @@ class Neo4jClient:
             return []
 
         cutoff_date = datetime.now() - timedelta(days=months_back * 30)
-        cutoff_str = cutoff_date.strftime('%Y-%m-%d')
-
-        # Query para buscar VendorQuotes en Neo4j
-        query = f"""
-        MATCH (vq:VendorQuote)
-        WHERE vq.service_type = '{service_type}'
-          AND vq.bandwidth_bps >= {bandwidth_min}
-          AND vq.bandwidth_bps <= {bandwidth_max}
-          AND vq.created_at >= date('{cutoff_str}')
-        """
 
-        if exclude_vendor:
-            query += f"\n  AND vq.vendor_name <> '{exclude_vendor}'"
-
-        query += """
-        RETURN vq.uuid AS uuid,
-               vq.vendor_name AS vendor_name,
-               vq.mrc AS mrc,
-               vq.nrc AS nrc,
-               vq.bandwidth_bps AS bandwidth_bps,
-               vq.service_type AS service_type,
-               vq.created_at AS quote_date,
-               vq.status AS status,
-               vq.comments AS comments
-        ORDER BY vq.mrc ASC
-        LIMIT 50
-        """
+        params = {
+            "service_type": service_type,
+            "bw_min": bandwidth_min,
+            "bw_max": bandwidth_max,
+            "cutoff": cutoff_date.strftime('%Y-%m-%d'),
+            "exclude_vendor": exclude_vendor or None
+        }
 
         try:
             with self.driver.session(database=self.database) as session:
-                result = session.run(query)
-                records = [dict(record) for record in result]
+                records = session.execute_read(_read_all, self.VQ_BY_LOCATION_QUERY, params)
                 # Filter out Connectbase quotes in Python (faster than Neo4j WHERE clause)
                 records = [
                     vq for vq in records
@@ -189,6 +557,7 @@ class Neo4jClient:
             print(f"[Neo4j] Error executing query: {e}")
             return []
 
+    @ttl_cached(_record_cache, cache_if=bool)
     def get_vendor_quote_by_id(self, vq_id: str) -> Optional[Dict]:
         """
         Get a specific vendor quote by UUID
@@ -204,37 +573,14 @@ class Neo4jClient:
             print("[Neo4j] No connection available")
             return None
 
-        query = f"""
-        MATCH (vq:VendorQuote {{uuid: '{vq_id}'}})
-        OPTIONAL MATCH (vq)-[:LOCATED_IN]->(city:City)
-        OPTIONAL MATCH (city)-[:IN_STATE]->(state:State)
-        OPTIONAL MATCH (state)-[:IN_COUNTRY]->(country:Country)
-        RETURN vq.uuid AS uuid,
-               vq.vendor_name AS vendor_name,
-               vq.mrc AS mrc,
-               vq.nrc AS nrc,
-               vq.bandwidth_bps AS bandwidth_bps,
-               vq.service_type AS service_type,
-               vq.created_at AS quote_date,
-               vq.status AS status,
-               city.name AS city,
-               city.latitude AS lat,
-               city.longitude AS lon,
-               state.name AS state,
-               country.name AS country
-        """
-
         try:
             with self.driver.session(database=self.database) as session:
-                result = session.run(query)
-                record = result.single()
-                if record:
-                    return dict(record)
-                return None
+                return session.execute_read(_read_single, self.VQ_BY_ID_QUERY, {"vq_id": vq_id})
         except Exception as e:
             print(f"[Neo4j] Error executing query: {e}")
             return None
 
+    @ttl_cached(_record_cache, cache_if=bool)
     def get_service_by_id(self, service_id: str) -> Optional[Dict]:
         """
         Get service details by Service ID
@@ -250,39 +596,52 @@ class Neo4jClient:
             print("[Neo4j] No connection available")
             return None
 
-        query = f"""
-        MATCH (s:Service {{service_id: '{service_id}'}})
-        OPTIONAL MATCH (s)-[:LOCATED_AT]->(loc:Location)
-        RETURN s.service_id AS service_id,
-               s.mrc AS mrc,
-               s.service_type AS service_type,
-               s.bandwidth_bps AS bandwidth_bps,
-               loc.address AS address,
-               loc.latitude AS lat,
-               loc.longitude AS lon,
-               loc.city AS city,
-               loc.state AS state,
-               loc.country AS country
-        """
-
         try:
             with self.driver.session(database=self.database) as session:
-                result = session.run(query)
-                record = result.single()
-                if record:
-                    return dict(record)
-                return None
+                return session.execute_read(_read_single, self.SERVICE_BY_ID_QUERY, {"service_id": service_id})
         except Exception as e:
             print(f"[Neo4j] Error executing query: {e}")
             return None
 
-    def execute_cypher(self, query: str, params: Optional[Dict] = None) -> List[Dict]:
+    @ttl_cached(_record_cache, cache_if=lambda bps: bps is not None)
+    def get_bandwidth_bps(self, bandwidth_id) -> Optional[int]:
         """
-        Execute a custom Cypher query
+        Get the bps amount of a Bandwidth node
+
+        Bandwidths are a fixed catalog, so lookups are cached and repeated
+        services rarely pay the round trip.
+
+        Args:
+            bandwidth_id: Bandwidth node id
+
+        Returns:
+            Bandwidth in bps, or None if unknown
+        """
+        bw_result = self.execute_cypher(self.BANDWIDTH_BPS_QUERY, {"bandwidth_id": bandwidth_id})
+        return bw_result[0].get('bps_amount') if bw_result else None
+
+    def _session(self):
+        """
+        Open a session on the configured database
+
+        Returns a null context (yielding None) when there is no connection, so
+        callers can still pass the result on to execute_cypher.
+        """
+        if not self.driver:
+            return nullcontext()
+        return self.driver.session(database=self.database)
+
+    def execute_cypher(self, query: str, params: Optional[Dict] = None, session=None) -> List[Dict]:
+        """
+        Execute a custom (read-only) Cypher query
+
+        Runs as a managed read transaction, so the driver retries it on
+        transient errors such as a defunct pooled connection.
 
         Args:
             query: Cypher query string
             params: Optional parameters for the query
+            session: Open session to run on (a new one is opened if omitted)
 
         Returns:
             List of result dictionaries
@@ -293,13 +652,33 @@ class Neo4jClient:
             return []
 
         try:
-            with self.driver.session(database=self.database) as session:
-                result = session.run(query, params or {})
-                return [dict(record) for record in result]
+            if session is not None:
+                return session.execute_read(_read_all, query, params or {})
+            with self._session() as session:
+                return session.execute_read(_read_all, query, params or {})
         except Exception as e:
             print(f"[Neo4j] Error executing query: {e}")
             return []
 
+    def _attach_vendors(self, quotes: List[Dict], session=None):
+        """
+        Set vendor_name / vendor_id on each quote from one batched lookup
+
+        Quotes without a PROVIDED_QUOTE vendor get None for both.
+        """
+        if not quotes:
+            return
+
+        vendors = {}
+        vq_ids = [vq['vq_id'] for vq in quotes]
+        for row in self.execute_cypher(self.VQ_VENDORS_QUERY, {"vq_ids": vq_ids}, session=session):
+            vendors.setdefault(row['vq_id'], row)  # first vendor wins, as with the per-quote lookup
+
+        for vq in quotes:
+            vendor = vendors.get(vq['vq_id'])
+            vq['vendor_name'] = vendor['vendor_name'] if vendor else None
+            vq['vendor_id'] = vendor['vendor_id'] if vendor else None
+
     def get_vendor_quotes_for_service(self, service_id: str, include_nearby: bool = True, radius_meters: int = 1000) -> Dict[str, List[Dict]]:
         """
         Get vendor quotes associated with a specific service
@@ -307,6 +686,10 @@ class Neo4jClient:
         Pattern: Service → Quote → Task (via fk_task_id) ← VendorQuotes
         Also includes nearby VendorQuotes within specified radius (IGIQ data)
 
+        The associated and nearby lookups run concurrently; the VPL API call
+        (which needs the associated quotes' bandwidth) overlaps with the
+        nearby one. Each branch uses its own session.
+
         Args:
             service_id: Service identifier (e.g., 'GTT.1340.D002')
             include_nearby: Whether to include nearby VendorQuotes from IGIQ (default: True)
@@ -315,290 +698,195 @@ class Neo4jClient:
         Returns:
             Dict with 'associated' and 'nearby' lists of vendor quote records
         """
-        # Get associated VendorQuotes
-        query_associated = """
-        MATCH (s:Service {service_id: $service_id})-[:RELATED_TO]->(q:Quote)
-        MATCH (q)-[:REQUIRES]->(t:Task)
-        MATCH (vq:VendorQuote)
-        WHERE vq.fk_task_id = t.id
-          AND vq.status IN ['desk_results_feasible', 'site_survey_results_feasible']
-          AND vq.mrc IS NOT NULL
-        OPTIONAL MATCH (vq)-[:OF_TYPE]->(st:ServiceType)
-        OPTIONAL MATCH (vq)-[:BANDWIDTH_DOWN_OF]->(bw:Bandwidth)
-        RETURN vq.id as vq_id,
-               vq.quickbase_id as quickbase_id,
-               vq.mrc as mrc,
-               vq.nrc as nrc,
-               vq.exchange_rate as exchange_rate,
-               vq.status as status,
-               vq.lead_time as lead_time,
-               vq.latitude as latitude,
-               vq.longitude as longitude,
-               vq.date_created as date_created,
-               vq.comments as comments,
-               st.name as service_type,
-               st.id as service_type_id,
-               bw.name as bandwidth,
-               bw.id as bandwidth_id,
-               t.id as task_id
-        ORDER BY vq.mrc ASC
-        """
+        if not include_nearby:
+            return {
+                'associated': self._associated_quotes(service_id),
+                'nearby': [],
+                'vpl': []
+            }
 
-        associated_results = self.execute_cypher(query_associated, {"service_id": service_id})
+        associated_future = _query_pool.submit(self._associated_quotes, service_id)
+        service = self._service_info(service_id)
+        nearby_future = _query_pool.submit(self._nearby_quotes, service_id, service, radius_meters) if service else None
+        associated_results = associated_future.result()
 
-        # Filter out Connectbase quotes in Python (faster than Neo4j WHERE clause)
-        if associated_results:
+        # Get VPL data (Vendor Price Lists from IGIQ API)
+        vpl_results = self._vpl_quotes(service, associated_results) if service else []
+        nearby_results = nearby_future.result() if nearby_future else []
+
+        return {
+            'associated': associated_results,
+            'nearby': nearby_results,
+            'vpl': vpl_results
+        }
+
+    def _associated_quotes(self, service_id: str) -> List[Dict]:
+        """Associated VendorQuotes of a service, with vendor info"""
+        with self._session() as session:
+            associated_results = self.execute_cypher(self.ASSOCIATED_VQ_QUERY, {"service_id": service_id}, session=session)
+
+            # Filter out Connectbase quotes in Python (faster than Neo4j WHERE clause)
             associated_results = [
                 vq for vq in associated_results
                 if not (vq.get('comments') and 'connectbase' in str(vq.get('comments')).lower())
             ]
 
-        # Add vendor info to associated quotes
-        if associated_results:
-            for vq in associated_results:
-                vendor_query = """
-                MATCH (vq:VendorQuote {id: $vq_id})<-[:PROVIDED_QUOTE]-(v:Vendor)
-                RETURN v.name as vendor_name, v.id as vendor_id
-                """
-                vendor_result = self.execute_cypher(vendor_query, {"vq_id": vq['vq_id']})
-                if vendor_result:
-                    vq['vendor_name'] = vendor_result[0]['vendor_name']
-                    vq['vendor_id'] = vendor_result[0]['vendor_id']
-                else:
-                    vq['vendor_name'] = None
-                    vq['vendor_id'] = None
-                vq['source'] = 'associated'
-
-        nearby_results = []
-
-        if include_nearby:
-            # Get service location and characteristics
-            service_query = """
-            MATCH (s:Service {service_id: $service_id})
-            OPTIONAL MATCH (s)-[:OF_TYPE]->(st:ServiceType)
-            OPTIONAL MATCH (s)-[:BANDWIDTH_DOWN_OF]->(bw:Bandwidth)
-            RETURN s.latitude as lat, s.longitude as lon,
-                   st.id as service_type_id, bw.id as bandwidth_id
-            """
-            service_info = self.execute_cypher(service_query, {"service_id": service_id})
-
-            if service_info and service_info[0]['lat'] and service_info[0]['lon']:
-                service_lat = service_info[0]['lat']
-                service_lon = service_info[0]['lon']
-                service_type_id = service_info[0]['service_type_id']
-                bandwidth_id = service_info[0]['bandwidth_id']
-
-                # Calculate bounding box for radius
-                import math
-                km_per_deg_lat = 111.0
-                km_per_deg_lon = 111.0 * math.cos(math.radians(float(service_lat)))
-
-                radius_km = radius_meters / 1000.0
-                delta_lat = radius_km / km_per_deg_lat
-                delta_lon = radius_km / km_per_deg_lon
-
-                lat_min = float(service_lat) - delta_lat
-                lat_max = float(service_lat) + delta_lat
-                lon_min = float(service_lon) - delta_lon
-                lon_max = float(service_lon) + delta_lon
-
-                # Get nearby VendorQuotes (IGIQ data) from last 12 months
-                # Note: Bandwidth filtering happens in Python to allow flexibility
-                query_nearby = f"""
-                MATCH (vq:VendorQuote)
-                WHERE vq.latitude >= {lat_min} AND vq.latitude <= {lat_max}
-                  AND vq.longitude >= {lon_min} AND vq.longitude <= {lon_max}
-                  AND vq.status IN ['desk_results_feasible', 'site_survey_results_feasible']
-                  AND vq.mrc IS NOT NULL
-                  AND vq.date_created >= datetime() - duration({{months: 12}})
-                OPTIONAL MATCH (vq)-[:OF_TYPE]->(st:ServiceType)
-                OPTIONAL MATCH (vq)-[:BANDWIDTH_DOWN_OF]->(bw:Bandwidth)
-                WHERE (st.id = {service_type_id} OR {service_type_id} IS NULL)
-                RETURN vq.id as vq_id,
-                       vq.quickbase_id as quickbase_id,
-                       vq.mrc as mrc,
-                       vq.nrc as nrc,
-                       vq.exchange_rate as exchange_rate,
-                       vq.status as status,
-                       vq.lead_time as lead_time,
-                       vq.latitude as latitude,
-                       vq.longitude as longitude,
-                       vq.date_created as date_created,
-                       vq.comments as comments,
-                       st.name as service_type,
-                       st.id as service_type_id,
-                       bw.name as bandwidth,
-                       bw.id as bandwidth_id,
-                       bw.bps_amount as bandwidth_bps
-                ORDER BY vq.mrc ASC
-                LIMIT 50
-                """
-
-                nearby_results = self.execute_cypher(query_nearby)
+            # Add vendor info to associated quotes
+            if associated_results:
+                self._attach_vendors(associated_results, session=session)
+                for vq in associated_results:
+                    vq['source'] = 'associated'
 
-                # Filter out Connectbase quotes in Python (faster than Neo4j WHERE clause)
-                if nearby_results:
-                    nearby_results = [
-                        vq for vq in nearby_results
-                        if not (vq.get('comments') and 'connectbase' in str(vq.get('comments')).lower())
-                    ]
-
-                if nearby_results:
-                    # Calculate exact distances and filter
-                    def haversine_distance(lat1, lon1, lat2, lon2):
-                        R = 6371000  # Earth radius in meters
-                        phi1 = math.radians(float(lat1))
-                        phi2 = math.radians(float(lat2))
-                        delta_phi = math.radians(float(lat2) - float(lat1))
-                        delta_lambda = math.radians(float(lon2) - float(lon1))
-                        a = math.sin(delta_phi/2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(delta_lambda/2)**2
-                        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-                        return R * c
-
-                    # Get service bandwidth for flexible filtering
-                    service_bandwidth_bps = None
-                    if bandwidth_id:
-                        bw_query = """
-                        MATCH (bw:Bandwidth {id: $bandwidth_id})
-                        RETURN bw.bps_amount as bps_amount
-                        """
-                        bw_result = self.execute_cypher(bw_query, {"bandwidth_id": bandwidth_id})
-                        if bw_result:
-                            service_bandwidth_bps = bw_result[0].get('bps_amount')
-
-                    # Filter by exact distance, bandwidth (flexible), and add vendor info
-                    filtered_nearby = []
-                    associated_vq_ids = {vq['vq_id'] for vq in associated_results} if associated_results else set()
-
-                    for vq in nearby_results:
-                        if vq['vq_id'] not in associated_vq_ids:  # Exclude already associated
-                            distance = haversine_distance(
-                                service_lat, service_lon,
-                                vq['latitude'], vq['longitude']
-                            )
-                            if distance <= radius_meters:
-                                # Bandwidth filter: allow exact match or slightly higher (up to 2x)
-                                vq_bandwidth_bps = vq.get('bandwidth_bps')
-                                if service_bandwidth_bps and vq_bandwidth_bps:
-                                    # Only include if: exact match OR higher but not more than 2x
-                                    if vq_bandwidth_bps < service_bandwidth_bps:
-                                        continue  # Skip lower bandwidth
-                                    if vq_bandwidth_bps > service_bandwidth_bps * 2:
-                                        continue  # Skip much higher bandwidth (>2x)
-
-                                vq['distance_meters'] = distance
-                                vq['source'] = 'nearby_igiq'
-
-                                # Get vendor info
-                                vendor_query = """
-                                MATCH (vq:VendorQuote {id: $vq_id})<-[:PROVIDED_QUOTE]-(v:Vendor)
-                                RETURN v.name as vendor_name, v.id as vendor_id
-                                """
-                                vendor_result = self.execute_cypher(vendor_query, {"vq_id": vq['vq_id']})
-                                if vendor_result:
-                                    vq['vendor_name'] = vendor_result[0]['vendor_name']
-                                    vq['vendor_id'] = vendor_result[0]['vendor_id']
-                                else:
-                                    vq['vendor_name'] = None
-                                    vq['vendor_id'] = None
-
-                                filtered_nearby.append(vq)
-
-                    nearby_results = filtered_nearby
+        return associated_results
 
-        # Get VPL data (Vendor Price Lists from IGIQ API)
-        vpl_results = []
+    def _service_info(self, service_id: str) -> Optional[Dict]:
+        """
+        Service location, type and bandwidth (with its bps) in one lookup,
+        shared by the nearby and VPL branches
+
+        Returns:
+            Service info dictionary, or None when the service is missing or
+            has no coordinates
+        """
+        service_info = self.execute_cypher(self.SERVICE_INFO_QUERY, {"service_id": service_id})
+        if not (service_info and service_info[0]['lat'] and service_info[0]['lon']):
+            return None
+        return service_info[0]
+
+    def _nearby_quotes(self, service_id: str, service: Dict, radius_meters: int) -> List[Dict]:
+        """Nearby VendorQuotes around a service, with vendor info"""
+        service_lat = float(service['lat'])
+        service_lon = float(service['lon'])
+
+        # Calculate bounding box for radius
+        km_per_deg_lat = 111.0
+        km_per_deg_lon = 111.0 * math.cos(math.radians(service_lat))
+
+        radius_km = radius_meters / 1000.0
+        delta_lat = radius_km / km_per_deg_lat
+        delta_lon = radius_km / km_per_deg_lon
+
+        # Bandwidth filter: allow exact match or slightly higher (up to 2x)
+        service_bandwidth_bps = service.get('bandwidth_bps') or None
+
+        params = {
+            "lat_min": service_lat - delta_lat,
+            "lat_max": service_lat + delta_lat,
+            "lon_min": service_lon - delta_lon,
+            "lon_max": service_lon + delta_lon,
+            "lat": service_lat,
+            "lon": service_lon,
+            "radius": float(radius_meters),
+            "service_id": service_id,
+            "service_type_id": service['service_type_id'],
+            "bw_min": service_bandwidth_bps,
+            "bw_max": service_bandwidth_bps * 2 if service_bandwidth_bps else None
+        }
 
-        if include_nearby:
-            from connectors.vpl_api import VPLAPIClient
+        # Seek by geohash cell when enabled and the box is small enough
+        query = self.NEARBY_VQ_QUERY
+        if NEO4J_NEARBY_GEOHASH:
+            cells = cells_in_box(params["lat_min"], params["lat_max"], params["lon_min"], params["lon_max"])
+            if cells:
+                query = self.NEARBY_VQ_GEOHASH_QUERY
+                params["cells"] = cells
 
-            service_info = self.execute_cypher(
-                "MATCH (s:Service {service_id: $service_id}) "
-                "OPTIONAL MATCH (s)-[:OF_TYPE]->(st:ServiceType) "
-                "OPTIONAL MATCH (s)-[:BANDWIDTH_DOWN_OF]->(bw:Bandwidth) "
-                "RETURN s.latitude as lat, s.longitude as lon, st.id as service_type_id, bw.id as bandwidth_id",
-                {"service_id": service_id}
+        with self._session() as session:
+            # Get nearby VendorQuotes (IGIQ data) from last 12 months, with
+            # their exact distance, not associated and at a similar bandwidth
+            nearby_results = self.execute_cypher(query, params, session=session)
+
+            # Filter out Connectbase quotes in Python (faster than Neo4j WHERE clause)
+            nearby_results = [
+                vq for vq in nearby_results
+                if not (vq.get('comments') and 'connectbase' in str(vq.get('comments')).lower())
+            ]
+            for vq in nearby_results:
+                vq['source'] = 'nearby_igiq'
+
+            self._attach_vendors(nearby_results, session=session)
+
+        return nearby_results
+
+    def _vpl_quotes(self, service: Dict, associated_results: List[Dict]) -> List[Dict]:
+        """VPL API prices near the service, at a bandwidth similar to the service's"""
+        vpl_results = []
+
+        try:
+            vpl_client = _get_vpl_client()
+            service_lat = service['lat']
+            service_lon = service['lon']
+            service_type_id = service['service_type_id']
+
+            # Get bandwidth from service or first associated VQ
+            bandwidth_bps = 100000000  # Default 100Mbps
+            bandwidth_id = service.get('bandwidth_id')
+            bandwidth_bps_amount = service.get('bandwidth_bps')
+
+            # Try to get from associated VQ first (only needs a lookup
+            # when it differs from the service's own bandwidth)
+            if associated_results and associated_results[0].get('bandwidth_id'):
+                if associated_results[0]['bandwidth_id'] != bandwidth_id:
+                    bandwidth_id = associated_results[0]['bandwidth_id']
+                    bandwidth_bps_amount = self.get_bandwidth_bps(bandwidth_id)
+
+            if bandwidth_id and bandwidth_bps_amount:
+                bandwidth_bps = bandwidth_bps_amount
+
+            vpl_data = vpl_client.get_prices(
+                lat=float(service_lat),
+                lon=float(service_lon),
+                service_type=service_type_id or 16,  # Default to DIA
+                bandwidth_bps=bandwidth_bps,
+                status='active'
             )
 
-            if service_info and service_info[0]['lat'] and service_info[0]['lon']:
-                try:
-                    vpl_client = VPLAPIClient()
-                    service_lat = service_info[0]['lat']
-                    service_lon = service_info[0]['lon']
-                    service_type_id = service_info[0]['service_type_id']
-
-                    # Get bandwidth from service or first associated VQ
-                    bandwidth_bps = 100000000  # Default 100Mbps
-                    bandwidth_id = service_info[0].get('bandwidth_id')
-
-                    # Try to get from associated VQ first
-                    if associated_results and associated_results[0].get('bandwidth_id'):
-                        bandwidth_id = associated_results[0].get('bandwidth_id')
-
-                    # Get bandwidth in bps from Neo4j
-                    if bandwidth_id:
-                        bw_query = f"MATCH (bw:Bandwidth {{id: {bandwidth_id}}}) RETURN bw.bps_amount as bps"
-                        bw_result = self.execute_cypher(bw_query)
-                        if bw_result and bw_result[0].get('bps'):
-                            bandwidth_bps = bw_result[0]['bps']
-
-                    vpl_data = vpl_client.get_prices(
-                        lat=float(service_lat),
-                        lon=float(service_lon),
-                        service_type=service_type_id or 16,  # Default to DIA
-                        bandwidth_bps=bandwidth_bps,
-                        status='active'
-                    )
-
-                    # Process VPL results - filter by similar bandwidth
-                    # Allow ±50% bandwidth variance
-                    bw_min = bandwidth_bps * 0.5
-                    bw_max = bandwidth_bps * 1.5
-
-                    for vpl in vpl_data:
-                        vendor_name = vpl.get('vendor', {}).get('name')
-                        currency = vpl.get('currency', {})
-                        exchange_rate = currency.get('exchange_rate', 1.0)
-
-                        # Process each price in the VPL
-                        for price in vpl.get('prices', []):
-                            bw_down = price.get('bw_down', {})
-                            bw_amount = bw_down.get('bps_amount', 0)
-
-                            # Only include prices with similar bandwidth
-                            if bw_amount and bw_min <= bw_amount <= bw_max:
-                                vpl_results.append({
-                                    'vq_id': None,
-                                    'quickbase_id': None,
-                                    'mrc': price.get('mrc', 0) / exchange_rate,  # Convert to USD
-                                    'nrc': price.get('nrc', 0) / exchange_rate,
-                                    'status': vpl.get('status'),
-                                    'lead_time': None,
-                                    'latitude': service_lat,
-                                    'longitude': service_lon,
-                                    'date_created': vpl.get('created_at'),
-                                    'service_type': vpl.get('service_type', {}).get('label'),
-                                    'service_type_id': vpl.get('service_type', {}).get('id'),
-                                    'bandwidth': bw_down.get('label'),
-                                    'bandwidth_bps': bw_amount,
-                                    'bandwidth_id': bw_down.get('bw'),
-                                    'vendor_name': vendor_name,
-                                    'vendor_id': None,
-                                    'source': 'vpl_api',
-                                    'currency_code': currency.get('code'),
-                                    'exchange_rate': exchange_rate,
-                                    'vpl_slug': vpl.get('slug'),
-                                    'price_slug': price.get('slug')
-                                })
-                except Exception as e:
-                    print(f"[Neo4j] Warning: Could not fetch VPL data: {e}")
+            # Process VPL results - filter by similar bandwidth
+            # Allow ±50% bandwidth variance
+            bw_min = bandwidth_bps * 0.5
+            bw_max = bandwidth_bps * 1.5
+
+            for vpl in vpl_data:
+                vendor_name = vpl.get('vendor', {}).get('name')
+                currency = vpl.get('currency', {})
+                exchange_rate = currency.get('exchange_rate', 1.0)
+
+                # Process each price in the VPL
+                for price in vpl.get('prices', []):
+                    bw_down = price.get('bw_down', {})
+                    bw_amount = bw_down.get('bps_amount', 0)
+
+                    # Only include prices with similar bandwidth
+                    if bw_amount and bw_min <= bw_amount <= bw_max:
+                        vpl_results.append({
+                            'vq_id': None,
+                            'quickbase_id': None,
+                            'mrc': price.get('mrc', 0) / exchange_rate,  # Convert to USD
+                            'nrc': price.get('nrc', 0) / exchange_rate,
+                            'status': vpl.get('status'),
+                            'lead_time': None,
+                            'latitude': service_lat,
+                            'longitude': service_lon,
+                            'date_created': vpl.get('created_at'),
+                            'service_type': vpl.get('service_type', {}).get('label'),
+                            'service_type_id': vpl.get('service_type', {}).get('id'),
+                            'bandwidth': bw_down.get('label'),
+                            'bandwidth_bps': bw_amount,
+                            'bandwidth_id': bw_down.get('bw'),
+                            'vendor_name': vendor_name,
+                            'vendor_id': None,
+                            'source': 'vpl_api',
+                            'currency_code': currency.get('code'),
+                            'exchange_rate': exchange_rate,
+                            'vpl_slug': vpl.get('slug'),
+                            'price_slug': price.get('slug')
+                        })
+        except Exception as e:
+            print(f"[Neo4j] Warning: Could not fetch VPL data: {e}")
 
-        return {
-            'associated': associated_results or [],
-            'nearby': nearby_results or [],
-            'vpl': vpl_results or []
-        }
+        return vpl_results
 
+    @ttl_cached(_vendor_cache, cache_if=bool)
     def get_vendor_names(self, search_term: str, limit: int = 20) -> List[str]:
         """
         Get list of unique vendor names matching search term for autocomplete
@@ -614,16 +902,7 @@ class Neo4jClient:
             return []
 
         try:
-            query = """
-                MATCH (v:Vendor)
-                WHERE toLower(v.name) CONTAINS toLower($search_term)
-                AND v.name IS NOT NULL
-                RETURN DISTINCT v.name as vendor_name
-                ORDER BY v.name
-                LIMIT $limit
-            """
-
-            results = self.execute_cypher(query, {"search_term": search_term, "limit": limit})
+            results = self.execute_cypher(self.VENDOR_NAMES_QUERY, {"search_term": search_term, "limit": limit})
 
             vendor_names = [r['vendor_name'] for r in results if r.get('vendor_name')]
             return vendor_names
@@ -632,39 +911,30 @@ class Neo4jClient:
             print(f"Error getting vendor names: {e}")
             return []
 
-    def get_vendor_contract_history(self, vendor_name: str, limit: int = 500) -> List[Dict]:
+    @ttl_cached(_vendor_cache, cache_if=bool)
+    def get_vendor_contract_history(self, vendor_name: str, limit: int = 500, page: int = 1) -> List[Dict]:
         """
         Get new contract history for a vendor (VendorQuotes)
 
         Args:
             vendor_name: Vendor name to search for
-            limit: Maximum number of results to return (default: 500)
+            limit: Maximum number of results per page (default: 500)
+            page: 1-based page number (default: 1)
 
         Returns:
             List of contract records with MRC and date information
+            (Connectbase quotes are dropped after paging, so a page may
+            hold fewer than limit records)
         """
         if not self.driver:
             return []
 
         try:
-            # Query prioritizes contracts with MRC data, then orders by date
-            query = """
-                MATCH (v:Vendor {name: $vendor_name})-[:PROVIDED_QUOTE]->(vq:VendorQuote)
-                OPTIONAL MATCH (vq)-[:BANDWIDTH_DOWN_OF]->(bw:Bandwidth)
-                WITH vq, bw
-                ORDER BY
-                    CASE WHEN vq.mrc IS NOT NULL THEN 0 ELSE 1 END,
-                    vq.date_created DESC
-                LIMIT $limit
-                RETURN vq.id as quote_id,
-                       vq.date_created as quote_date,
-                       vq.fk_task_id as task_id,
-                       vq.mrc as mrc,
-                       vq.comments as comments,
-                       bw.label as bandwidth
-            """
-
-            results = self.execute_cypher(query, {"vendor_name": vendor_name, "limit": limit})
+            results = self.execute_cypher(self.CONTRACT_HISTORY_QUERY, {
+                "vendor_name": vendor_name,
+                "skip": max(page - 1, 0) * limit,
+                "limit": limit
+            })
 
             # Filter out Connectbase quotes in Python (faster than Neo4j WHERE clause)
             results = [
@@ -674,22 +944,11 @@ class Neo4jClient:
 
             contracts = []
             for r in results:
-                # Format date_created if available
-                quote_date = r.get('quote_date')
-                if quote_date:
-                    # Neo4j DateTime object
-                    try:
-                        quote_date_str = quote_date.isoformat()[:10]  # Get YYYY-MM-DD
-                    except:
-                        quote_date_str = str(quote_date)[:10]
-                else:
-                    quote_date_str = 'N/A'
-
                 contracts.append({
                     'quote_id': r.get('quote_id'),
-                    'quote_date': quote_date_str,
+                    'quote_date': r.get('quote_date'),
                     'task_id': r.get('task_id'),
-                    'service_id': f"Task-{r.get('task_id')}" if r.get('task_id') else 'N/A',
+                    'service_id': r.get('service_id'),
                     'mrc': r.get('mrc'),
                     'bandwidth': r.get('bandwidth', 'N/A'),
                     'status': 'Quoted'
@@ -702,10 +961,5 @@ class Neo4jClient:
             return []
 
     def close(self):
-        """Close the Neo4j driver connection"""
-        if self.driver:
-            self.driver.close()
-
-    def __del__(self):
-        """Cleanup on destruction"""
-        self.close()
+        """Release this client (the shared driver stays open for other clients)"""
+        self.driver = None
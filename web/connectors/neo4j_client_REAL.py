@@ -1,20 +1,356 @@
 """
 Neo4j Client - Conexión REAL usando herramientas disponibles
 """
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+from typing import Final, Iterator, List, Dict, Optional, Tuple
+import asyncio
+import logging
+import threading
+from neo4j import READ_ACCESS, AsyncGraphDatabase, RoutingControl
+
+from config import (
+    NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, NEO4J_DATABASE,
+    NEO4J_MAX_CONNECTION_LIFETIME, NEO4J_MAX_CONNECTION_POOL_SIZE,
+    NEO4J_CONNECTION_ACQUISITION_TIMEOUT, NEO4J_CONNECTION_TIMEOUT,
+    NEO4J_WARMUP, NEO4J_CYPHER_RUNTIME, NEO4J_DENORMALIZED_LOCATION
+)
+from connectors.neo4j_client import get_driver
+from utils.cache import TTLCache, ttl_cached
+
+# Placeholder mode (no connection) logs the queries it would run at DEBUG
+logger = logging.getLogger(__name__)
+
+# Query templates are constant (Final: never rebuilt or reassigned, so the
+# text stays byte-identical) and take every value as a $parameter, so Neo4j
+# caches one plan per template and user input never becomes Cypher text
+# ($exclude may be null, so one template covers both cases). Each returns a
+# single map projection per row, which _run() hands back as the result dict.
+# Every template starts with the pinned runtime, if NEO4J_CYPHER_RUNTIME sets one.
+_CYPHER_PREFIX: Final[str] = f"CYPHER runtime={NEO4J_CYPHER_RUNTIME}" if NEO4J_CYPHER_RUNTIME else ""
+GET_QUOTES_BY_LOC_Q: Final[str] = _CYPHER_PREFIX + """
+MATCH (vq:VendorQuote)
+WHERE vq.service_type = $service_type
+  AND vq.bandwidth_bps >= $bw_min
+  AND vq.bandwidth_bps <= $bw_max
+  AND vq.created_at >= date() - duration({months: $months_back})
+  AND ($exclude IS NULL OR vq.vendor_name <> $exclude)
+RETURN vq {.uuid, .vendor_name, .mrc, .nrc, .bandwidth_bps, .service_type,
+           quote_date: vq.created_at, .status} AS quote
+ORDER BY vq.mrc ASC
+LIMIT 50
+"""
+
+# Same filters restricted to $radius_m meters around ($lat, $lon); the
+# distance predicate on vq.location can use the VendorQuote point index
+GET_QUOTES_NEAR_Q: Final[str] = _CYPHER_PREFIX + """
+WITH point({latitude: $lat, longitude: $lon}) AS center
+MATCH (vq:VendorQuote)
+WHERE point.distance(vq.location, center) <= $radius_m
+  AND vq.service_type = $service_type
+  AND vq.bandwidth_bps >= $bw_min
+  AND vq.bandwidth_bps <= $bw_max
+  AND vq.created_at >= date() - duration({months: $months_back})
+  AND ($exclude IS NULL OR vq.vendor_name <> $exclude)
+RETURN vq {.uuid, .vendor_name, .mrc, .nrc, .bandwidth_bps, .service_type,
+           quote_date: vq.created_at, .status,
+           distance_meters: point.distance(vq.location, center)} AS quote
+ORDER BY vq.mrc ASC
+LIMIT 50
+"""
+
+# A quote LOCATED_IN several cities would otherwise come back once per
+# (city, state, country) match; collapse to the first location, one row per quote
+GET_QUOTE_BY_ID_Q: Final[str] = _CYPHER_PREFIX + """
+MATCH (vq:VendorQuote {uuid: $vq_id})
+OPTIONAL MATCH (vq)-[:LOCATED_IN]->(city:City)
+OPTIONAL MATCH (city)-[:IN_STATE]->(state:State)
+OPTIONAL MATCH (state)-[:IN_COUNTRY]->(country:Country)
+WITH vq, head(collect({city: city.name, lat: city.latitude, lon: city.longitude,
+                       state: state.name, country: country.name})) AS loc
+RETURN vq {.uuid, .vendor_name, .mrc, .nrc, .bandwidth_bps, .service_type,
+           quote_date: vq.created_at, .status,
+           city: loc.city, lat: loc.lat, lon: loc.lon,
+           state: loc.state, country: loc.country} AS quote
+"""
+
+GET_SERVICE_BY_ID_Q: Final[str] = _CYPHER_PREFIX + """
+MATCH (s:Service {service_id: $service_id})
+OPTIONAL MATCH (s)-[:LOCATED_AT]->(loc:Location)
+RETURN s {.service_id, .mrc, .service_type, .bandwidth_bps,
+          address: loc.address, lat: loc.latitude, lon: loc.longitude,
+          city: loc.city, state: loc.state, country: loc.country} AS service
+"""
+
+# Just the columns margin checks need, for callers that don't use the location
+GET_SERVICE_SUMMARY_Q: Final[str] = _CYPHER_PREFIX + """
+MATCH (s:Service {service_id: $service_id})
+RETURN s {.service_id, .mrc} AS service
+"""
+
+# Batch forms of the two lookups above: one round trip for a list of ids
+GET_QUOTES_BY_IDS_Q: Final[str] = _CYPHER_PREFIX + """
+UNWIND $ids AS id
+MATCH (vq:VendorQuote {uuid: id})
+OPTIONAL MATCH (vq)-[:LOCATED_IN]->(city:City)
+OPTIONAL MATCH (city)-[:IN_STATE]->(state:State)
+OPTIONAL MATCH (state)-[:IN_COUNTRY]->(country:Country)
+WITH vq, head(collect({city: city.name, lat: city.latitude, lon: city.longitude,
+                       state: state.name, country: country.name})) AS loc
+RETURN vq {.uuid, .vendor_name, .mrc, .nrc, .bandwidth_bps, .service_type,
+           quote_date: vq.created_at, .status,
+           city: loc.city, lat: loc.lat, lon: loc.lon,
+           state: loc.state, country: loc.country} AS quote
+"""
+
+# Quote lookups reading the location copied onto the VendorQuote by
+# refresh_denormalized_locations() instead of walking City -> State -> Country
+# (NEO4J_DENORMALIZED_LOCATION)
+GET_QUOTE_BY_ID_FLAT_Q: Final[str] = _CYPHER_PREFIX + """
+MATCH (vq:VendorQuote {uuid: $vq_id})
+RETURN vq {.uuid, .vendor_name, .mrc, .nrc, .bandwidth_bps, .service_type,
+           quote_date: vq.created_at, .status,
+           city: vq.city_name, lat: vq.loc_lat, lon: vq.loc_lon,
+           state: vq.state_name, country: vq.country_name} AS quote
+"""
+
+GET_QUOTES_BY_IDS_FLAT_Q: Final[str] = _CYPHER_PREFIX + """
+UNWIND $ids AS id
+MATCH (vq:VendorQuote {uuid: id})
+RETURN vq {.uuid, .vendor_name, .mrc, .nrc, .bandwidth_bps, .service_type,
+           quote_date: vq.created_at, .status,
+           city: vq.city_name, lat: vq.loc_lat, lon: vq.loc_lon,
+           state: vq.state_name, country: vq.country_name} AS quote
+"""
+
+_QUOTE_BY_ID_Q: Final[str] = GET_QUOTE_BY_ID_FLAT_Q if NEO4J_DENORMALIZED_LOCATION else GET_QUOTE_BY_ID_Q
+_QUOTES_BY_IDS_Q: Final[str] = GET_QUOTES_BY_IDS_FLAT_Q if NEO4J_DENORMALIZED_LOCATION else GET_QUOTES_BY_IDS_Q
+
+# Copies each quote's first City/State/Country onto it (run by the nightly
+# job through Neo4jClient.refresh_denormalized_locations)
+DENORMALIZE_LOCATION_Q: Final[str] = """
+MATCH (vq:VendorQuote)
+CALL {
+  WITH vq
+  OPTIONAL MATCH (vq)-[:LOCATED_IN]->(city:City)
+  OPTIONAL MATCH (city)-[:IN_STATE]->(state:State)
+  OPTIONAL MATCH (state)-[:IN_COUNTRY]->(country:Country)
+  WITH vq, head(collect({city: city.name, lat: city.latitude, lon: city.longitude,
+                         state: state.name, country: country.name})) AS loc
+  SET vq.city_name = loc.city,
+      vq.loc_lat = loc.lat,
+      vq.loc_lon = loc.lon,
+      vq.state_name = loc.state,
+      vq.country_name = loc.country
+} IN TRANSACTIONS OF 10000 ROWS
+"""
+
+GET_SERVICES_BY_IDS_Q: Final[str] = _CYPHER_PREFIX + """
+UNWIND $ids AS id
+MATCH (s:Service {service_id: id})
+OPTIONAL MATCH (s)-[:LOCATED_AT]->(loc:Location)
+RETURN s {.service_id, .mrc, .service_type, .bandwidth_bps,
+          address: loc.address, lat: loc.latitude, lon: loc.longitude,
+          city: loc.city, state: loc.state, country: loc.country} AS service
+"""
+
+
+@dataclass(frozen=True)
+class _Stmt:
+    """A named query template; every call sends this very same string object"""
+    name: str
+    cypher: str
+
+
+class _Statements:
+    """Registry of the client's queries (Neo4jClient._stmt)"""
+    QUOTES_BY_LOCATION: Final = _Stmt('quotes_by_location', GET_QUOTES_BY_LOC_Q)
+    QUOTES_NEAR: Final = _Stmt('quotes_near', GET_QUOTES_NEAR_Q)
+    QUOTE_BY_ID: Final = _Stmt('quote_by_id', _QUOTE_BY_ID_Q)
+    SERVICE_BY_ID: Final = _Stmt('service_by_id', GET_SERVICE_BY_ID_Q)
+    SERVICE_SUMMARY: Final = _Stmt('service_summary', GET_SERVICE_SUMMARY_Q)
+    QUOTES_BY_IDS: Final = _Stmt('quotes_by_ids', _QUOTES_BY_IDS_Q)
+    SERVICES_BY_IDS: Final = _Stmt('services_by_ids', GET_SERVICES_BY_IDS_Q)
+
+
+# Statement name -> statement, as accepted by Neo4jClient.explain()
+STATEMENTS: Final[Dict[str, _Stmt]] = {
+    stmt.name: stmt for stmt in vars(_Statements).values() if isinstance(stmt, _Stmt)
+}
+
+# Statement -> sentinel parameters run once by Neo4jClient.warm_up(); they
+# match nothing but still read the index pages the real lookups use
+WARMUP_QUERIES = (
+    (_Statements.QUOTES_BY_LOCATION, {"service_type": "__warmup__", "bw_min": 0, "bw_max": 0,
+                                      "months_back": 0, "exclude": None}),
+    (_Statements.QUOTES_NEAR, {"service_type": "__warmup__", "bw_min": 0, "bw_max": 0,
+                               "months_back": 0, "exclude": None,
+                               "lat": 0.0, "lon": 0.0, "radius_m": 0.0}),
+    (_Statements.QUOTE_BY_ID, {"vq_id": "__warmup__"}),
+    (_Statements.SERVICE_BY_ID, {"service_id": "__warmup__"}),
+    (_Statements.SERVICE_SUMMARY, {"service_id": "__warmup__"}),
+    (_Statements.QUOTES_BY_IDS, {"ids": ["__warmup__"]}),
+    (_Statements.SERVICES_BY_IDS, {"ids": ["__warmup__"]}),
+)
+
+
+def _location_query(
+    lat: float,
+    lon: float,
+    service_type: str,
+    bandwidth_min: int,
+    bandwidth_max: int,
+    months_back: int,
+    exclude_vendor: Optional[str],
+    radius_m: Optional[float]
+) -> Tuple[_Stmt, Dict]:
+    """Statement and parameters for a location lookup"""
+    # The server computes the cutoff from its own clock: no per-call date math here
+    params = {
+        "service_type": service_type,
+        "bw_min": bandwidth_min,
+        "bw_max": bandwidth_max,
+        "months_back": int(months_back),
+        "exclude": exclude_vendor or None
+    }
+    if radius_m is None:
+        return _Statements.QUOTES_BY_LOCATION, params
+
+    params.update(lat=float(lat), lon=float(lon), radius_m=float(radius_m))
+    return _Statements.QUOTES_NEAR, params
+
+
+def _read_quote_and_service(tx, vq_id: str, service_id: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """
+    Transaction function for Neo4jClient.get_quote_and_service
+
+    Both RUNs are sent before either result is read, so the driver pipelines
+    them on the connection and the two lookups share one round trip.
+    """
+    quote_result = tx.run(_Statements.QUOTE_BY_ID.cypher, vq_id=vq_id)
+    service_result = tx.run(_Statements.SERVICE_BY_ID.cypher, service_id=service_id)
+
+    quote = next(iter(quote_result), None)
+    service = next(iter(service_result), None)
+    return (quote[0] if quote else None), (service[0] if service else None)
+
+
+# Single quotes / services by id: they change on human timescales, so hot ids
+# are served from memory for 5 minutes (shared by every Neo4jClient)
+_by_id_cache = TTLCache(maxsize=10_000, ttl=300)
+
+# Warm-up runs once per process, however many clients are created
+_warmup_started = False
+_warmup_lock = threading.Lock()
 
 
 class Neo4jClient:
     """Cliente real para Neo4j usando las herramientas disponibles en el entorno"""
 
+    _stmt = _Statements
+
     def __init__(self):
-        """Initialize Neo4j client"""
-        # Aquí deberías importar tus herramientas Neo4j reales
-        # Por ejemplo:
-        # from neo4j_tools import read_neo4j_cypher
-        # self.execute_query = read_neo4j_cypher
-        pass
+        """Initialize Neo4j client on the shared process-wide driver"""
+        try:
+            self._driver = get_driver()
+        except Exception as e:
+            print(f"⚠️  Warning: Could not connect to Neo4j: {e}")
+            self._driver = None
+
+        if NEO4J_WARMUP and self._driver:
+            self._start_warm_up()
+
+    def _start_warm_up(self):
+        """Run warm_up() in a daemon thread, once per process"""
+        global _warmup_started
+        with _warmup_lock:
+            if _warmup_started:
+                return
+            _warmup_started = True
+
+        threading.Thread(target=self.warm_up, name='neo4j-warmup', daemon=True).start()
+
+    def warm_up(self):
+        """
+        Load the store and plans the lookups need before real requests arrive
+
+        Runs apoc.warmup.run when APOC is installed, then each template once
+        with sentinel parameters so its plan is cached and its index pages
+        are resident.
+        """
+        if not self._driver:
+            return
+
+        try:
+            self._driver.execute_query(
+                "CALL apoc.warmup.run(true, true, true)", database_=NEO4J_DATABASE
+            )
+        except Exception as e:
+            print(f"[Neo4j] apoc.warmup.run skipped: {e}")
+
+        try:
+            for stmt, params in WARMUP_QUERIES:
+                self._run(stmt, params)
+            print(f"[Neo4j] Warmed up {len(WARMUP_QUERIES)} query templates")
+        except Exception as e:
+            print(f"[Neo4j] Warning: Could not warm up query templates: {e}")
+
+        if NEO4J_CYPHER_RUNTIME:
+            self.check_runtime()
+
+    def explain(self, name: str, **params) -> Optional[Dict]:
+        """
+        Plan of a query template without running it
+
+        Args:
+            name: Statement name (key of STATEMENTS)
+            **params: Query parameters
+
+        Returns:
+            Plan dict (operatorType, args, children) from the result
+            summary, or None without a connection
+        """
+        if not self._driver:
+            return None
+
+        _, summary, _ = self._driver.execute_query(
+            "EXPLAIN " + STATEMENTS[name].cypher, params,
+            database_=NEO4J_DATABASE, routing_=RoutingControl.READ
+        )
+        return summary.plan
+
+    def check_runtime(self):
+        """Warn about templates Neo4j plans with a runtime other than NEO4J_CYPHER_RUNTIME"""
+        sentinel_params = dict(WARMUP_QUERIES)
+        for name, stmt in STATEMENTS.items():
+            try:
+                plan = self.explain(name, **sentinel_params[stmt])
+            except Exception as e:
+                print(f"[Neo4j] Warning: Could not explain {name}: {e}")
+                continue
+
+            runtime = ((plan or {}).get('args') or {}).get('runtime', '')
+            if str(runtime).lower() != NEO4J_CYPHER_RUNTIME.lower():
+                print(f"[Neo4j] Warning: {name} planned with runtime {runtime or '?'}, "
+                      f"expected {NEO4J_CYPHER_RUNTIME}")
+
+    def _run(self, stmt: _Stmt, params: Dict) -> List[Dict]:
+        """
+        Run a read query through driver.execute_query
+
+        The driver manages the session, retries transient errors and routes
+        the query to a reader. Every template returns one map column, so
+        each row already is the result dict. Without a connection the query
+        is only logged at DEBUG (placeholder mode).
+        """
+        if not self._driver:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[Neo4j Query] Would execute %s:\n%s\nwith %s", stmt.name, stmt.cypher, params)
+            return []
+
+        records, _, _ = self._driver.execute_query(
+            stmt.cypher, params, database_=NEO4J_DATABASE, routing_=RoutingControl.READ
+        )
+        return [record[0] for record in records]
 
     def get_vendor_quotes_by_location(
         self,
@@ -24,97 +360,265 @@ class Neo4jClient:
         bandwidth_min: int,
         bandwidth_max: int,
         months_back: int = 6,
-        exclude_vendor: Optional[str] = None
+        exclude_vendor: Optional[str] = None,
+        radius_m: Optional[float] = None
     ) -> List[Dict]:
-        """Get vendor quotes near a specific location"""
-
-        cutoff_date = datetime.now() - timedelta(days=months_back * 30)
-        cutoff_str = cutoff_date.strftime('%Y-%m-%d')
-
-        query = f"""
-        MATCH (vq:VendorQuote)
-        WHERE vq.service_type = '{service_type}'
-          AND vq.bandwidth_bps >= {bandwidth_min}
-          AND vq.bandwidth_bps <= {bandwidth_max}
-          AND vq.created_at >= date('{cutoff_str}')
-        """
-
-        if exclude_vendor:
-            query += f"\n  AND vq.vendor_name <> '{exclude_vendor}'"
-
-        query += """
-        RETURN vq.uuid AS uuid,
-               vq.vendor_name AS vendor_name,
-               vq.mrc AS mrc,
-               vq.nrc AS nrc,
-               vq.bandwidth_bps AS bandwidth_bps,
-               vq.service_type AS service_type,
-               vq.created_at AS quote_date,
-               vq.status AS status
-        ORDER BY vq.mrc ASC
-        LIMIT 50
-        """
-
-        # AQUÍ REEMPLAZAR CON TU HERRAMIENTA REAL:
-        # Opción A: Si tienes una función Neo4J tool
-        # from neo4j_tools import read_neo4j_cypher
-        # results = read_neo4j_cypher(query)
-
-        # Opción B: Si usas el driver oficial de Neo4j
-        # from neo4j import GraphDatabase
-        # with self.driver.session() as session:
-        #     result = session.run(query)
-        #     results = [dict(record) for record in result]
-
-        # POR AHORA: placeholder
-        print(f"[Neo4j Query] Would execute:\n{query}\n")
-        return []
+        """
+        Get vendor quotes near a specific location
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            service_type: Service type (e.g., 'DIA', 'MPLS')
+            bandwidth_min: Minimum bandwidth in bps
+            bandwidth_max: Maximum bandwidth in bps
+            months_back: How many months to look back
+            exclude_vendor: Vendor name to exclude from results
+            radius_m: Only quotes within this many meters of (lat, lon);
+                None keeps the previous behavior (no distance filter)
+
+        Returns:
+            List of vendor quote dictionaries (with distance_meters when
+            radius_m is given)
+        """
+        stmt, params = _location_query(
+            lat, lon, service_type, bandwidth_min, bandwidth_max,
+            months_back, exclude_vendor, radius_m
+        )
+        return self._run(stmt, params)
+
+    def iter_vendor_quotes_by_location(
+        self,
+        lat: float,
+        lon: float,
+        service_type: str,
+        bandwidth_min: int,
+        bandwidth_max: int,
+        months_back: int = 6,
+        exclude_vendor: Optional[str] = None,
+        radius_m: Optional[float] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream vendor quotes near a specific location
+
+        Same lookup as get_vendor_quotes_by_location, but quotes are yielded
+        as the driver fetches them instead of being collected into a list.
+        The session stays open until the iterator is exhausted or closed.
+        Unlike execute_query, transient errors are not retried.
+
+        Yields:
+            Vendor quote dictionaries
+        """
+        stmt, params = _location_query(
+            lat, lon, service_type, bandwidth_min, bandwidth_max,
+            months_back, exclude_vendor, radius_m
+        )
+        if not self._driver:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[Neo4j Query] Would execute %s:\n%s\nwith %s", stmt.name, stmt.cypher, params)
+            return
+
+        session = self._driver.session(database=NEO4J_DATABASE, default_access_mode=READ_ACCESS)
+        try:
+            for record in session.run(stmt.cypher, params):
+                yield record[0]
+        finally:
+            session.close()
+
+    def refresh_denormalized_locations(self) -> int:
+        """
+        Copy every quote's City/State/Country onto the VendorQuote node
+
+        Meant for the nightly job that keeps NEO4J_DENORMALIZED_LOCATION
+        lookups current. Runs as an auto-commit query because of CALL ... IN
+        TRANSACTIONS.
+
+        Returns:
+            Number of properties set
+        """
+        if not self._driver:
+            return 0
+
+        with self._driver.session(database=NEO4J_DATABASE) as session:
+            summary = session.run(DENORMALIZE_LOCATION_Q).consume()
+        print(f"[Neo4j] Denormalized quote locations ({summary.counters.properties_set} properties set)")
+        return summary.counters.properties_set
 
+    @ttl_cached(_by_id_cache, cache_if=bool)
     def get_vendor_quote_by_id(self, vq_id: str) -> Optional[Dict]:
         """Get a specific vendor quote by UUID"""
+        records = self._run(self._stmt.QUOTE_BY_ID, {"vq_id": vq_id})
+        return records[0] if records else None
 
-        query = f"""
-        MATCH (vq:VendorQuote {{uuid: '{vq_id}'}})
-        OPTIONAL MATCH (vq)-[:LOCATED_IN]->(city:City)
-        OPTIONAL MATCH (city)-[:IN_STATE]->(state:State)
-        OPTIONAL MATCH (state)-[:IN_COUNTRY]->(country:Country)
-        RETURN vq.uuid AS uuid,
-               vq.vendor_name AS vendor_name,
-               vq.mrc AS mrc,
-               vq.nrc AS nrc,
-               vq.bandwidth_bps AS bandwidth_bps,
-               vq.service_type AS service_type,
-               vq.created_at AS quote_date,
-               vq.status AS status,
-               city.name AS city,
-               city.latitude AS lat,
-               city.longitude AS lon,
-               state.name AS state,
-               country.name AS country
-        """
-
-        # REEMPLAZAR con tu herramienta real
-        print(f"[Neo4j Query] Would execute:\n{query}\n")
-        return None
-
+    @ttl_cached(_by_id_cache, cache_if=bool)
     def get_service_by_id(self, service_id: str) -> Optional[Dict]:
         """Get service details by Service ID"""
+        records = self._run(self._stmt.SERVICE_BY_ID, {"service_id": service_id})
+        return records[0] if records else None
+
+    @ttl_cached(_by_id_cache, cache_if=bool)
+    def get_service_summary(self, service_id: str) -> Optional[Dict]:
+        """
+        Get a service's ID and MRC only (no location hop)
+
+        Args:
+            service_id: Service ID
+
+        Returns:
+            Dict with service_id and mrc, or None if not found
+        """
+        records = self._run(self._stmt.SERVICE_SUMMARY, {"service_id": service_id})
+        return records[0] if records else None
+
+    def get_quote_and_service(self, vq_id: str, service_id: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """
+        Get a vendor quote and a service together in one read transaction
+
+        Args:
+            vq_id: Vendor Quote UUID
+            service_id: Service ID
+
+        Returns:
+            (vendor quote, service) tuple; either is None if not found
+        """
+        if not self._driver:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("[Neo4j Query] Would execute %s + %s with vq_id=%s, service_id=%s",
+                             self._stmt.QUOTE_BY_ID.name, self._stmt.SERVICE_BY_ID.name, vq_id, service_id)
+            return None, None
+
+        with self._driver.session(database=NEO4J_DATABASE) as session:
+            return session.execute_read(_read_quote_and_service, vq_id, service_id)
+
+    def get_vendor_quotes_by_ids(self, vq_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get several vendor quotes by UUID in one query
+
+        Args:
+            vq_ids: Vendor Quote UUIDs
+
+        Returns:
+            Dict of UUID -> vendor quote (missing UUIDs are left out)
+        """
+        if not vq_ids:
+            return {}
+
+        quotes = {}
+        for record in self._run(self._stmt.QUOTES_BY_IDS, {"ids": list(vq_ids)}):
+            quotes[record['uuid']] = record
+        return quotes
+
+    def get_services_by_ids(self, service_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get several services by Service ID in one query
+
+        Args:
+            service_ids: Service IDs
+
+        Returns:
+            Dict of Service ID -> service (missing IDs are left out)
+        """
+        if not service_ids:
+            return {}
+
+        services = {}
+        for record in self._run(self._stmt.SERVICES_BY_IDS, {"ids": list(service_ids)}):
+            services.setdefault(record['service_id'], record)
+        return services
+
+
+class AsyncNeo4jClient:
+    """
+    asyncio counterpart of Neo4jClient for callers running on an event loop
+
+    Independent lookups can be awaited together (asyncio.gather), bounded by
+    the driver's connection pool. Lists of ids still go through the UNWIND
+    batch queries. The driver is bound to the event loop that first uses it,
+    so create one client per loop and close() it when done.
+    """
+
+    _stmt = _Statements
+
+    def __init__(self):
+        """Create the async driver (connects lazily on the first query)"""
+        self._driver = AsyncGraphDatabase.driver(
+            NEO4J_URI,
+            auth=(NEO4J_USER, NEO4J_PASSWORD),
+            max_connection_lifetime=NEO4J_MAX_CONNECTION_LIFETIME,
+            max_connection_pool_size=NEO4J_MAX_CONNECTION_POOL_SIZE,
+            connection_acquisition_timeout=NEO4J_CONNECTION_ACQUISITION_TIMEOUT,
+            connection_timeout=NEO4J_CONNECTION_TIMEOUT,
+            keep_alive=True
+        )
+
+    async def close(self):
+        """Close the driver and its connection pool"""
+        await self._driver.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _run(self, stmt: _Stmt, params: Dict) -> List[Dict]:
+        """Run a read query through driver.execute_query (see Neo4jClient._run)"""
+        records, _, _ = await self._driver.execute_query(
+            stmt.cypher, params, database_=NEO4J_DATABASE, routing_=RoutingControl.READ
+        )
+        return [record[0] for record in records]
+
+    async def get_vendor_quotes_by_location(
+        self,
+        lat: float,
+        lon: float,
+        service_type: str,
+        bandwidth_min: int,
+        bandwidth_max: int,
+        months_back: int = 6,
+        exclude_vendor: Optional[str] = None,
+        radius_m: Optional[float] = None
+    ) -> List[Dict]:
+        """Get vendor quotes near a specific location (see Neo4jClient)"""
+        stmt, params = _location_query(
+            lat, lon, service_type, bandwidth_min, bandwidth_max,
+            months_back, exclude_vendor, radius_m
+        )
+        return await self._run(stmt, params)
+
+    async def get_vendor_quote_by_id(self, vq_id: str) -> Optional[Dict]:
+        """Get a specific vendor quote by UUID"""
+        records = await self._run(self._stmt.QUOTE_BY_ID, {"vq_id": vq_id})
+        return records[0] if records else None
+
+    async def get_service_by_id(self, service_id: str) -> Optional[Dict]:
+        """Get service details by Service ID"""
+        records = await self._run(self._stmt.SERVICE_BY_ID, {"service_id": service_id})
+        return records[0] if records else None
+
+    async def get_quote_and_service(self, vq_id: str, service_id: str) -> Tuple[Optional[Dict], Optional[Dict]]:
+        """Get a vendor quote and a service concurrently"""
+        return tuple(await asyncio.gather(
+            self.get_vendor_quote_by_id(vq_id),
+            self.get_service_by_id(service_id)
+        ))
+
+    async def get_vendor_quotes_by_ids(self, vq_ids: List[str]) -> Dict[str, Dict]:
+        """Get several vendor quotes by UUID in one query (see Neo4jClient)"""
+        if not vq_ids:
+            return {}
+
+        quotes = {}
+        for record in await self._run(self._stmt.QUOTES_BY_IDS, {"ids": list(vq_ids)}):
+            quotes.setdefault(record['uuid'], record)
+        return quotes
+
+    async def get_services_by_ids(self, service_ids: List[str]) -> Dict[str, Dict]:
+        """Get several services by Service ID in one query (see Neo4jClient)"""
+        if not service_ids:
+            return {}
 
-        query = f"""
-        MATCH (s:Service {{service_id: '{service_id}'}})
-        OPTIONAL MATCH (s)-[:LOCATED_AT]->(loc:Location)
-        RETURN s.service_id AS service_id,
-               s.mrc AS mrc,
-               s.service_type AS service_type,
-               s.bandwidth_bps AS bandwidth_bps,
-               loc.address AS address,
-               loc.latitude AS lat,
-               loc.longitude AS lon,
-               loc.city AS city,
-               loc.state AS state,
-               loc.country AS country
-        """
-
-        # REEMPLAZAR con tu herramienta real
-        print(f"[Neo4j Query] Would execute:\n{query}\n")
-        return None
+        services = {}
+        for record in await self._run(self._stmt.SERVICES_BY_IDS, {"ids": list(service_ids)}):
+            services.setdefault(record['service_id'], record)
+        return services
@@ -2,11 +2,206 @@
 Quickbase API Client
 Handles connection to Quickbase for historical negotiation data
 """
+import atexit
+import sys
+import threading
+import orjson
 import requests
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, List, Dict
-from config import QUICKBASE_REALM, QUICKBASE_TOKEN, QUICKBASE_TABLE_ID
+from typing import Iterable, Iterator, Optional, List, Dict, Set, Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import (
+    QUICKBASE_REALM, QUICKBASE_TOKEN, QUICKBASE_TABLE_ID, QUICKBASE_CACHE_TTL,
+    QUICKBASE_DISK_CACHE_PATH, QUICKBASE_DISK_CACHE_TTL,
+    QUICKBASE_DELIVERED_MRC_REPORT_ID, QUICKBASE_TIMEOUT, QUICKBASE_BREAKER_FAILURES,
+    QUICKBASE_BREAKER_RESET, QUICKBASE_MAX_CONCURRENT
+)
+from utils.cache import PersistentTTLCache, TTLCache, cache_key, ttl_cached
+from utils.circuit_breaker import CircuitBreaker
+from utils.currency import get_usd_to_brl_rate
+
+# One pooled HTTP session per (realm, token), shared by every QuickbaseClient
+# in the process so TCP/TLS connections are reused across requests
+_sessions: Dict[tuple, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _get_session(realm: str, token: str) -> requests.Session:
+    """Get (or create) the shared session for a realm/token, with auth headers attached"""
+    key = (realm, token)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                session.headers.update({
+                    'QB-Realm-Hostname': realm,
+                    'Authorization': f'QB-USER-TOKEN {token}',
+                    'Content-Type': 'application/json'
+                })
+                # Record queries are reads, so POST is safe to retry; jitter
+                # keeps concurrent workers from retrying in lockstep
+                retry = Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    backoff_jitter=0.25,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset({'GET', 'POST'}),
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+                session.mount('https://', adapter)
+                _sessions[key] = session
+    return session
+
+
+# Shared by every client: once Quickbase is down, all lookups fail fast
+_breaker = CircuitBreaker(fail_max=QUICKBASE_BREAKER_FAILURES, reset_timeout=QUICKBASE_BREAKER_RESET)
+
+
+# Caps concurrent Quickbase requests across every client in the process
+_request_slots = threading.BoundedSemaphore(QUICKBASE_MAX_CONCURRENT)
+
+
+class QuickbaseUnavailable(requests.exceptions.RequestException):
+    """Raised instead of calling Quickbase while the circuit breaker is open"""
+
+
+def close_sessions():
+    """Close the shared sessions and their pooled connections (at process exit)"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+atexit.register(close_sessions)
+
+
+# Per-vendor and per-service lookups change only when new deals are recorded,
+# so results are shared across requests for a few minutes
+_vendor_cache = TTLCache(maxsize=4096, ttl=QUICKBASE_CACHE_TTL)
+_service_cache = TTLCache(maxsize=2048, ttl=QUICKBASE_CACHE_TTL)
+# Service MRC and bandwidth rarely change; optionally keep them on disk too
+_reference_cache = (
+    PersistentTTLCache(QUICKBASE_DISK_CACHE_PATH, maxsize=2048, ttl=QUICKBASE_CACHE_TTL,
+                       disk_ttl=QUICKBASE_DISK_CACHE_TTL)
+    if QUICKBASE_DISK_CACHE_PATH else _service_cache
+)
+
+# Cached lookups keyed by vendor name / by service ID (see QuickbaseClient.invalidate)
+_VENDOR_METHODS = (
+    'get_vendor_negotiation_stats', 'get_vendor_renewal_stats',
+    'get_vendor_delivered_mrc_total', 'get_vendor_renewal_history', 'get_renewal_history_by_vendor'
+)
+_SERVICE_METHODS = ('get_service_mrc', 'get_service_bandwidth', 'get_voc_line_by_service')
+
+# Autocomplete results, keyed by normalized search term -> (sorted names,
+# complete). Kept briefly: the next keystroke usually extends the same term.
+_vendor_names_cache = TTLCache(maxsize=512, ttl=60)
+
+# Runs lookups alongside the query on the calling thread (e.g. the
+# Services-table MRC behind a VOC Line query); pooled tasks never wait on it
+_fallback_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='quickbase-fallback')
+
+
+def _intern(value):
+    """Intern short repeated codes (currency, status) so rows share one string object"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+_EMPTY = {}
+
+# Quickbase tables queried beyond the negotiations table (QUICKBASE_TABLE_ID)
+_VOC_TABLE = "bkr26d56f"  # Vendor Orders & Contract / VOC Lines
+_RENEWALS_TABLE = "bqrc5mm8e"  # Renewals
+_SERVICES_TABLE = "bfwgbisz4"  # Services - P&L
+
+# Filters behind the negotiation stats, matching Quickbase query 247; only the
+# vendor part of the where clause changes per call.
+# Filter 1: Vendor Service Type must be one of specific types. EX matches are
+# case-insensitive, so each type is listed once.
+_NEGOTIATION_SERVICE_TYPES = (
+    'bia', 'bia 3g/4g', 'clear channel / iplc', 'dia', 'ethernet', 'ipvpn', 'ip vpn'
+)
+_SERVICE_TYPE_FILTER = "OR".join(f"{{74.EX.'{st}'}}" for st in _NEGOTIATION_SERVICE_TYPES)
+# Filter 2: Service ID must NOT contain NTL. or IGN.
+_SERVICE_ID_FILTER = "{234.XCT.'NTL.'}AND{234.XCT.'IGN.'}"
+# Filter 3: Service Support Level must be A, B, or D
+_SUPPORT_LEVEL_FILTER = "{273.EX.'A'}OR{273.EX.'B'}OR{273.EX.'D'}"
+_NEGOTIATION_FILTER = f"(({_SERVICE_TYPE_FILTER})AND({_SERVICE_ID_FILTER})AND({_SUPPORT_LEVEL_FILTER}))"
+
+
+def _qb_escape(value) -> str:
+    """Escape single quotes in a value interpolated into a Quickbase where clause"""
+    return str(value).replace("'", "\\'")
+
+
+# VOC Line field IDs read by get_voc_line_by_service(), by name
+_VOC_FIELDS = {
+    'record_id': '3',
+    'service_id': '234',
+    'vendor_name': '245',
+    'vendor_mrc_usd': '135',
+    'status': '254',
+    'bandwidth': '246',
+    'service_type': '247',
+    'lead_time': '248',
+    'nrc_usd': '136',
+    'client_mrc': '397',
+    'currency': '702',
+}
+
+
+# Renewals field IDs read by get_vendor_renewal_history(), by name (currency,
+# field 180, is read separately since it defaults to USD)
+_RENEWAL_HISTORY_FIELDS = {
+    'record_id': '3',
+    'service_id': '234',
+    'vendor_name': '39',
+    'original_mrc': '246',
+    'renewed_mrc': '247',
+    'discount_percent': '248',
+    'renewal_date': '136',
+    'status': '135',
+}
+
+
+def _extract(record: Dict, fields: Dict[str, str]) -> Dict:
+    """Raw values of a Quickbase record's fields, keyed by name (None if missing)"""
+    get = record.get
+    return {name: (get(field_id) or _EMPTY).get('value') for name, field_id in fields.items()}
+
+
+def _parse_voc_record(record: Dict) -> Dict:
+    """Raw values of a VOC Line record's fields, keyed by _VOC_FIELDS name (None if missing)"""
+    return _extract(record, _VOC_FIELDS)
+
+
+def _field_values(records: Iterable[Dict], field_id: str) -> np.ndarray:
+    """One field of a run of Quickbase records as a float array (missing values are NaN)"""
+    values = ((r.get(field_id) or _EMPTY).get('value') for r in records)
+    return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64)
+
+
+def _records_to_cols(records: List[Dict], field_ids: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Several fields of Quickbase records as float arrays, keyed by field ID"""
+    return {field_id: _field_values(records, field_id) for field_id in field_ids}
+
+
+def _is_cacheable(result: Dict) -> bool:
+    """Error fallbacks are not cached so a transient API failure is retried"""
+    return 'error' not in result
+
+
+def _has_data(result: Dict) -> bool:
+    """Only cache lookups that found data (their empty results double as error fallbacks)"""
+    return bool(result.get('has_data'))
 
 
 class QuickbaseClient:
@@ -17,11 +212,33 @@ class QuickbaseClient:
         self.token = token
         self.table_id = table_id
         self.base_url = 'https://api.quickbase.com/v1'
+        self._query_url = f'{self.base_url}/records/query'
         self.headers = {
             'QB-Realm-Hostname': self.realm,
             'Authorization': f'QB-USER-TOKEN {self.token}',
             'Content-Type': 'application/json'
         }
+        self.session = _get_session(self.realm, self.token)
+
+    @staticmethod
+    def invalidate(vendor_name: Optional[str] = None, service_id: Optional[str] = None):
+        """
+        Drop cached lookups after a write, so the next call reads Quickbase again
+
+        Args:
+            vendor_name: Drop this vendor's cached stats and renewal history (with
+                service_id, also its renewal history for that service)
+            service_id: Drop this service's cached MRC, bandwidth and VOC Line
+        """
+        if vendor_name is not None:
+            for name in _VENDOR_METHODS:
+                getattr(QuickbaseClient, name).cache.pop(cache_key(name, (vendor_name,)))
+        if service_id is not None:
+            for name in _SERVICE_METHODS:
+                getattr(QuickbaseClient, name).cache.pop(cache_key(name, (service_id,)))
+            _service_cache.pop(cache_key('get_voc_line_by_service', (service_id,), {'mrc_only': True}))
+        if vendor_name is not None and service_id is not None:
+            _vendor_cache.pop(cache_key('get_renewal_history_by_vendor', (vendor_name, service_id)))
 
     def query_negotiations(
         self,
@@ -29,7 +246,9 @@ class QuickbaseClient:
         date_from: Optional[datetime] = None,
         service_type: Optional[str] = None,
         region: Optional[str] = None,
-        limit: int = 1000
+        limit: int = 1000,
+        parse_dates: bool = True,
+        parse_numeric: bool = True
     ) -> pd.DataFrame:
         """
         Query negotiation history from Quickbase
@@ -40,6 +259,8 @@ class QuickbaseClient:
             service_type: Filter by service type
             region: Filter by region
             limit: Maximum records to return
+            parse_dates: Convert the date column to datetimes
+            parse_numeric: Convert the MRC / discount columns to numbers
 
         Returns:
             DataFrame with negotiation history
@@ -50,7 +271,7 @@ class QuickbaseClient:
 
         if vendor_name:
             # Field ID 10 = Vendor Name (adjust based on actual schema)
-            where_clauses.append(f"{{10.EX.'{vendor_name}'}}")
+            where_clauses.append(f"{{10.EX.'{_qb_escape(vendor_name)}'}}")
 
         if date_from:
             # Field ID 11 = Date Created (adjust based on actual schema)
@@ -72,19 +293,17 @@ class QuickbaseClient:
             payload['where'] = where_clause
 
         try:
-            response = requests.post(
-                f'{self.base_url}/records/query',
-                json=payload,
-                headers=self.headers,
-                timeout=30
+            response = self._post(
+                self._query_url,
+                json=payload
             )
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
             records = data.get('data', [])
 
             # Convert to DataFrame
-            df = self._records_to_dataframe(records)
+            df = self._records_to_dataframe(records, parse_dates=parse_dates, parse_numeric=parse_numeric)
 
             return df
 
@@ -92,213 +311,355 @@ class QuickbaseClient:
             print(f"Error querying Quickbase: {e}")
             return pd.DataFrame()
 
-    def _records_to_dataframe(self, records: List[Dict]) -> pd.DataFrame:
-        """Convert Quickbase records to pandas DataFrame"""
+    # Negotiation table field ID -> DataFrame column
+    _FIELD_MAP = {
+        '3': 'Associated ID',
+        '6': 'Currency',
+        '7': 'Initial MRC + Tax (USD)',
+        '8': 'Initial MRC + Tax (local currency)',
+        '9': 'Final Discount',
+        '10': 'Vendor Name',
+        '11': 'VOC Line Renewal - Date Created'
+    }
+
+    def _records_to_dataframe(self, records: List[Dict], parse_dates: bool = True,
+                              parse_numeric: bool = True) -> pd.DataFrame:
+        """
+        Convert Quickbase records to pandas DataFrame
+
+        Args:
+            records: Quickbase records
+            parse_dates: Convert the date column to datetimes (left as strings otherwise)
+            parse_numeric: Convert the MRC / discount columns to numbers (left as returned otherwise)
+        """
 
         if not records:
             return pd.DataFrame()
 
-        rows = []
-        for record in records:
-            row = {}
+        # Fill one list per column, then build the DataFrame from the columns
+        # (no per-row dicts for pandas to re-infer)
+        columns = {name: [None] * len(records) for name in self._FIELD_MAP.values()}
+        for i, record in enumerate(records):
             for field_id, field_data in record.items():
-                if field_id == '3':
-                    row['Associated ID'] = field_data.get('value')
-                elif field_id == '6':
-                    row['Currency'] = field_data.get('value')
-                elif field_id == '7':
-                    row['Initial MRC + Tax (USD)'] = field_data.get('value')
-                elif field_id == '8':
-                    row['Initial MRC + Tax (local currency)'] = field_data.get('value')
-                elif field_id == '9':
-                    row['Final Discount'] = field_data.get('value')
-                elif field_id == '10':
-                    row['Vendor Name'] = field_data.get('value')
-                elif field_id == '11':
-                    row['VOC Line Renewal - Date Created'] = field_data.get('value')
-            rows.append(row)
-
-        df = pd.DataFrame(rows)
-
-        # Convert date column to datetime
-        if 'VOC Line Renewal - Date Created' in df.columns:
-            df['VOC Line Renewal - Date Created'] = pd.to_datetime(
-                df['VOC Line Renewal - Date Created'],
+                name = self._FIELD_MAP.get(field_id)
+                if name is not None:
+                    columns[name][i] = field_data.get('value')
+
+        # Convert date column to datetime (Quickbase returns ISO 8601, so skip
+        # per-call format inference)
+        if parse_dates:
+            columns['VOC Line Renewal - Date Created'] = pd.to_datetime(
+                columns['VOC Line Renewal - Date Created'],
+                format='ISO8601',
                 errors='coerce'
             )
 
         # Convert numeric columns
-        numeric_cols = ['Initial MRC + Tax (USD)', 'Initial MRC + Tax (local currency)', 'Final Discount']
-        for col in numeric_cols:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+        if parse_numeric:
+            numeric_cols = ['Initial MRC + Tax (USD)', 'Initial MRC + Tax (local currency)', 'Final Discount']
+            for col in numeric_cols:
+                columns[col] = pd.to_numeric(pd.Series(columns[col], dtype=object), errors='coerce')
+
+        return pd.DataFrame(columns)
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the shared session and circuit breaker
+
+        At most QUICKBASE_MAX_CONCURRENT requests are in flight at once.
+        Connection errors and 429/5xx responses (after the adapter's retries)
+        count as failures; once the breaker opens this raises
+        QuickbaseUnavailable without touching the network.
+        """
+        if not _breaker.allow():
+            raise QuickbaseUnavailable('Quickbase circuit breaker is open')
+        kwargs.setdefault('timeout', QUICKBASE_TIMEOUT)
+        if 'json' in kwargs:
+            # Encode the body with orjson (the session already sends the JSON content type)
+            kwargs['data'] = orjson.dumps(kwargs.pop('json'))
+        try:
+            with _request_slots:
+                response = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            _breaker.record_failure()
+            raise
+        if response.status_code == 429 or response.status_code >= 500:
+            _breaker.record_failure()
+        else:
+            _breaker.record_success()
+        return response
+
+    def _post(self, url: str, **kwargs) -> requests.Response:
+        """POST through _request()"""
+        return self._request('POST', url, **kwargs)
+
+    def warm_up(self, connections: int = 4):
+        """
+        Open pooled connections to the API (TCP + TLS) ahead of the first requests
 
-        return df
+        Requests go over HTTP/1.1, one in flight per connection, so several are
+        opened in parallel for the concurrent lookups behind one analysis.
+
+        Args:
+            connections: Number of connections to open
+        """
+        def open_connection(_):
+            try:
+                self.session.get(f'{self.base_url}/fields', params={'tableId': self.table_id}, timeout=10).close()
+            except requests.exceptions.RequestException as e:
+                return e
+
+        errors = [e for e in _fallback_pool.map(open_connection, range(connections)) if e is not None]
+        if errors:
+            print(f"Warning: Could not warm up Quickbase connection: {errors[0]}")
 
     def get_table_fields(self) -> List[Dict]:
         """Get field definitions for the table"""
 
         try:
-            response = requests.get(
+            response = self._request(
+                'GET',
                 f'{self.base_url}/fields',
-                headers=self.headers,
-                params={'tableId': self.table_id},
-                timeout=30
+                params={'tableId': self.table_id}
             )
             response.raise_for_status()
 
-            return response.json()
+            return orjson.loads(response.content)
 
         except requests.exceptions.RequestException as e:
             print(f"Error getting table fields: {e}")
             return []
 
-    def get_vendor_negotiation_stats(self, vendor_name: str) -> Dict:
+    def _paginate(self, table_id: str, select: List[int], where: str,
+                  sort_field: int = 3, page: int = 500) -> Iterator[Dict]:
         """
-        Get negotiation statistics for a specific vendor from Vendor Orders & Contract table
+        Yield every record matching a query, one page at a time
 
-        Uses Delta MRC Cost(%) field to determine negotiation success:
-        - If Delta MRC Cost(%) > 0, there was a negotiation
-        - Only counts "Delivered" status as successful
+        Pages are sorted by sort_field and each next page is selected with
+        {sort_field.GT.'<last value>'} (seek), so later pages cost the same as
+        the first and nothing is silently truncated at a fixed top.
 
         Args:
-            vendor_name: Vendor name to search for
-
-        Returns:
-            Dict with negotiation statistics
+            table_id: Table to query
+            select: Field IDs to select (sort_field is added if missing)
+            where: Quickbase filter
+            sort_field: Unique, sortable field to seek on (3 = Record ID#)
+            page: Records per request
+
+        Raises:
+            requests.exceptions.RequestException: If a page request fails
         """
-        # Use the correct table: Vendor Orders & Contract (bkr26d56f)
-        voc_table_id = "bkr26d56f"
+        if sort_field not in select:
+            select = [sort_field, *select]
+
+        last_value = None
+        while True:
+            page_where = where if last_value is None else f"({where})AND{{{sort_field}.GT.'{_qb_escape(last_value)}'}}"
+            response = self._post(
+                self._query_url,
+                json={
+                    'from': table_id,
+                    'select': select,
+                    'where': page_where,
+                    'sortBy': [{'fieldId': sort_field, 'order': 'ASC'}],
+                    'options': {'skip': 0, 'top': page}
+                }
+            )
+            response.raise_for_status()
 
-        # Build WHERE clause with filters matching Quickbase query 247
-        # Filter 1: Vendor Service Type must be one of specific types (case-insensitive variations)
-        service_types = [
-            'bia', 'BIA',
-            'bia 3g/4g', 'BIA 3g/4g',
-            'clear channel / iplc', 'Clear Channel / IPLC',
-            'dia', 'DIA',
-            'ethernet', 'Ethernet', 'ETHERNET',
-            'ipvpn', 'IPVPN', 'IP VPN'
-        ]
-        service_type_filter = "OR".join([f"{{74.EX.'{st}'}}" for st in service_types])
+            records = orjson.loads(response.content).get('data', [])
+            yield from records
 
-        # Filter 2: Service ID must NOT contain NTL. or IGN.
-        service_id_filter = "{234.XCT.'NTL.'}AND{234.XCT.'IGN.'}"
+            if len(records) < page:
+                return
+            last_value = records[-1].get(str(sort_field), {}).get('value')
+            if last_value is None:
+                return
 
-        # Filter 3: Service Support Level must be A, B, or D
-        support_level_filter = "{273.EX.'A'}OR{273.EX.'B'}OR{273.EX.'D'}"
+    def _negotiation_query(self, vendor_filter: str, top: int) -> Dict:
+        """
+        Build the Vendor Orders & Contract query behind the negotiation stats
 
-        # Combine all filters
-        where_clause = f"{{245.CT.'{vendor_name}'}}AND(({service_type_filter})AND({service_id_filter})AND({support_level_filter}))"
+        Args:
+            vendor_filter: Quickbase filter on the vendor name field (245)
+            top: Maximum number of records to return
+        """
+        # Vendor filter plus the fixed query 247 filters (_NEGOTIATION_FILTER)
+        where_clause = f"{vendor_filter}AND{_NEGOTIATION_FILTER}"
 
-        query = {
-            'from': voc_table_id,
+        return {
+            'from': _VOC_TABLE,
+            # Only the fields _negotiation_stats() reads (plus the vendor name the
+            # bulk lookup groups by); the filter fields need not be returned
             'select': [
                 3,      # Record ID
                 245,    # Vendor name
-                254,    # VOC Line Status
                 6,      # MRC of Contract
                 431,    # Vendor Quote - MRC
-                466,    # Delta MRC Cost(%) - The key field!
-                74,     # Vendor Service Type - Service
-                234,    # Service ID
-                273     # Service Support Level
+                466     # Delta MRC Cost(%) - The key field!
             ],
             'where': where_clause,
-            'options': {'skip': 0, 'top': 200}
+            'options': {'skip': 0, 'top': top}
         }
 
+    @staticmethod
+    def _no_negotiation_stats(vendor_name: str, error: Optional[str] = None) -> Dict:
+        """Negotiation stats for a vendor without usable history (error is set on API failures)"""
+        stats = {
+            'vendor_name': vendor_name,
+            'total_negotiations': 0,
+            'successful_negotiations': 0,
+            'success_rate': 0.0,
+            'avg_discount': 0.0,
+            'best_discount': 0.0,
+            'has_data': False
+        }
+        if error is not None:
+            stats['error'] = error
+        return stats
+
+    @classmethod
+    def _negotiation_stats(cls, vendor_name: str, records: List[Dict]) -> Dict:
+        """Compute negotiation statistics from a vendor's VOC records"""
+        if not records:
+            return cls._no_negotiation_stats(vendor_name)
+
+        # Count all records that pass filters (total attempts)
+        # Then count only those with Delta > 0 (successful negotiations)
+        cols = _records_to_cols(records, ('466', '6', '431'))
+        delta_mrc_pct = cols['466']
+
+        # Only count as successful negotiation if:
+        # 1. Delta > 0 (there was negotiation and discount)
+        # 2. Delta < 1.0 (exclude 100% which indicates missing MRC Contract)
+        # 3. Both MRC Contract and MRC Quote exist
+        negotiated = (
+            (delta_mrc_pct > 0) & (delta_mrc_pct < 1.0)
+            & ~np.isnan(cols['6']) & ~np.isnan(cols['431'])
+        )
+
+        total_negotiations = len(records)  # All records with filters
+        successful_negotiations = int(negotiated.sum())  # Only those with Delta > 0
+        success_rate = (successful_negotiations / total_negotiations * 100) if total_negotiations > 0 else 0.0
+
+        # Calculate average and best (max) discount (from all negotiated records)
+        discounts = delta_mrc_pct[negotiated] * 100  # Convert to percentage
+
+        avg_discount = float(discounts.mean()) if discounts.size else 0
+        best_discount = float(discounts.max()) if discounts.size else 0
+
+        return {
+            'vendor_name': vendor_name,
+            'total_negotiations': total_negotiations,
+            'successful_negotiations': successful_negotiations,
+            'success_rate': success_rate,
+            'avg_discount': avg_discount,
+            'best_discount': best_discount,
+            'has_data': total_negotiations > 0
+        }
+
+    @ttl_cached(_vendor_cache, cache_if=_is_cacheable)
+    def get_vendor_negotiation_stats(self, vendor_name: str) -> Dict:
+        """
+        Get negotiation statistics for a specific vendor from Vendor Orders & Contract table
+
+        Uses Delta MRC Cost(%) field to determine negotiation success:
+        - If Delta MRC Cost(%) > 0, there was a negotiation
+        - Only counts "Delivered" status as successful
+
+        Args:
+            vendor_name: Vendor name to search for
+
+        Returns:
+            Dict with negotiation statistics
+        """
+        query = self._negotiation_query(f"{{245.CT.'{_qb_escape(vendor_name)}'}}", top=200)
+
         try:
-            response = requests.post(
-                f'{self.base_url}/records/query',
-                json=query,
-                headers=self.headers,
-                timeout=30
+            response = self._post(
+                self._query_url,
+                json=query
             )
 
             if response.status_code == 200:
-                data = response.json()
-                records = data.get('data', [])
+                data = orjson.loads(response.content)
+                return self._negotiation_stats(vendor_name, data.get('data', []))
+            else:
+                return self._no_negotiation_stats(vendor_name, f'API error: {response.status_code}')
 
-                if not records:
-                    return {
-                        'vendor_name': vendor_name,
-                        'total_negotiations': 0,
-                        'successful_negotiations': 0,
-                        'success_rate': 0.0,
-                        'avg_discount': 0.0,
-                        'best_discount': 0.0,
-                        'has_data': False
-                    }
+        except Exception as e:
+            print(f"Error getting vendor stats: {e}")
+            return self._no_negotiation_stats(vendor_name, str(e))
 
-                # Count all records that pass filters (total attempts)
-                # Then count only those with Delta > 0 (successful negotiations)
-                total_attempts = len(records)
-                negotiated_records = []
-
-                for r in records:
-                    delta_mrc_pct = r.get('466', {}).get('value')
-                    mrc_contract = r.get('6', {}).get('value')
-                    mrc_quote = r.get('431', {}).get('value')
-
-                    # Only count as successful negotiation if:
-                    # 1. Delta > 0 (there was negotiation and discount)
-                    # 2. Delta < 1.0 (exclude 100% which indicates missing MRC Contract)
-                    # 3. Both MRC Contract and MRC Quote exist
-                    if (delta_mrc_pct is not None and
-                        delta_mrc_pct > 0 and
-                        delta_mrc_pct < 1.0 and
-                        mrc_contract is not None and
-                        mrc_quote is not None):
-
-                        negotiated_records.append(r)
-
-                total_negotiations = total_attempts  # All records with filters
-                successful_negotiations = len(negotiated_records)  # Only those with Delta > 0
-                success_rate = (successful_negotiations / total_negotiations * 100) if total_negotiations > 0 else 0.0
-
-                # Calculate average and best (max) discount (from all negotiated records)
-                discounts = []
-                for r in negotiated_records:
-                    delta_pct = r.get('466', {}).get('value')
-                    if delta_pct is not None and delta_pct > 0:
-                        discounts.append(delta_pct * 100)  # Convert to percentage
-
-                avg_discount = sum(discounts) / len(discounts) if discounts else 0
-                best_discount = max(discounts) if discounts else 0
+    def get_vendor_negotiation_stats_bulk(self, vendor_names: List[str]) -> Dict[str, Dict]:
+        """
+        Get negotiation statistics for several vendors in one Quickbase round trip
 
-                return {
-                    'vendor_name': vendor_name,
-                    'total_negotiations': total_negotiations,
-                    'successful_negotiations': successful_negotiations,
-                    'success_rate': success_rate,
-                    'avg_discount': avg_discount,
-                    'best_discount': best_discount,
-                    'has_data': total_negotiations > 0
-                }
+        Matches get_vendor_negotiation_stats() per vendor (same filters, name
+        "contains" match, at most 200 records each). Vendors already in the
+        shared cache are not queried again, and fresh results with data are
+        cached.
+
+        The records share one top=200*N budget, so when it is used up a vendor
+        with fewer than 200 matches may have been crowded out; such vendors
+        are left out of the result rather than reported without history.
+
+        Args:
+            vendor_names: Vendor names to search for
+
+        Returns:
+            Dict of vendor name -> negotiation statistics; vendors missing from
+            it (all of them if the query failed) need a per-vendor lookup
+        """
+        stats_by_vendor = {}
+        pending = []
+        for vendor_name in dict.fromkeys(vendor_names):
+            cached = _vendor_cache.get(cache_key('get_vendor_negotiation_stats', (vendor_name,)))
+            if cached is None:
+                pending.append(vendor_name)
             else:
-                return {
-                    'vendor_name': vendor_name,
-                    'total_negotiations': 0,
-                    'successful_negotiations': 0,
-                    'success_rate': 0.0,
-                    'avg_discount': 0.0,
-                    'best_discount': 0.0,
-                    'has_data': False
-                }
+                stats_by_vendor[vendor_name] = cached
+
+        if not pending:
+            return stats_by_vendor
+
+        vendor_filter = "(" + "OR".join(f"{{245.CT.'{_qb_escape(vendor_name)}'}}" for vendor_name in pending) + ")"
+        top = 200 * len(pending)
+        query = self._negotiation_query(vendor_filter, top=top)
+
+        try:
+            response = self._post(
+                self._query_url,
+                json=query
+            )
+
+            if response.status_code != 200:
+                print(f"Quickbase API error: {response.status_code}")
+                return {}
+
+            records = orjson.loads(response.content).get('data', [])
+            truncated = len(records) >= top
+
+            # Assign each record to every requested vendor it matches (CT is a
+            # case-insensitive "contains"), keeping the first 200 per vendor
+            record_vendors = [(r.get('245', {}).get('value') or '').lower() for r in records]
+            for vendor_name in pending:
+                needle = vendor_name.lower()
+                vendor_records = [r for r, name in zip(records, record_vendors) if needle in name][:200]
+                if truncated and len(vendor_records) < 200:
+                    continue  # May have lost records to other vendors
+                stats = self._negotiation_stats(vendor_name, vendor_records)
+                if stats['has_data']:
+                    _vendor_cache.set(cache_key('get_vendor_negotiation_stats', (vendor_name,)), stats)
+                stats_by_vendor[vendor_name] = stats
+
+            return stats_by_vendor
 
         except Exception as e:
-            print(f"Error getting vendor stats: {e}")
-            return {
-                'vendor_name': vendor_name,
-                'total_negotiations': 0,
-                'successful_negotiations': 0,
-                'success_rate': 0.0,
-                'avg_discount': 0.0,
-                'best_discount': 0.0,
-                'has_data': False
-            }
+            print(f"Error getting bulk vendor stats: {e}")
+            return {}
 
+    @ttl_cached(_reference_cache, cache_if=lambda result: result['found'])
     def get_service_mrc(self, service_id: str) -> Dict:
         """
         Get Service MRC and Currency from Quickbase Services table
@@ -315,13 +676,11 @@ class QuickbaseClient:
         Returns:
             Dict with mrc and currency, or None if not found
         """
-        services_table_id = "bfwgbisz4"
-
         # Build WHERE clause to match Service ID
-        where_clause = f"{{7.EX.'{service_id}'}}"
+        where_clause = f"{{7.EX.'{_qb_escape(service_id)}'}}"
 
         query = {
-            'from': services_table_id,
+            'from': _SERVICES_TABLE,
             'select': [
                 7,      # Service ID
                 329,    # Maximum Record ID# - New Contracted MRC - USD
@@ -332,15 +691,13 @@ class QuickbaseClient:
         }
 
         try:
-            response = requests.post(
-                f'{self.base_url}/records/query',
-                json=query,
-                headers=self.headers,
-                timeout=30
+            response = self._post(
+                self._query_url,
+                json=query
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 records = data.get('data', [])
 
                 if records:
@@ -354,7 +711,7 @@ class QuickbaseClient:
 
                     return {
                         'mrc': mrc,
-                        'currency': currency,
+                        'currency': _intern(currency),
                         'found': True
                     }
 
@@ -364,6 +721,52 @@ class QuickbaseClient:
             print(f"Error getting service MRC from Quickbase: {e}")
             return {'mrc': None, 'currency': None, 'found': False}
 
+    @staticmethod
+    def _renewal_query(vendor_filter: str) -> Dict:
+        """Build the Renewals (bqrc5mm8e) query behind the renewal stats"""
+        return {
+            'from': _RENEWALS_TABLE,
+            'select': [14, 47],  # Vendor name, Final Discount
+            'where': vendor_filter
+        }
+
+    @staticmethod
+    def _renewal_stats(records: Iterable[Dict]) -> Dict:
+        """Compute renewal statistics from a vendor's Renewals records (in one pass)"""
+        # Process renewal records
+        discounts = _field_values(records, '47')
+        total_renewals = discounts.size
+
+        # Only include valid discounts: > 0% and < 100%
+        # Quickbase stores as decimal: 0.24 = 24%, so we filter < 1.0 (100%)
+        renewals_with_discount = discounts[(discounts > 0) & (discounts < 1.0)]
+
+        if not total_renewals:
+            return {
+                'has_data': False,
+                'total_renewals': 0,
+                'successful_renewals': 0,
+                'success_rate': 0,
+                'avg_discount': 0,
+                'max_discount': 0
+            }
+
+        successful_renewals = renewals_with_discount.size
+        success_rate = (successful_renewals / total_renewals * 100) if total_renewals > 0 else 0
+        # Quickbase stores discount as decimal (0.24 = 24%), convert to percentage
+        avg_discount = float(renewals_with_discount.mean() * 100) if successful_renewals > 0 else 0
+        max_discount = float(renewals_with_discount.max() * 100) if successful_renewals > 0 else 0
+
+        return {
+            'has_data': True,
+            'total_renewals': total_renewals,
+            'successful_renewals': successful_renewals,
+            'success_rate': success_rate,
+            'avg_discount': avg_discount,
+            'max_discount': max_discount
+        }
+
+    @ttl_cached(_vendor_cache, cache_if=_has_data)
     def get_vendor_renewal_stats(self, vendor_name: str) -> Dict:
         """
         Get renewal negotiation statistics for a vendor
@@ -378,150 +781,242 @@ class QuickbaseClient:
         - 47: Final Discount (%)
         - 72: VOC Line Renewal - Date Created
         """
-        renewals_table_id = "bqrc5mm8e"
-        where_clause = f"{{14.EX.'{vendor_name}'}}"
-
-        query = {
-            'from': renewals_table_id,
-            'select': [14, 47, 72],  # Vendor name, Final Discount, Date Created
-            'where': where_clause,
-            'options': {'skip': 0, 'top': 1000}
-        }
-
         try:
-            response = requests.post(
-                f'{self.base_url}/records/query',
-                json=query,
-                headers=self.headers,
-                timeout=30
+            # Every renewal of the vendor, streamed page by page; only the
+            # discount (47) is read, the vendor filter field isn't returned
+            return self._renewal_stats(
+                self._paginate(_RENEWALS_TABLE, [47], f"{{14.EX.'{_qb_escape(vendor_name)}'}}")
             )
 
-            if response.status_code == 200:
-                data = response.json()
-                records = data.get('data', [])
+        except Exception as e:
+            print(f"Error getting renewal stats from Quickbase: {e}")
+            return self._renewal_stats([])
+
+    @staticmethod
+    def _delivered_mrc_query(vendor_filter: str) -> Dict:
+        """Build the VOC Lines (bkr26d56f) query for Delivered lines behind the delivered MRC total"""
+        return {
+            'from': _VOC_TABLE,
+            'select': [245, 135],  # Vendor name, MRC USD Tax Included
+            'where': f"{vendor_filter}AND{{254.EX.'Delivered'}}"
+        }
 
-                if not records:
-                    return {
-                        'has_data': False,
-                        'total_renewals': 0,
-                        'successful_renewals': 0,
-                        'success_rate': 0,
-                        'avg_discount': 0,
-                        'max_discount': 0
-                    }
+    @staticmethod
+    def _delivered_mrc_total(records: Iterable[Dict]) -> Dict:
+        """Sum MRC (USD) Tax Included over a vendor's Delivered VOC Lines (in one pass)"""
+        total_mrc = 0
+        delivered_count = 0
+        for rec in records:
+            delivered_count += 1
+            mrc = rec.get('135', {}).get('value', 0)
+            if mrc:
+                total_mrc += mrc
+
+        if not delivered_count:
+            return {
+                'has_data': False,
+                'total_mrc_usd': 0,
+                'delivered_count': 0
+            }
 
-                # Process renewal records
-                total_renewals = len(records)
-                renewals_with_discount = []
+        return {
+            'has_data': True,
+            'total_mrc_usd': total_mrc,
+            'delivered_count': delivered_count
+        }
 
-                for rec in records:
-                    discount = rec.get('47', {}).get('value', 0)
-                    # Only include valid discounts: > 0% and < 100%
-                    # Quickbase stores as decimal: 0.24 = 24%, so we filter < 1.0 (100%)
-                    if discount and discount > 0 and discount < 1.0:
-                        renewals_with_discount.append(discount)
+    @ttl_cached(_vendor_cache, cache_if=bool)
+    def _delivered_mrc_summary(self) -> Dict[str, Dict]:
+        """
+        Delivered MRC totals of every vendor from the QUICKBASE_DELIVERED_MRC_REPORT_ID summary report
 
-                successful_renewals = len(renewals_with_discount)
-                success_rate = (successful_renewals / total_renewals * 100) if total_renewals > 0 else 0
-                # Quickbase stores discount as decimal (0.24 = 24%), convert to percentage
-                avg_discount = (sum(renewals_with_discount) / successful_renewals * 100) if successful_renewals > 0 else 0
-                max_discount = (max(renewals_with_discount) * 100) if renewals_with_discount else 0
+        The report is read page by page (skip) until metadata.totalRecords
+        rows are in, so vendors past the first page aren't reported as having
+        no delivered lines.
 
-                return {
-                    'has_data': True,
-                    'total_renewals': total_renewals,
-                    'successful_renewals': successful_renewals,
-                    'success_rate': success_rate,
-                    'avg_discount': avg_discount,
-                    'max_discount': max_discount
-                }
+        Returns:
+            Dict of lowercased vendor name -> totals, or an empty dict if the
+            report is not configured or could not be run in full
+        """
+        if not QUICKBASE_DELIVERED_MRC_REPORT_ID:
+            return {}
 
-            return {
-                'has_data': False,
-                'total_renewals': 0,
-                'successful_renewals': 0,
-                'success_rate': 0,
-                'avg_discount': 0,
-                'max_discount': 0
-            }
+        try:
+            totals = {}
+            skip = 0
+            while True:
+                response = self._post(
+                    f'{self.base_url}/reports/{QUICKBASE_DELIVERED_MRC_REPORT_ID}/run',
+                    params={'tableId': _VOC_TABLE, 'skip': skip}
+                )
+
+                if response.status_code != 200:
+                    print(f"Quickbase API error: {response.status_code}")
+                    return {}
+
+                payload = orjson.loads(response.content)
+                rows = payload.get('data', [])
+                for row in rows:
+                    vendor_name = row.get('245', {}).get('value')
+                    if vendor_name:
+                        totals[vendor_name.lower()] = {
+                            'has_data': True,
+                            'total_mrc_usd': row.get('135', {}).get('value') or 0,
+                            'delivered_count': row.get('3', {}).get('value') or 0
+                        }
+
+                skip += len(rows)
+                total_records = payload.get('metadata', {}).get('totalRecords')
+                if total_records is None or skip >= total_records:
+                    return totals
+                if not rows:
+                    # Fewer rows than totalRecords announced: don't trust a partial summary
+                    print(f"Delivered MRC report stopped at {skip} of {total_records} rows")
+                    return {}
 
         except Exception as e:
-            print(f"Error getting renewal stats from Quickbase: {e}")
-            return {
-                'has_data': False,
-                'total_renewals': 0,
-                'successful_renewals': 0,
-                'success_rate': 0,
-                'avg_discount': 0,
-                'max_discount': 0
-            }
+            print(f"Error running delivered MRC report in Quickbase: {e}")
+            return {}
 
+    @ttl_cached(_vendor_cache, cache_if=_has_data)
     def get_vendor_delivered_mrc_total(self, vendor_name: str) -> Dict:
         """
         Get total MRC (USD) Tax Included for all Delivered VOC Lines for a vendor
 
+        Read from the pre-aggregated summary report when one is configured,
+        otherwise summed from the vendor's VOC Lines.
+
         Uses table bkr26d56f (VOC Lines) with fields:
         - 245: Vendor name
         - 135: MRC (USD) Tax Included
         - 254: VOC Line Status
         """
-        voc_table_id = "bkr26d56f"
-        # Query for vendor + Delivered status
-        where_clause = f"{{245.EX.'{vendor_name}'}}AND{{254.EX.'Delivered'}}"
-
-        query = {
-            'from': voc_table_id,
-            'select': [245, 135, 254],  # Vendor name, MRC USD Tax Included, Status
-            'where': where_clause,
-            'options': {'skip': 0, 'top': 1000}
-        }
+        summary = self._delivered_mrc_summary()
+        if summary:
+            return dict(summary.get(vendor_name.lower()) or self._delivered_mrc_total([]))
 
         try:
-            response = requests.post(
-                f'{self.base_url}/records/query',
-                json=query,
-                headers=self.headers,
-                timeout=30
+            # Every Delivered line of the vendor, summed page by page; only the
+            # MRC (135) is read, the vendor/status filter fields aren't returned
+            return self._delivered_mrc_total(
+                self._paginate(_VOC_TABLE, [135], f"{{245.EX.'{_qb_escape(vendor_name)}'}}AND{{254.EX.'Delivered'}}")
             )
 
-            if response.status_code == 200:
-                data = response.json()
-                records = data.get('data', [])
+        except Exception as e:
+            print(f"Error getting delivered MRC from Quickbase: {e}")
+            return self._delivered_mrc_total([])
 
-                if not records:
-                    return {
-                        'has_data': False,
-                        'total_mrc_usd': 0,
-                        'delivered_count': 0
-                    }
+    def _vendor_stats_bulk(self, method_name: str, vendor_names: List[str], build_query,
+                           vendor_field: str, compute) -> Dict[str, Dict]:
+        """
+        Run a per-vendor stats lookup for several vendors in one paginated query
 
-                # Sum MRC (USD) Tax Included for all delivered VOC Lines
-                total_mrc = 0
-                for rec in records:
-                    mrc = rec.get('135', {}).get('value', 0)
-                    if mrc:
-                        total_mrc += mrc
+        Vendors already in the shared cache are not queried again. Every
+        matching record is read (via _paginate(), as in the single-vendor
+        lookups) and grouped by exact (case-insensitive) vendor name, as the
+        EX filter matches them.
 
-                return {
-                    'has_data': True,
-                    'total_mrc_usd': total_mrc,
-                    'delivered_count': len(records)
-                }
+        Args:
+            method_name: Single-vendor method whose cache entries are shared
+            vendor_names: Vendor names to look up
+            build_query: vendor_filter -> query payload (from, select, where)
+            vendor_field: Field ID holding the vendor name
+            compute: Records of one vendor -> stats dict
 
-            return {
-                'has_data': False,
-                'total_mrc_usd': 0,
-                'delivered_count': 0
-            }
+        Returns:
+            Dict of vendor name -> stats, or an empty dict if the query failed
+        """
+        stats_by_vendor = {}
+        pending = []
+        for vendor_name in dict.fromkeys(vendor_names):
+            cached = _vendor_cache.get(cache_key(method_name, (vendor_name,)))
+            if cached is None:
+                pending.append(vendor_name)
+            else:
+                stats_by_vendor[vendor_name] = cached
+
+        if not pending:
+            return stats_by_vendor
+
+        vendor_filter = "(" + "OR".join(f"{{{vendor_field}.EX.'{_qb_escape(vendor_name)}'}}" for vendor_name in pending) + ")"
+        query = build_query(vendor_filter)
+
+        try:
+            records_by_vendor = {vendor_name.lower(): [] for vendor_name in pending}
+            for record in self._paginate(query['from'], query['select'], query['where']):
+                vendor_records = records_by_vendor.get((record.get(vendor_field, {}).get('value') or '').lower())
+                if vendor_records is not None:
+                    vendor_records.append(record)
+
+            for vendor_name in pending:
+                stats = compute(records_by_vendor[vendor_name.lower()])
+                if stats.get('has_data'):
+                    _vendor_cache.set(cache_key(method_name, (vendor_name,)), stats)
+                stats_by_vendor[vendor_name] = stats
+
+            return stats_by_vendor
 
         except Exception as e:
-            print(f"Error getting delivered MRC from Quickbase: {e}")
+            print(f"Error getting bulk vendor stats ({method_name}): {e}")
+            return {}
+
+    def get_vendor_renewal_stats_bulk(self, vendor_names: List[str]) -> Dict[str, Dict]:
+        """
+        Get renewal statistics for several vendors in one paginated Quickbase query
+
+        Args:
+            vendor_names: Vendor names to search for
+
+        Returns:
+            Dict of vendor name -> renewal statistics (as get_vendor_renewal_stats),
+            or an empty dict if the query failed
+        """
+        return self._vendor_stats_bulk(
+            'get_vendor_renewal_stats', vendor_names, self._renewal_query, '14', self._renewal_stats
+        )
+
+    def get_vendor_delivered_mrc_total_bulk(self, vendor_names: List[str]) -> Dict[str, Dict]:
+        """
+        Get Delivered MRC totals for several vendors in one paginated Quickbase query
+
+        Args:
+            vendor_names: Vendor names to search for
+
+        Returns:
+            Dict of vendor name -> totals (as get_vendor_delivered_mrc_total),
+            or an empty dict if the query failed
+        """
+        summary = self._delivered_mrc_summary()
+        if summary:
             return {
-                'has_data': False,
-                'total_mrc_usd': 0,
-                'delivered_count': 0
+                vendor_name: dict(summary.get(vendor_name.lower()) or self._delivered_mrc_total([]))
+                for vendor_name in vendor_names
             }
-    def get_voc_line_by_service(self, service_id: str) -> Dict:
+
+        return self._vendor_stats_bulk(
+            'get_vendor_delivered_mrc_total', vendor_names, self._delivered_mrc_query, '245',
+            self._delivered_mrc_total
+        )
+
+    # VOC Line fields behind get_voc_line_by_service(): everything it returns,
+    # or just what the MRC / currency / GM figures need
+    _VOC_FULL_SELECT = [
+        3,    # Record ID
+        234,  # Service ID
+        245,  # Vendor name
+        135,  # MRC (USD) Tax Included (Vendor MRC)
+        254,  # VOC Line Status
+        246,  # Bandwidth
+        247,  # Service Type
+        248,  # Lead Time
+        136,  # NRC (USD) Tax Included
+        397,  # Client MRC (actual service MRC) - PRIMARY SOURCE
+        702,  # Currency
+    ]
+    _VOC_MRC_SELECT = [3, 234, 245, 135, 397, 702]
+
+    @ttl_cached(_service_cache, cache_if=_is_cacheable)
+    def get_voc_line_by_service(self, service_id: str, mrc_only: bool = False) -> Dict:
         """
         Get VOC Line data for renewal analysis by Service ID
 
@@ -532,6 +1027,8 @@ class QuickbaseClient:
 
         Client MRC is obtained from Field 397 in VOC Lines (primary source).
         Falls back to Services table (bfwgbisz4) if Field 397 is not available.
+        The fallback lookup is started alongside the VOC Line query, so a miss
+        costs one round trip instead of two (an unused result is still cached).
 
         Key fields:
         - 234: Service ID
@@ -542,64 +1039,57 @@ class QuickbaseClient:
         - 702: Currency (fallback to Services table if null)
         - 136: NRC (USD) Tax Included (ALWAYS in USD, needs conversion to local currency)
         - Many other fields for full context
-        """
-        voc_table_id = "bkr26d56f"
 
+        Args:
+            service_id: Service ID to look up
+            mrc_only: Only fetch the vendor/client MRC and currency fields; status,
+                bandwidth, service type and lead time come back as None and NRC as 0
+        """
         # Query for VOC Lines matching this service
-        where_clause = f"{{234.EX.'{service_id}'}}"
+        where_clause = f"{{234.EX.'{_qb_escape(service_id)}'}}"
+
+        service_mrc_future = _fallback_pool.submit(self.get_service_mrc, service_id)
 
         try:
             payload = {
-                'from': voc_table_id,
-                'select': [
-                    3,    # Record ID
-                    234,  # Service ID
-                    245,  # Vendor name
-                    135,  # MRC (USD) Tax Included (Vendor MRC)
-                    254,  # VOC Line Status
-                    246,  # Bandwidth
-                    247,  # Service Type
-                    248,  # Lead Time
-                    136,  # NRC (USD) Tax Included
-                    397,  # Client MRC (actual service MRC) - PRIMARY SOURCE
-                    702,  # Currency
-                ],
+                'from': _VOC_TABLE,
+                'select': self._VOC_MRC_SELECT if mrc_only else self._VOC_FULL_SELECT,
                 'where': where_clause,
                 'sortBy': [{'fieldId': 3, 'order': 'DESC'}]  # Most recent first
             }
 
-            response = requests.post(
-                f'{self.base_url}/records/query',
-                headers=self.headers,
-                json=payload,
-                timeout=30
+            response = self._post(
+                self._query_url,
+                json=payload
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 records = data.get('data', [])
 
                 if records:
                     # Get the most recent VOC Line (first in sorted results)
-                    voc = records[0]
+                    voc = _parse_voc_record(records[0])
 
                     # Field 135: MRC (USD) Tax Included - this is ALWAYS in USD
-                    vendor_mrc_usd_value = voc.get('135', {}).get('value')
+                    vendor_mrc_usd_value = voc['vendor_mrc_usd']
                     vendor_mrc_usd = float(vendor_mrc_usd_value) if vendor_mrc_usd_value is not None else 0.0
 
                     # Get Client MRC - PRIMARY SOURCE: Field 397 from VOC Line
                     # This is the actual service MRC that the client pays (in local currency)
-                    client_mrc_value = voc.get('397', {}).get('value')
+                    client_mrc_value = voc['client_mrc']
                     client_mrc = float(client_mrc_value) if client_mrc_value is not None else 0.0
-                    currency = voc.get('702', {}).get('value')
+                    currency = voc['currency']
 
                     # Fallback: If Field 397 or currency not available, try Services table
                     if (not client_mrc or client_mrc == 0) or not currency:
-                        service_data = self.get_service_mrc(service_id)
+                        service_data = service_mrc_future.result()
                         if not client_mrc or client_mrc == 0:
                             client_mrc = service_data.get('mrc', 0)
                         if not currency:
                             currency = service_data.get('currency')
+                    else:
+                        service_mrc_future.cancel()
 
                     # Convert Vendor MRC from USD to local currency if needed
                     vendor_mrc = vendor_mrc_usd  # Default: assume USD
@@ -607,7 +1097,6 @@ class QuickbaseClient:
                     brl_rate = None
 
                     if currency and currency.upper() == 'BRL':
-                        from utils.currency import get_usd_to_brl_rate
                         brl_rate = get_usd_to_brl_rate()
                         if brl_rate and brl_rate > 0:
                             # Convert Vendor MRC from USD to BRL
@@ -631,30 +1120,30 @@ class QuickbaseClient:
                         else:
                             gm_usd = gm_local
 
-                    nrc_value = voc.get('136', {}).get('value')
+                    nrc_value = voc['nrc_usd']
                     nrc_usd = float(nrc_value) if nrc_value is not None else 0.0
                     # Convert NRC from USD to local currency if needed
                     nrc = nrc_usd * brl_rate if (brl_rate and brl_rate > 0) else nrc_usd
 
                     return {
                         'has_data': True,
-                        'record_id': voc.get('3', {}).get('value'),
-                        'service_id': voc.get('234', {}).get('value'),
-                        'vendor_name': voc.get('245', {}).get('value'),
+                        'record_id': voc['record_id'],
+                        'service_id': voc['service_id'],
+                        'vendor_name': voc['vendor_name'],
                         'vendor_mrc': vendor_mrc,  # Vendor MRC in local currency
                         'vendor_mrc_usd': vendor_mrc_usd,  # Vendor MRC in USD
-                        'status': voc.get('254', {}).get('value'),
+                        'status': voc['status'],
                         'gm_percent': gm_percent,  # Calculated dynamically
                         'gm_local': gm_local,  # GM in local currency
                         'gm_usd': gm_usd,  # GM in USD
-                        'bandwidth': voc.get('246', {}).get('value'),
-                        'service_type': voc.get('247', {}).get('value'),
-                        'lead_time': voc.get('248', {}).get('value'),
+                        'bandwidth': voc['bandwidth'],
+                        'service_type': voc['service_type'],
+                        'lead_time': voc['lead_time'],
                         'nrc': nrc,  # NRC in local currency
                         'nrc_usd': nrc_usd,  # NRC in USD
                         'client_mrc': client_mrc,  # Client MRC in local currency (from Field 397)
                         'client_mrc_usd': client_mrc_usd,  # Client MRC in USD
-                        'currency': currency  # Service currency
+                        'currency': _intern(currency)  # Service currency
                     }
                 else:
                     return {'has_data': False, 'error': 'No VOC Line found for this service'}
@@ -666,6 +1155,7 @@ class QuickbaseClient:
             print(f"Error getting VOC Line from Quickbase: {e}")
             return {'has_data': False, 'error': str(e)}
     
+    @ttl_cached(_vendor_cache, cache_if=_has_data)
     def get_renewal_history_by_vendor(self, vendor_name: str, service_id: str = None) -> Dict:
         """
         Get detailed renewal history for a vendor, optionally filtered by service
@@ -679,18 +1169,16 @@ class QuickbaseClient:
         
         Returns list of renewal records with details
         """
-        renewals_table_id = "bqrc5mm8e"
-        
         # Build query
         if service_id:
-            where_clause = f"{{14.EX.'{vendor_name}'}}AND{{3.EX.'{service_id}'}}"
+            where_clause = f"{{14.EX.'{_qb_escape(vendor_name)}'}}AND{{3.EX.'{_qb_escape(service_id)}'}}"
         else:
-            where_clause = f"{{14.EX.'{vendor_name}'}}"
+            where_clause = f"{{14.EX.'{_qb_escape(vendor_name)}'}}"
         
         try:
-            payload = {
-                'from': renewals_table_id,
-                'select': [
+            records = list(self._paginate(
+                _RENEWALS_TABLE,
+                [
                     3,    # Service ID
                     14,   # Vendor name  
                     47,   # Final Discount (%)
@@ -698,49 +1186,37 @@ class QuickbaseClient:
                     45,   # Initial MRC (USD)
                     46,   # Final MRC (USD)
                 ],
-                'where': where_clause,
-                'sortBy': [{'fieldId': 72, 'order': 'DESC'}]  # Most recent first
-            }
-            
-            response = requests.post(
-                f'{self.base_url}/records/query',
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                records = data.get('data', [])
+                where_clause
+            ))
+            # Pages come in Record ID order; most recent first
+            records.sort(key=lambda rec: rec.get('72', {}).get('value') or '', reverse=True)
+
+            renewals = []
+            for rec in records:
+                # Quickbase records are flat: field ID -> {'value': ...}
+                discount = rec.get('47', {}).get('value', 0)
                 
-                renewals = []
-                for rec in records:
-                    fields = rec.get('fields', {})
-                    discount = fields.get('47', {}).get('value', 0)
-                    
-                    renewals.append({
-                        'service_id': fields.get('3', {}).get('value'),
-                        'vendor_name': fields.get('14', {}).get('value'),
-                        'discount_percent': float(discount) * 100 if discount else 0,  # Convert to %
-                        'date_created': fields.get('72', {}).get('value'),
-                        'initial_mrc': float(fields.get('45', {}).get('value', 0)),
-                        'final_mrc': float(fields.get('46', {}).get('value', 0)),
-                        'was_successful': (discount and discount > 0)
-                    })
-                
-                return {
-                    'has_data': len(renewals) > 0,
-                    'count': len(renewals),
-                    'renewals': renewals
-                }
-            else:
-                print(f"Quickbase API error: {response.status_code}")
-                return {'has_data': False, 'count': 0, 'renewals': []}
+                renewals.append({
+                    'service_id': rec.get('3', {}).get('value'),
+                    'vendor_name': rec.get('14', {}).get('value'),
+                    'discount_percent': float(discount) * 100 if discount else 0,  # Convert to %
+                    'date_created': rec.get('72', {}).get('value'),
+                    'initial_mrc': float(rec.get('45', {}).get('value') or 0),
+                    'final_mrc': float(rec.get('46', {}).get('value') or 0),
+                    'was_successful': (discount and discount > 0)
+                })
+            
+            return {
+                'has_data': len(renewals) > 0,
+                'count': len(renewals),
+                'renewals': renewals
+            }
                 
         except Exception as e:
             print(f"Error getting renewal history from Quickbase: {e}")
             return {'has_data': False, 'count': 0, 'renewals': []}
 
+    @ttl_cached(_reference_cache, cache_if=_has_data)
     def get_service_bandwidth(self, service_id: str) -> Dict:
         """
         Get service bandwidth from Services table (bfwgbisz4)
@@ -755,13 +1231,11 @@ class QuickbaseClient:
         - 115: Bandwidth (text)
         - 410: BW DW (bps -> Mbps) - numeric bandwidth
         """
-        services_table_id = "bfwgbisz4"
-
         try:
-            where_clause = f"{{7.EX.'{service_id}'}}"
+            where_clause = f"{{7.EX.'{_qb_escape(service_id)}'}}"
 
             payload = {
-                'from': services_table_id,
+                'from': _SERVICES_TABLE,
                 'select': [
                     3,    # Record ID
                     7,    # Service ID
@@ -771,15 +1245,13 @@ class QuickbaseClient:
                 'where': where_clause
             }
 
-            response = requests.post(
-                f'{self.base_url}/records/query',
-                headers=self.headers,
-                json=payload,
-                timeout=30
+            response = self._post(
+                self._query_url,
+                json=payload
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 records = data.get('data', [])
 
                 if records:
@@ -826,6 +1298,7 @@ class QuickbaseClient:
                 'bandwidth_bps': None
             }
 
+    @ttl_cached(_vendor_cache, cache_if=_is_cacheable)
     def get_vendor_renewal_history(self, vendor_name: str) -> Dict:
         """
         Get renewal history for a specific vendor from Renewals table
@@ -837,13 +1310,11 @@ class QuickbaseClient:
             Dictionary with renewal records
         """
         try:
-            renewals_table_id = "bqrc5mm8e"
-
             # Query renewals table filtering by vendor name (field 39)
-            where_clause = f"{{39.CT.'{vendor_name}'}}"
+            where_clause = f"{{39.CT.'{_qb_escape(vendor_name)}'}}"
 
             payload = {
-                'from': renewals_table_id,
+                'from': _RENEWALS_TABLE,
                 'select': [
                     3,    # Record ID
                     234,  # Service ID
@@ -863,33 +1334,32 @@ class QuickbaseClient:
                 }
             }
 
-            response = requests.post(
-                f'{self.base_url}/records/query',
-                headers=self.headers,
-                json=payload,
-                timeout=30
+            response = self._post(
+                self._query_url,
+                json=payload
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 records = data.get('data', [])
 
                 renewal_records = []
                 for record in records:
-                    original_mrc = record.get('246', {}).get('value')
-                    renewed_mrc = record.get('247', {}).get('value')
-                    discount_percent = record.get('248', {}).get('value')
+                    fields = _extract(record, _RENEWAL_HISTORY_FIELDS)
+                    original_mrc = fields['original_mrc']
+                    renewed_mrc = fields['renewed_mrc']
+                    discount_percent = fields['discount_percent']
 
                     renewal_records.append({
-                        'record_id': record.get('3', {}).get('value'),
-                        'service_id': record.get('234', {}).get('value'),
-                        'vendor_name': record.get('39', {}).get('value'),
+                        'record_id': fields['record_id'],
+                        'service_id': fields['service_id'],
+                        'vendor_name': fields['vendor_name'],
                         'original_mrc': float(original_mrc) if original_mrc else None,
                         'renewed_mrc': float(renewed_mrc) if renewed_mrc else None,
                         'discount_percent': float(discount_percent) if discount_percent else 0,
-                        'renewal_date': record.get('136', {}).get('value'),
-                        'status': record.get('135', {}).get('value'),
-                        'currency': record.get('180', {}).get('value', 'USD')
+                        'renewal_date': fields['renewal_date'],
+                        'status': _intern(fields['status']),
+                        'currency': _intern((record.get('180') or _EMPTY).get('value', 'USD'))
                     })
 
                 return {
@@ -902,7 +1372,8 @@ class QuickbaseClient:
                 return {
                     'has_data': False,
                     'count': 0,
-                    'records': []
+                    'records': [],
+                    'error': f'API error: {response.status_code}'
                 }
 
         except Exception as e:
@@ -910,81 +1381,87 @@ class QuickbaseClient:
             return {
                 'has_data': False,
                 'count': 0,
-                'records': []
+                'records': [],
+                'error': str(e)
             }
 
-    def get_vendor_names(self, search_term: str) -> List[str]:
+    @ttl_cached(_vendor_cache, cache_if=lambda result: result[0] is not None)
+    def _vendor_names_in(self, table_id: str, field_id: int, search_term: str) -> Tuple[Optional[Set[str]], bool]:
         """
-        Get unique vendor names from Quickbase tables for autocomplete
-
-        Args:
-            search_term: Partial vendor name to search for
+        Vendor names in one table's name field containing search_term (first 50 matches)
 
         Returns:
-            List of unique vendor names
+            (vendor names or None if the query failed, complete) - complete is
+            False if the 50-record cap was hit
         """
-        try:
-            vendor_names = set()
-
-            # Query VOC Lines table (bkr26d56f) for vendor names (field 245)
-            voc_table_id = "bkr26d56f"
-            where_clause_voc = f"{{245.CT.'{search_term}'}}"
-
-            payload_voc = {
-                'from': voc_table_id,
-                'select': [245],  # Vendor name
-                'where': where_clause_voc,
-                'options': {
-                    'skip': 0,
-                    'top': 50
-                }
+        payload = {
+            'from': table_id,
+            'select': [field_id],  # Vendor name
+            'where': f"{{{field_id}.CT.'{_qb_escape(search_term)}'}}",
+            # Alphabetical, so the 50-record cut keeps the names the merged,
+            # sorted autocomplete list shows first
+            'sortBy': [{'fieldId': field_id, 'order': 'ASC'}],
+            'options': {
+                'skip': 0,
+                'top': 50
             }
+        }
 
-            response_voc = requests.post(
-                f'{self.base_url}/records/query',
-                headers=self.headers,
-                json=payload_voc,
-                timeout=30
-            )
+        response = self._post(
+            self._query_url,
+            json=payload
+        )
 
-            if response_voc.status_code == 200:
-                data = response_voc.json()
-                records = data.get('data', [])
-                for record in records:
-                    vendor_name = record.get('245', {}).get('value')
-                    if vendor_name:
-                        vendor_names.add(vendor_name)
+        if response.status_code != 200:
+            return None, False
 
-            # Query Renewals table (bqrc5mm8e) for vendor names (field 39)
-            renewals_table_id = "bqrc5mm8e"
-            where_clause_renewals = f"{{39.CT.'{search_term}'}}"
+        records = orjson.loads(response.content).get('data', [])
+        vendor_names = set()
+        for record in records:
+            vendor_name = (record.get(str(field_id)) or _EMPTY).get('value')
+            if vendor_name:
+                vendor_names.add(vendor_name)
+        return vendor_names, len(records) < 50
 
-            payload_renewals = {
-                'from': renewals_table_id,
-                'select': [39],  # Vendor name
-                'where': where_clause_renewals,
-                'options': {
-                    'skip': 0,
-                    'top': 50
-                }
-            }
+    def get_vendor_names(self, search_term: str) -> List[str]:
+        """
+        Get unique vendor names from Quickbase tables for autocomplete
 
-            response_renewals = requests.post(
-                f'{self.base_url}/records/query',
-                headers=self.headers,
-                json=payload_renewals,
-                timeout=30
-            )
+        Results are cached for a minute. A term that extends a cached one
+        (the next keystroke) is answered by filtering the cached names, as
+        long as that earlier result was not cut off at the record cap.
 
-            if response_renewals.status_code == 200:
-                data = response_renewals.json()
-                records = data.get('data', [])
-                for record in records:
-                    vendor_name = record.get('39', {}).get('value')
-                    if vendor_name:
-                        vendor_names.add(vendor_name)
+        Args:
+            search_term: Partial vendor name to search for
+
+        Returns:
+            List of unique vendor names
+        """
+        key = search_term.lower().strip()
+        cached = _vendor_names_cache.get(key)
+        if cached is not None:
+            return list(cached[0])
+
+        # CT is a case-insensitive "contains", so every name matching key also
+        # matches any complete result for a prefix of key
+        for end in range(len(key) - 1, 0, -1):
+            shorter = _vendor_names_cache.get(key[:end])
+            if shorter is not None and shorter[1]:
+                vendor_names = [name for name in shorter[0] if key in name.lower()]
+                _vendor_names_cache.set(key, (vendor_names, True))
+                return list(vendor_names)
 
-            return sorted(list(vendor_names))
+        try:
+            # Vendor names live in the VOC Lines table (bkr26d56f, field 245) and
+            # the Renewals table (bqrc5mm8e, field 39); query both at once
+            renewals_future = _fallback_pool.submit(self._vendor_names_in, _RENEWALS_TABLE, 39, search_term)
+            voc_names, voc_complete = self._vendor_names_in(_VOC_TABLE, 245, search_term)
+            renewal_names, renewals_complete = renewals_future.result()
+
+            vendor_names = sorted((voc_names or set()) | (renewal_names or set()))
+            if voc_names is not None and renewal_names is not None:
+                _vendor_names_cache.set(key, (vendor_names, voc_complete and renewals_complete))
+            return list(vendor_names)
 
         except Exception as e:
             print(f"Error getting vendor names from Quickbase: {e}")
@@ -2,10 +2,38 @@
 VPL API Client
 Handles connection to Vendor Price List API
 """
+import threading
 import requests
 from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import VPL_API_BASE_URL, VPL_API_TOKEN, VPL_LIST_ENDPOINT
 
+# One pooled HTTP session shared by every VPLAPIClient in the process so
+# TCP/TLS connections to the API are kept alive across requests
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """Get (or create) the shared session (auth headers are sent per request)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                retry = Retry(
+                    total=2,
+                    backoff_factor=0.1,
+                    status_forcelist=(429, 502, 503, 504),
+                    allowed_methods=frozenset({'GET'}),
+                    raise_on_status=False
+                )
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32, max_retries=retry)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
 
 class VPLAPIClient:
     """Client for interacting with VPL API"""
@@ -16,6 +44,7 @@ class VPLAPIClient:
         self.headers = {
             'Authorization': f'Token {self.token}'
         }
+        self.session = _get_session()
 
     def get_prices(
         self,
@@ -57,7 +86,7 @@ class VPLAPIClient:
             params['vendor_name'] = vendor_name
 
         try:
-            response = requests.get(
+            response = self.session.get(
                 f'{self.base_url}{VPL_LIST_ENDPOINT}',
                 headers=self.headers,
                 params=params,
@@ -85,7 +114,7 @@ class VPLAPIClient:
         """Get available service types"""
 
         try:
-            response = requests.get(
+            response = self.session.get(
                 f'{self.base_url}/api/procurement/servicetypes/',
                 headers=self.headers,
                 timeout=30
@@ -40,7 +40,8 @@ async function analyzeService(serviceId) {
     currentServiceId = serviceId;
 
     try {
-        const response = await fetch('/api/analyze', {
+        // Streamed: each section is rendered as soon as the server sends it
+        const response = await fetch('/api/analyze?stream=1', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -53,11 +54,20 @@ async function analyzeService(serviceId) {
             throw new Error(error.error || 'Failed to analyze service');
         }
 
-        const data = await response.json();
+        const data = {};
         currentServiceData = data;
 
-        // Display results
-        displayResults(data);
+        await readEventStream(response, (name, payload) => {
+            if (name === 'error') {
+                throw new Error(payload.error || 'Failed to analyze service');
+            }
+            if (name === 'done') {
+                return;
+            }
+            data[name] = payload;
+            displaySection(name, data);
+            $('#loadingSpinner').hide();
+        });
 
     } catch (error) {
         console.error('Error analyzing service:', error);
@@ -69,41 +79,82 @@ async function analyzeService(serviceId) {
 }
 
 /**
- * Display analysis results
+ * Read a Server-Sent Events response, calling onEvent(name, data) per event
+ */
+async function readEventStream(response, onEvent) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) {
+            break;
+        }
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let name = 'message';
+            const dataLines = [];
+            block.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) {
+                    name = line.slice(7);
+                } else if (line.startsWith('data: ')) {
+                    dataLines.push(line.slice(6));
+                }
+            });
+            onEvent(name, JSON.parse(dataLines.join('\n') || '{}'));
+        }
+    }
+}
+
+/**
+ * Display one section of the analysis results (data holds every section received so far)
  */
-function displayResults(data) {
-    // Update service info
-    $('#infoServiceId').text(data.service.service_id);
-    $('#infoCustomer').text(data.service.customer);
-    $('#infoBandwidth').text(data.service.bandwidth_display);
-
-    // Show MRC with currency
-    let mrcDisplay = `${Utils.formatCurrency(data.service.client_mrc)} ${data.service.currency || ''}`;
-    $('#infoClientMrc').html(mrcDisplay);
-
-    $('#infoAddress').text(data.service.address);
-    $('#infoCoords').text(`${data.service.latitude}, ${data.service.longitude}`);
-
-    // Update counts
-    $('#vqCount').text(data.counts.associated);
-    $('#nearbyCount').text(data.counts.nearby || 0);
-    $('#vplCount').text(data.counts.vpl);
-    $('#statVendorQuotes').text(data.counts.associated);
-    $('#statNearbyQuotes').text(data.counts.nearby || 0);
-    $('#statVplOptions').text(data.counts.vpl);
-
-    // Display vendor quotes
-    displayVendorQuotes(data.vendor_quotes, data.service.client_mrc);
-
-    // Display nearby vendor quotes
-    displayNearbyQuotes(data.nearby_quotes || [], data.service.client_mrc);
-
-    // Display VPL options
-    displayVPLOptions(data.vpl_options, data.service.client_mrc);
-
-    // Show results
-    $('#resultsContainer').fadeIn();
-    $('#quickStats').fadeIn();
+function displaySection(name, data) {
+    switch (name) {
+        case 'service': {
+            // Update service info
+            $('#infoServiceId').text(data.service.service_id);
+            $('#infoCustomer').text(data.service.customer);
+            $('#infoBandwidth').text(data.service.bandwidth_display);
+
+            // Show MRC with currency
+            let mrcDisplay = `${Utils.formatCurrency(data.service.client_mrc)} ${data.service.currency || ''}`;
+            $('#infoClientMrc').html(mrcDisplay);
+
+            $('#infoAddress').text(data.service.address);
+            $('#infoCoords').text(`${data.service.latitude}, ${data.service.longitude}`);
+
+            // Show results
+            $('#resultsContainer').fadeIn();
+            break;
+        }
+        case 'counts':
+            // Update counts
+            $('#vqCount').text(data.counts.associated);
+            $('#nearbyCount').text(data.counts.nearby || 0);
+            $('#vplCount').text(data.counts.vpl);
+            $('#statVendorQuotes').text(data.counts.associated);
+            $('#statNearbyQuotes').text(data.counts.nearby || 0);
+            $('#statVplOptions').text(data.counts.vpl);
+            $('#quickStats').fadeIn();
+            break;
+        case 'vendor_quotes':
+            displayVendorQuotes(data.vendor_quotes, data.service.client_mrc);
+            break;
+        case 'nearby_quotes':
+            displayNearbyQuotes(data.nearby_quotes || [], data.service.client_mrc);
+            break;
+        case 'vpl_options':
+            displayVPLOptions(data.vpl_options, data.service.client_mrc);
+            break;
+    }
 }
 
 /**
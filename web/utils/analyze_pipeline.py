@@ -0,0 +1,346 @@
+"""
+Analyze Pipeline
+
+Scoring steps behind /api/analyze, split out of the endpoint so the same
+currency resolution and scoring code can be reused (and optimized) in one
+place. Functions here are pure: vendor stats are looked up through the
+callables passed in, so callers decide how they are fetched and cached.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.currency import get_usd_to_brl_rate
+from utils.scoring import column, discount_column, score_rows, score_vpl_rows, select_vpl_options
+
+StatsLookup = Callable[[str], Optional[Dict]]
+
+
+@dataclass(frozen=True)
+class AnalyzeCtx:
+    """Per-request values shared by every scoring step"""
+    client_mrc: float
+    service_currency: str
+    service_is_usd: bool
+    vpl_exchange_rate: Optional[float] = None
+
+
+@dataclass(slots=True)
+class RenewalVPLOption:
+    """
+    One scored VPL row of the renewal analysis
+
+    Fields are in response key order; orjson serializes slotted dataclasses
+    natively, so rows are never copied into dicts.
+    """
+    vendor_name: str
+    bandwidth: str
+    bandwidth_bps: Optional[int]
+    mrc: float
+    mrc_currency: str
+    nrc: float
+    gm: float
+    gm_status: str
+    service_type: str
+    is_current_vendor: bool
+
+
+def resolve_currency(service: Dict, voc_line: Dict) -> Tuple[float, str]:
+    """
+    Resolve the client MRC and service currency
+
+    The VOC Line is the accurate source; Neo4j service data is the fallback.
+
+    Returns:
+        (client_mrc, service_currency)
+    """
+    if voc_line.get('has_data'):
+        client_mrc = voc_line.get('client_mrc', 0)
+        service_currency = voc_line.get('currency') or service.get('service_currency', 'USD')
+    else:
+        client_mrc = service.get('client_mrc', 0)
+        service_currency = service.get('service_currency', 'USD')
+    return client_mrc, service_currency
+
+
+def resolve_vpl_exchange_rate(service_is_usd: bool, vpl: List[Dict]) -> Optional[float]:
+    """
+    USD -> local rate for converting VPL prices (always in USD)
+
+    Returns None when the service is in USD or there are no VPL rows, so the
+    live rate is only fetched when it is actually used.
+    """
+    if service_is_usd or not vpl:
+        return None
+    return get_usd_to_brl_rate()
+
+
+def build_ctx(service: Dict, voc_line: Dict, vpl: List[Dict]) -> AnalyzeCtx:
+    """Build the scoring context for a service"""
+    client_mrc, service_currency = resolve_currency(service, voc_line)
+    service_is_usd = (service_currency == 'USD')
+    return AnalyzeCtx(
+        client_mrc=client_mrc,
+        service_currency=service_currency,
+        service_is_usd=service_is_usd,
+        vpl_exchange_rate=resolve_vpl_exchange_rate(service_is_usd, vpl)
+    )
+
+
+def _bandwidth_display(row: Dict) -> str:
+    """Bandwidth label for a VQ/VPL row, e.g. '100 Mbps'"""
+    bw_bps = row.get('bandwidth_bps')
+    return f"{bw_bps / 1_000_000:.0f} Mbps" if bw_bps else row.get('bandwidth', 'N/A')
+
+
+def _neg_stats(stats: Dict, include_successful: bool = True) -> Dict:
+    """Rounded negotiation stats block shown with a quote or VPL vendor"""
+    neg_stats = {'total_negotiations': stats['total_negotiations']}
+    if include_successful:
+        neg_stats['successful_negotiations'] = stats['successful_negotiations']
+    neg_stats['success_rate'] = round(stats['success_rate'], 1)
+    neg_stats['avg_discount'] = round(stats['avg_discount'], 1)
+    neg_stats['best_discount'] = round(stats['best_discount'], 1)
+    return neg_stats
+
+
+def _projection(scores: Dict[str, list], i: int, stats: Dict, neg_stats: Dict) -> Optional[Dict]:
+    """
+    projected_with_negotiation block for row i of score_rows() output
+
+    Returns None when the vendor has no average discount to project with.
+    best_* fields are only included when there is a best discount.
+    """
+    if not stats['avg_discount'] > 0:
+        return None
+
+    projection = {
+        'mrc': scores['neg_mrc'][i],
+        'gm': scores['neg_gm'][i],
+        'gm_status': scores['neg_gm_status'][i],
+        'avg_discount': neg_stats['avg_discount'],
+        'best_discount': neg_stats['best_discount']
+    }
+    if stats['best_discount'] > 0:
+        projection['best_mrc'] = scores['best_mrc'][i]
+        projection['best_gm'] = scores['best_gm'][i]
+        projection['best_gm_status'] = scores['best_gm_status'][i]
+    return projection
+
+
+def _score_quotes(quotes: List[Dict], ctx: AnalyzeCtx, get_stats: StatsLookup):
+    """Fetch vendor stats for each quote and score all quotes in one pass"""
+    stats_rows = [get_stats(vq.get('vendor_name', 'Unknown')) for vq in quotes]
+    scores = score_rows(
+        column(quotes, 'mrc'),
+        column(quotes, 'exchange_rate', 1.0),
+        ctx.client_mrc,
+        ctx.service_is_usd,
+        discount_column(stats_rows, 'avg_discount'),
+        discount_column(stats_rows, 'best_discount')
+    )
+    return stats_rows, scores
+
+
+def _quote_base(vq: Dict, i: int, scores: Dict[str, list], ctx: AnalyzeCtx, neo4j_id) -> Dict:
+    """Fields shared by associated and nearby quote payloads"""
+    vq_exchange_rate = vq.get('exchange_rate', 1.0)
+    converted = scores['converted'][i]
+    return {
+        'vendor_name': vq.get('vendor_name', 'Unknown'),
+        'quickbase_id': vq.get('quickbase_id'),
+        'neo4j_id': neo4j_id,
+        'mrc': scores['mrc'][i],
+        'mrc_currency': ctx.service_currency,
+        'mrc_original': scores['mrc_raw'][i] if converted else None,
+        'mrc_original_currency': 'BRL' if converted else None,
+        'exchange_rate': vq_exchange_rate if vq_exchange_rate and vq_exchange_rate > 1 else None,
+        'gm': scores['gm'][i],
+        'gm_status': scores['gm_status'][i],
+        'bandwidth': _bandwidth_display(vq),
+        'status': vq.get('status', 'N/A'),
+        'lead_time': vq.get('lead_time', 'N/A'),
+    }
+
+
+def _add_negotiation(vq_data: Dict, i: int, scores: Dict[str, list], stats: Optional[Dict]):
+    """Add negotiation history fields to a quote payload"""
+    vq_data['has_negotiation_history'] = stats and stats.get('has_data', False)
+    vq_data['negotiation_stats'] = None
+    vq_data['projected_with_negotiation'] = None
+    if stats and stats.get('has_data'):
+        vq_data['negotiation_stats'] = _neg_stats(stats)
+        vq_data['projected_with_negotiation'] = _projection(scores, i, stats, vq_data['negotiation_stats'])
+
+
+def score_associated(
+    associated: List[Dict],
+    ctx: AnalyzeCtx,
+    get_stats: StatsLookup,
+    get_renewal_stats: StatsLookup,
+    get_delivered_mrc: StatsLookup
+) -> List[Dict]:
+    """
+    Score the vendor quotes directly associated with the service
+
+    Args:
+        associated: Associated VQ records from Neo4j
+        ctx: Scoring context
+        get_stats: Vendor name -> negotiation stats (VQ creation)
+        get_renewal_stats: Vendor name -> renewal stats
+        get_delivered_mrc: Vendor name -> delivered MRC totals
+
+    Returns:
+        List of vendor quote payloads
+    """
+    stats_rows, scores = _score_quotes(associated, ctx, get_stats)
+
+    results = []
+    for i, vq in enumerate(associated):
+        vendor_name = vq.get('vendor_name', 'Unknown')
+        stats = stats_rows[i]
+        renewal_stats = get_renewal_stats(vendor_name)
+        delivered_mrc_stats = get_delivered_mrc(vendor_name)
+
+        vq_data = _quote_base(vq, i, scores, ctx, vq.get('id'))
+        _add_negotiation(vq_data, i, scores, stats)
+        vq_data['has_renewal_history'] = renewal_stats and renewal_stats.get('has_data', False)
+        vq_data['renewal_stats'] = None
+        vq_data['has_delivered_services'] = delivered_mrc_stats and delivered_mrc_stats.get('has_data', False)
+        vq_data['delivered_mrc_total'] = round(delivered_mrc_stats.get('total_mrc_usd', 0), 2) if delivered_mrc_stats else 0
+        vq_data['delivered_count'] = delivered_mrc_stats.get('delivered_count', 0) if delivered_mrc_stats else 0
+
+        # Add renewal stats if available
+        if renewal_stats and renewal_stats.get('has_data'):
+            vq_data['renewal_stats'] = {
+                'total_renewals': renewal_stats['total_renewals'],
+                'successful_renewals': renewal_stats['successful_renewals'],
+                'success_rate': round(renewal_stats['success_rate'], 1),
+                'avg_discount': round(renewal_stats['avg_discount'], 1)
+            }
+
+        results.append(vq_data)
+
+    return results
+
+
+def score_nearby(
+    nearby: List[Dict],
+    ctx: AnalyzeCtx,
+    get_stats: StatsLookup,
+    radius: float = 2000
+) -> List[Dict]:
+    """
+    Score nearby vendor quotes within radius meters of the service
+
+    Args:
+        nearby: Nearby VQ records (Neo4j types already converted)
+        ctx: Scoring context
+        get_stats: Vendor name -> negotiation stats
+        radius: Maximum distance in meters
+
+    Returns:
+        List of nearby quote payloads
+    """
+    nearby = [vq for vq in nearby if vq.get('distance_meters', 0) <= radius]
+    stats_rows, scores = _score_quotes(nearby, ctx, get_stats)
+
+    results = []
+    for i, vq in enumerate(nearby):
+        stats = stats_rows[i]
+        vq_data = _quote_base(vq, i, scores, ctx, vq.get('vq_id'))
+        vq_data['distance_meters'] = round(vq.get('distance_meters', 0))
+        vq_data['date_created'] = vq.get('date_created', 'N/A')
+        _add_negotiation(vq_data, i, scores, stats)
+        results.append(vq_data)
+
+    return results
+
+
+def score_vpl(
+    vpl: List[Dict],
+    ctx: AnalyzeCtx,
+    service_bw: Optional[int],
+    get_stats: StatsLookup
+) -> List[Dict]:
+    """
+    Pick and score the most relevant VPL option per vendor
+
+    VPL prices come in USD and are converted to the service currency with
+    ctx.vpl_exchange_rate.
+
+    Args:
+        vpl: VPL records from Neo4j
+        ctx: Scoring context
+        service_bw: Service bandwidth in bps, or None
+        get_stats: Vendor name -> negotiation stats
+
+    Returns:
+        List of per-vendor VPL payloads (vendor_name, options, negotiation_stats)
+    """
+    service_is_usd = ctx.service_is_usd
+
+    # Convert every price to the service currency and score it in one pass
+    vpl_scores = score_vpl_rows(
+        column(vpl, 'mrc'),
+        column(vpl, 'nrc'),
+        ctx.client_mrc,
+        ctx.vpl_exchange_rate
+    )
+
+    # Keep only the most relevant bandwidth option per vendor, then build
+    # response dicts for the selected rows only
+    selected = select_vpl_options(
+        [v.get('vendor_name', 'Unknown') for v in vpl],
+        column(vpl, 'bandwidth_bps'),
+        np.array(vpl_scores['gm']),
+        service_bw
+    )
+
+    vpl_by_vendor = {}
+    for vendor_name, i in selected:
+        v = vpl[i]
+        option = {
+            'mrc': vpl_scores['mrc'][i],
+            'mrc_currency': ctx.service_currency,
+            'mrc_usd': vpl_scores['mrc_usd'][i] if not service_is_usd else None,  # Only show USD ref if service is not in USD
+            'nrc': vpl_scores['nrc'][i],
+            'nrc_currency': ctx.service_currency,
+            'nrc_usd': vpl_scores['nrc_usd'][i] if not service_is_usd else None,  # Only show USD ref if service is not in USD
+            'gm': vpl_scores['gm'][i],
+            'gm_status': vpl_scores['gm_status'][i],
+            'bandwidth': _bandwidth_display(v),
+            'bandwidth_bps': v.get('bandwidth_bps'),
+            'service_type': v.get('service_type', 'N/A')
+        }
+        vpl_by_vendor[vendor_name] = {
+            'vendor_name': vendor_name,
+            'options': [option],
+            'negotiation_stats': None
+        }
+
+    # Add negotiation stats to VPL vendors, projecting each selected option
+    # from its rounded MRC (already in service currency)
+    vpl_vendor_stats = [get_stats(vendor_name) for vendor_name in vpl_by_vendor]
+    vpl_options = [vendor_data['options'][0] for vendor_data in vpl_by_vendor.values()]
+    proj_scores = score_rows(
+        column(vpl_options, 'mrc'),
+        np.ones(len(vpl_options)),
+        ctx.client_mrc,
+        False,
+        discount_column(vpl_vendor_stats, 'avg_discount'),
+        discount_column(vpl_vendor_stats, 'best_discount')
+    )
+
+    for i, (vendor_data, stats) in enumerate(zip(vpl_by_vendor.values(), vpl_vendor_stats)):
+        if stats and stats.get('has_data'):
+            vendor_data['negotiation_stats'] = _neg_stats(stats, include_successful=False)
+
+            # Add projected prices with negotiation
+            projection = _projection(proj_scores, i, stats, vendor_data['negotiation_stats'])
+            if projection:
+                vpl_options[i]['projected_with_negotiation'] = projection
+
+    return list(vpl_by_vendor.values())
@@ -0,0 +1,180 @@
+"""
+In-Process Caching
+
+Small thread-safe TTL + LRU cache used in front of slow backend lookups
+(Quickbase / Neo4j) whose results only change when new deals are recorded.
+"""
+
+import functools
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Bounded mapping whose entries expire after a fixed time-to-live
+
+    The least recently used entry is evicted once maxsize is reached.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 300.0):
+        """
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Seconds an entry stays valid
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store value under key, evicting the least recently used entry if full"""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        """Drop the entry for key, if any"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class PersistentTTLCache(TTLCache):
+    """
+    TTLCache backed by a SQLite file, so entries survive process restarts
+
+    Reads are served from memory first; on a memory miss the file is checked
+    (its entries live for disk_ttl, usually much longer than ttl) and a hit is
+    promoted back into memory. Values must be JSON-serializable; keys are
+    stored by repr(). Several processes can share the file.
+    """
+
+    def __init__(self, path: str, maxsize: int = 4096, ttl: float = 300.0, disk_ttl: float = 86400.0):
+        """
+        Args:
+            path: SQLite file to store entries in
+            maxsize: Maximum number of entries kept in memory
+            ttl: Seconds an entry stays valid in memory
+            disk_ttl: Seconds an entry stays valid on disk
+        """
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.disk_ttl = disk_ttl
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        with self._db:
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires_at REAL, value TEXT)'
+            )
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key (memory, then disk), or default"""
+        value = super().get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    'SELECT value FROM cache WHERE key = ? AND expires_at > ?', (repr(key), time.time())
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[Cache] Error reading persistent cache: {e}")
+            return default
+        if row is None:
+            return default
+
+        value = json.loads(row[0])
+        super().set(key, value)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store value under key in memory and on disk"""
+        super().set(key, value)
+        try:
+            with self._db_lock, self._db:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO cache (key, expires_at, value) VALUES (?, ?, ?)',
+                    (repr(key), time.time() + self.disk_ttl, json.dumps(value))
+                )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"[Cache] Error writing persistent cache: {e}")
+
+    def pop(self, key: Hashable):
+        """Drop the entry for key from memory and disk, if any"""
+        super().pop(key)
+        with self._db_lock, self._db:
+            self._db.execute('DELETE FROM cache WHERE key = ?', (repr(key),))
+
+    def clear(self):
+        """Drop every entry, in memory and on disk"""
+        super().clear()
+        with self._db_lock, self._db:
+            self._db.execute('DELETE FROM cache')
+
+
+def cache_key(name: str, args: tuple, kwargs: Optional[dict] = None) -> tuple:
+    """Key ttl_cached() uses for a call to method name with these arguments"""
+    return (name, args, tuple(sorted(kwargs.items()))) if kwargs else (name, args)
+
+
+def ttl_cached(cache: TTLCache, cache_if: Optional[Callable[[Any], bool]] = None):
+    """
+    Cache a client method's results in a TTLCache
+
+    The key is the method name plus its arguments (self is ignored, so all
+    client instances share the cache). Concurrent misses for the same key
+    may both call through; the last result wins.
+
+    Args:
+        cache: Cache to store results in
+        cache_if: Optional predicate; results it rejects (e.g. error
+            fallbacks) are returned but not cached
+    """
+    def decorator(method):
+        name = method.__name__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = cache_key(name, args, kwargs)
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = method(self, *args, **kwargs)
+                if cache_if is None or cache_if(value):
+                    cache.set(key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -0,0 +1,60 @@
+"""
+Circuit Breaker
+
+Stops calling a backend that keeps failing, so callers get their fallback
+immediately instead of each waiting out a timeout.
+"""
+
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    Opens after fail_max consecutive failures and stays open for reset_timeout
+    seconds; after that one trial call is let through (half-open), and its
+    outcome closes the circuit again or re-opens it.
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 30.0):
+        """
+        Args:
+            fail_max: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial call
+        """
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None  # time.monotonic() when the circuit opened
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go through now"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Half-open: let this call through; others wait for its outcome
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        """Count a failed call, opening the circuit at fail_max in a row"""
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.fail_max:
+                if self._opened_at is None:
+                    print(f"[CircuitBreaker] Open after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
@@ -2,56 +2,133 @@
 Currency conversion utilities using live exchange rates
 """
 
+import orjson
 import requests
-from datetime import datetime, timedelta
-import json
+import threading
+import time
 
-# Simple cache to avoid repeated API calls
-_exchange_rate_cache = {}
-_cache_expiry = None
+RATE_CACHE_SECONDS = 3600  # live rate is reused for 1 hour
+FALLBACK_CACHE_SECONDS = 300  # after a failed fetch, don't retry the API for 5 minutes
+FALLBACK_USD_BRL_RATE = 5.40
+RATES_URL = "https://api.exchangerate-api.com/v4/latest/USD"  # free tier, no API key
+RATES_TIMEOUT = (2, 4)  # (connect, read) seconds
 
-def get_usd_to_brl_rate():
+
+class _RateCache:
     """
-    Get current USD to BRL exchange rate from exchangerate-api.com (free tier)
+    USD rate table with stale-while-revalidate
 
-    Returns:
-        float: Exchange rate (e.g., 5.40 means 1 USD = 5.40 BRL)
+    A fresh table is returned straight from memory. Once it goes stale the
+    stale table keeps being served while one background thread refreshes it,
+    so only the very first lookup in a process waits on the API. A failed
+    refresh keeps the last good table (retried after FALLBACK_CACHE_SECONDS);
+    the fixed fallback BRL rate is only used if no fetch ever succeeded.
     """
-    global _exchange_rate_cache, _cache_expiry
 
-    # Check cache (valid for 1 hour)
-    now = datetime.now()
-    if _cache_expiry and now < _cache_expiry and 'USD_BRL' in _exchange_rate_cache:
-        return _exchange_rate_cache['USD_BRL']
+    def __init__(self):
+        self.rates = None  # Currency code -> units per 1 USD
+        self.expires_at = 0.0  # time.monotonic() deadline
+        self.fetched = False  # whether rates came from the API
+        self.refreshing = False
+        self.lock = threading.Lock()
+        self.session = requests.Session()
+
+    def get(self) -> dict:
+        """Current rate table (possibly stale while a refresh runs)"""
+        # Fast path: no lock needed to read a fresh cached value
+        rates = self.rates
+        if rates is not None and time.monotonic() < self.expires_at:
+            return rates
+
+        with self.lock:
+            if self.rates is not None:
+                if time.monotonic() >= self.expires_at and not self.refreshing:
+                    self.refreshing = True
+                    threading.Thread(target=self._refresh, name='fx-refresh', daemon=True).start()
+                return self.rates
+
+            # Nothing cached yet: fetch now (concurrent callers wait for it)
+            self._store(self._fetch())
+            return self.rates
+
+    def _refresh(self):
+        """Background refresh of a stale table"""
+        try:
+            rates = self._fetch()
+            with self.lock:
+                self._store(rates)
+        finally:
+            self.refreshing = False
+
+    def _fetch(self):
+        """Fetch the USD rate table from the API, or None on failure"""
+        try:
+            response = self.session.get(RATES_URL, timeout=RATES_TIMEOUT)
+
+            if response.status_code == 200:
+                rates = orjson.loads(response.content)['rates']
+                if rates.get('BRL'):
+                    print(f"[Currency] Fetched live USD/BRL rate: {rates['BRL']}")
+                    return rates
+
+        except Exception as e:
+            print(f"[Currency] Error fetching exchange rate: {e}")
+
+        return None
+
+    def _store(self, rates):
+        """Cache a fetch result (caller holds the lock)"""
+        now = time.monotonic()
+        if rates is not None:
+            # Cache the result for 1 hour
+            self.rates = rates
+            self.fetched = True
+            self.expires_at = now + RATE_CACHE_SECONDS
+            return
+
+        if self.fetched:
+            print("[Currency] Keeping last fetched rates")
+        else:
+            # Fallback to a reasonable default if API fails
+            print(f"[Currency] Using fallback USD/BRL rate: {FALLBACK_USD_BRL_RATE:.2f}")
+            self.rates = {'USD': 1.0, 'BRL': FALLBACK_USD_BRL_RATE}
+        # Don't retry the API on every call while it is failing
+        self.expires_at = now + FALLBACK_CACHE_SECONDS
 
-    try:
-        # Using exchangerate-api.com free tier (no API key needed)
-        url = "https://api.exchangerate-api.com/v4/latest/USD"
-        response = requests.get(url, timeout=5)
 
-        if response.status_code == 200:
-            data = response.json()
-            rate = data['rates'].get('BRL')
+_rate_cache = _RateCache()
 
-            if rate:
-                # Cache the result for 1 hour
-                _exchange_rate_cache['USD_BRL'] = rate
-                _cache_expiry = now + timedelta(hours=1)
-                print(f"[Currency] Fetched live USD/BRL rate: {rate}")
-                return rate
 
-    except Exception as e:
-        print(f"[Currency] Error fetching exchange rate: {e}")
+def _get_usd_rates():
+    """
+    Get the USD -> currency rate table from exchangerate-api.com (free tier)
+
+    The API returns every currency in one response, so the whole table is
+    cached in-process and any pair is answered from memory (see _RateCache).
+
+    Returns:
+        dict: Currency code -> units per 1 USD (always includes 'BRL')
+    """
+    return _rate_cache.get()
+
+
+def get_usd_to_brl_rate():
+    """
+    Get current USD to BRL exchange rate
 
-    # Fallback to a reasonable default if API fails
-    print("[Currency] Using fallback USD/BRL rate: 5.40")
-    return 5.40  # Fallback rate
+    Returns:
+        float: Exchange rate (e.g., 5.40 means 1 USD = 5.40 BRL)
+    """
+    return _get_usd_rates()['BRL']
 
 
 def get_exchange_rate(from_currency: str, to_currency: str) -> float:
     """
     Get exchange rate between two currencies
 
+    Any pair in the cached USD rate table is supported (cross rates go
+    through USD).
+
     Args:
         from_currency: Source currency code (e.g., 'USD')
         to_currency: Target currency code (e.g., 'BRL')
@@ -59,13 +136,16 @@ def get_exchange_rate(from_currency: str, to_currency: str) -> float:
     Returns:
         float: Exchange rate
     """
-    # Currently only supporting USD <-> BRL
-    if from_currency == 'USD' and to_currency == 'BRL':
-        return get_usd_to_brl_rate()
-    elif from_currency == 'BRL' and to_currency == 'USD':
-        return 1.0 / get_usd_to_brl_rate()
-    elif from_currency == to_currency:
+    if from_currency == to_currency:
         return 1.0
+
+    rates = _get_usd_rates()
+    if from_currency == 'USD' and to_currency in rates:
+        return rates[to_currency]
+    elif to_currency == 'USD' and from_currency in rates:
+        return 1.0 / rates[from_currency]
+    elif from_currency in rates and to_currency in rates:
+        return rates[to_currency] / rates[from_currency]
     else:
         # Fallback for unsupported currency pairs
         print(f"[Currency] Unsupported currency pair: {from_currency}/{to_currency}")
@@ -0,0 +1,87 @@
+"""
+Geohash Utilities
+Encodes coordinates as geohash cells and lists the cells covering a bounding box
+"""
+from typing import List, Optional
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def _cell_counts(precision: int):
+    """Number of (latitude, longitude) cell rows/columns at a precision"""
+    bits = 5 * precision
+    return 1 << (bits // 2), 1 << (bits - bits // 2)
+
+
+def _encode_cell(lat_idx: int, lon_idx: int, precision: int) -> str:
+    """Geohash of the cell at the given row/column (bits interleaved, longitude first)"""
+    bits = 5 * precision
+    lat_bits = bits // 2
+    lon_bits = bits - lat_bits
+
+    code = 0
+    for i in range(bits):
+        if i % 2 == 0:
+            lon_bits -= 1
+            code = (code << 1) | ((lon_idx >> lon_bits) & 1)
+        else:
+            lat_bits -= 1
+            code = (code << 1) | ((lat_idx >> lat_bits) & 1)
+
+    return ''.join(_BASE32[(code >> (5 * (precision - 1 - i))) & 31] for i in range(precision))
+
+
+def encode(lat: float, lon: float, precision: int = 6) -> str:
+    """
+    Geohash of a coordinate
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+        precision: Number of geohash characters (default: 6, ~1.2km x 0.6km)
+
+    Returns:
+        Geohash string
+    """
+    lat_cells, lon_cells = _cell_counts(precision)
+    lat_idx = min(int((lat + 90.0) / 180.0 * lat_cells), lat_cells - 1)
+    lon_idx = min(int((lon + 180.0) / 360.0 * lon_cells), lon_cells - 1)
+    return _encode_cell(lat_idx, lon_idx, precision)
+
+
+def cells_in_box(
+    lat_min: float,
+    lat_max: float,
+    lon_min: float,
+    lon_max: float,
+    precision: int = 6,
+    max_cells: int = 64
+) -> Optional[List[str]]:
+    """
+    Geohash cells covering a bounding box
+
+    Args:
+        lat_min: Southern edge
+        lat_max: Northern edge
+        lon_min: Western edge
+        lon_max: Eastern edge (boxes crossing the antimeridian are not supported)
+        precision: Number of geohash characters
+        max_cells: Give up above this many cells
+
+    Returns:
+        List of geohash strings, or None if the box needs more than max_cells
+    """
+    lat_cells, lon_cells = _cell_counts(precision)
+    lat_lo = max(int((lat_min + 90.0) / 180.0 * lat_cells), 0)
+    lat_hi = min(int((lat_max + 90.0) / 180.0 * lat_cells), lat_cells - 1)
+    lon_lo = max(int((lon_min + 180.0) / 360.0 * lon_cells), 0)
+    lon_hi = min(int((lon_max + 180.0) / 360.0 * lon_cells), lon_cells - 1)
+
+    if (lat_hi - lat_lo + 1) * (lon_hi - lon_lo + 1) > max_cells:
+        return None
+
+    return [
+        _encode_cell(lat_idx, lon_idx, precision)
+        for lat_idx in range(lat_lo, lat_hi + 1)
+        for lon_idx in range(lon_lo, lon_hi + 1)
+    ]
@@ -9,6 +9,8 @@ Generates intelligent negotiation strategies by combining:
 
 from typing import Dict, List, Optional
 
+from utils.scoring import gm_status
+
 
 def generate_negotiation_strategy(
     vendor_name: str,
@@ -33,6 +35,11 @@ def generate_negotiation_strategy(
         Dict with negotiation strategy recommendations
     """
 
+    # Percent-of-current-MRC scale factor, so each discount below is one multiply.
+    # GMs keep the exact division: they are classified by gm_status(), and a
+    # reciprocal can land them just below a threshold (e.g. 49.999... for 50).
+    pct_of_current = (100.0 / current_mrc) if current_mrc > 0 else 0.0
+
     current_gm = ((client_mrc - current_mrc) / client_mrc * 100) if client_mrc > 0 else 0
 
     # Target GMs
@@ -40,8 +47,8 @@ def generate_negotiation_strategy(
     target_mrc_40 = client_mrc * 0.6  # 40% GM
 
     # Required discounts to reach targets
-    discount_for_40 = ((current_mrc - target_mrc_40) / current_mrc * 100) if current_mrc > 0 else 0
-    discount_for_50 = ((current_mrc - target_mrc_50) / current_mrc * 100) if current_mrc > 0 else 0
+    discount_for_40 = ((current_mrc - target_mrc_40) * pct_of_current) if current_mrc > 0 else 0
+    discount_for_50 = ((current_mrc - target_mrc_50) * pct_of_current) if current_mrc > 0 else 0
 
     # Initialize strategy
     strategy = {
@@ -49,7 +56,7 @@ def generate_negotiation_strategy(
         'current_situation': {
             'current_mrc': round(current_mrc, 2),
             'current_gm': round(current_gm, 1),
-            'gm_status': 'success' if current_gm >= 50 else 'warning' if current_gm >= 40 else 'danger'
+            'gm_status': gm_status(current_gm)
         },
         'targets': {
             'gm_40': {
@@ -69,6 +76,22 @@ def generate_negotiation_strategy(
         'recommendations': []
     }
 
+    # No nearby quotes and no usable history (common for vendors we haven't
+    # dealt with): nothing below would add evidence or recommendations
+    if not nearby_quotes and not any(
+        stats and (stats.get('has_data') or stats.get('avg_discount', 0) > 0)
+        for stats in (negotiation_stats, renewal_stats)
+    ):
+        return strategy
+
+    # Recommendations are collected per priority and concatenated at the end
+    # (high first), keeping insertion order within each priority
+    by_priority = {'high': [], 'medium': [], 'low': []}
+
+    # Discounts the nearby quotes imply vs current MRC (also fed into the
+    # combined recommendation in section 4)
+    nearby_discounts = []
+
     # 1. Analyze nearby quotes from same vendor
     if nearby_quotes:
         nearby_analysis = []
@@ -86,7 +109,8 @@ def generate_negotiation_strategy(
                 # Check if nearby quote has better pricing
                 if nearby_mrc < current_mrc:
                     lower_prices_count += 1
-                    discount_vs_current = ((current_mrc - nearby_mrc) / current_mrc * 100)
+                    discount_vs_current = ((current_mrc - nearby_mrc) * pct_of_current)
+                    nearby_discounts.append(discount_vs_current)
 
                     nearby_analysis.append({
                         'service_id': quote.get('service_id', 'N/A'),
@@ -103,7 +127,7 @@ def generate_negotiation_strategy(
 
             if lower_prices_count > 0:
                 best_nearby = min(nearby_analysis, key=lambda x: x['mrc'])
-                strategy['recommendations'].append({
+                by_priority['high'].append({
                     'type': 'nearby_pricing',
                     'priority': 'high',
                     'title': f'{vendor_name} has {lower_prices_count} nearby quote(s) with lower pricing',
@@ -150,7 +174,7 @@ def generate_negotiation_strategy(
             confidence = 'high' if total_negotiations >= 10 else 'medium' if total_negotiations >= 5 else 'low'
 
             # Always recommend negotiation based on historical data
-            strategy['recommendations'].append({
+            by_priority['high'].append({
                 'type': 'historical_new_contract',
                 'priority': 'high',
                 'title': f'{vendor_name} historically offers {avg_discount:.1f}% average discount on new contracts',
@@ -163,7 +187,7 @@ def generate_negotiation_strategy(
 
             # Always show best case scenario when available
             if best_discount > avg_discount:
-                strategy['recommendations'].append({
+                by_priority['high'].append({
                     'type': 'best_case_opportunity',
                     'priority': 'high',
                     'title': f'Best historical discount: {best_discount:.1f}% (improve margin to {projected_best_gm:.1f}% GM)',
@@ -191,7 +215,7 @@ def generate_negotiation_strategy(
 
             confidence = 'high' if total_renewals >= 5 else 'medium' if total_renewals >= 3 else 'low'
 
-            strategy['recommendations'].append({
+            by_priority['medium'].append({
                 'type': 'historical_renewal',
                 'priority': 'medium',
                 'title': f'{vendor_name} historically offers {renewal_avg_discount:.1f}% average discount on renewals',
@@ -210,12 +234,7 @@ def generate_negotiation_strategy(
     if renewal_stats and renewal_stats.get('avg_discount', 0) > 0:
         all_discounts.append(renewal_stats['avg_discount'])
 
-    if nearby_quotes:
-        for quote in nearby_quotes:
-            nearby_mrc = quote.get('mrc', 0)
-            if nearby_mrc > 0 and nearby_mrc < current_mrc:
-                discount = ((current_mrc - nearby_mrc) / current_mrc * 100)
-                all_discounts.append(discount)
+    all_discounts.extend(nearby_discounts)
 
     if all_discounts:
         recommended_discount = sum(all_discounts) / len(all_discounts)
@@ -229,13 +248,12 @@ def generate_negotiation_strategy(
             'max_discount': round(max_discount, 1),
             'recommended_mrc': round(recommended_mrc, 2),
             'projected_gm': round(recommended_gm, 1),
-            'gm_status': 'success' if recommended_gm >= 50 else 'warning' if recommended_gm >= 40 else 'danger',
+            'gm_status': gm_status(recommended_gm),
             'data_sources': len(all_discounts),
             'confidence': 'high' if len(all_discounts) >= 3 else 'medium' if len(all_discounts) >= 2 else 'low'
         }
 
-    # Sort recommendations by priority
-    priority_order = {'high': 1, 'medium': 2, 'low': 3}
-    strategy['recommendations'].sort(key=lambda x: priority_order.get(x.get('priority', 'low'), 3))
+    # Recommendations ordered by priority
+    strategy['recommendations'] = by_priority['high'] + by_priority['medium'] + by_priority['low']
 
     return strategy
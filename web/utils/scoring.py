@@ -0,0 +1,389 @@
+"""
+Quote Scoring
+
+Vectorized currency conversion and gross margin (GM) math for vendor quotes
+and VPL options. Rows are packed into NumPy arrays once so the arithmetic
+runs in a single pass instead of per-row Python loops.
+
+When Numba is installed the quote and VPL scoring loops are JIT-compiled;
+otherwise the equivalent NumPy implementations are used.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional, NumPy path is used instead
+    njit = None
+
+# GM status labels indexed by status code: (gm >= 40) + (gm >= 50)
+_STATUS = ('danger', 'warning', 'success')
+_STATUS_ICONS = ('❌', '⚠️', '✅')
+
+
+def column(rows: List[Dict], key: str, default: float = 0.0) -> np.ndarray:
+    """
+    Pack one numeric field of a list of records into a float64 array
+
+    Args:
+        rows: List of record dictionaries
+        key: Field to extract
+        default: Value used when the field is missing or None
+
+    Returns:
+        1-D float64 array with one entry per row
+    """
+    return np.fromiter(
+        ((row.get(key) or default) for row in rows),
+        dtype=np.float64,
+        count=len(rows)
+    )
+
+
+def discount_column(stats_rows: List[Optional[Dict]], key: str) -> np.ndarray:
+    """
+    Pack a discount field from per-row vendor stats into a float64 array
+
+    Rows without historical data get a 0% discount.
+    """
+    return np.fromiter(
+        ((stats.get(key) or 0.0) if stats and stats.get('has_data') else 0.0 for stats in stats_rows),
+        dtype=np.float64,
+        count=len(stats_rows)
+    )
+
+
+def rounded(values: np.ndarray, ndigits: int) -> list:
+    """
+    Round an array into a plain list of floats
+
+    Uses Python's round() (correctly rounded) rather than np.round(), which
+    can differ on half-way values and would change the numbers shown in the UI.
+    """
+    return [round(value, ndigits) for value in values.tolist()]
+
+
+def argmin_where(values: np.ndarray, mask: np.ndarray) -> Optional[int]:
+    """Index of the smallest value where mask is True (first on ties), or None if mask is empty"""
+    candidates = np.flatnonzero(mask)
+    if candidates.size == 0:
+        return None
+    return int(candidates[values[candidates].argmin()])
+
+
+def gross_margin(mrc: np.ndarray, client_mrc: float) -> np.ndarray:
+    """GM % of each MRC against the client MRC (0 when client MRC is not positive)"""
+    if not client_mrc or client_mrc <= 0:
+        return np.zeros_like(mrc)
+    return (client_mrc - mrc) / client_mrc * 100.0
+
+
+def haversine_meters(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """
+    Great-circle distance from one point to many, in meters
+
+    Args:
+        lat: Latitude of the origin
+        lon: Longitude of the origin
+        lats: Latitudes of the other points
+        lons: Longitudes of the other points
+
+    Returns:
+        Distance to each point (NaN where its coordinates are missing)
+    """
+    phi = np.radians(lats)
+    dphi = phi - np.radians(lat)
+    dlam = np.radians(lons - lon)
+    a = np.sin(dphi / 2) ** 2 + np.cos(np.radians(lat)) * np.cos(phi) * np.sin(dlam / 2) ** 2
+    return 2 * 6371000 * np.arcsin(np.sqrt(a))
+
+
+def gm_status(gm: float) -> str:
+    """Classify a GM % as success (>= 50), warning (>= 40) or danger"""
+    return _STATUS[(gm >= 40) + (gm >= 50)]
+
+
+def gm_status_icon(gm: float) -> str:
+    """gm_status() as the icon used in CLI output"""
+    return _STATUS_ICONS[(gm >= 40) + (gm >= 50)]
+
+
+def status_labels(codes: np.ndarray) -> List[str]:
+    """
+    GM status codes as a list of labels
+
+    Indexes the _STATUS tuple so every row references one of three shared
+    strings.
+    """
+    return [_STATUS[code] for code in codes.tolist()]
+
+
+def gm_status_codes(gm: np.ndarray) -> np.ndarray:
+    """GM status codes: 0 = danger, 1 = warning (>= 40), 2 = success (>= 50)"""
+    return (gm >= 40).astype(np.int8) + (gm >= 50).astype(np.int8)
+
+
+def _score_numpy(mrc_raw, exchange_rate, client_mrc, service_is_usd, avg_discount, best_discount):
+    """NumPy implementation of the quote scoring kernel"""
+    if service_is_usd:
+        to_convert = exchange_rate > 1
+        mrc = np.where(to_convert, mrc_raw / np.where(to_convert, exchange_rate, 1.0), mrc_raw)
+    else:
+        mrc = mrc_raw
+
+    gm = gross_margin(mrc, client_mrc)
+    neg_mrc = mrc * (1 - avg_discount / 100)
+    neg_gm = gross_margin(neg_mrc, client_mrc)
+    best_mrc = mrc * (1 - best_discount / 100)
+    best_gm = gross_margin(best_mrc, client_mrc)
+
+    return (
+        mrc, gm, gm_status_codes(gm),
+        neg_mrc, neg_gm, gm_status_codes(neg_gm),
+        best_mrc, best_gm, gm_status_codes(best_gm)
+    )
+
+
+def _score_loop(mrc_raw, exchange_rate, client_mrc, service_is_usd, avg_discount, best_discount):
+    """Row loop version of the quote scoring kernel, compiled with Numba"""
+    n = mrc_raw.shape[0]
+    mrc = np.empty(n)
+    gm = np.empty(n)
+    status = np.empty(n, np.int8)
+    neg_mrc = np.empty(n)
+    neg_gm = np.empty(n)
+    neg_status = np.empty(n, np.int8)
+    best_mrc = np.empty(n)
+    best_gm = np.empty(n)
+    best_status = np.empty(n, np.int8)
+
+    for i in range(n):
+        m = mrc_raw[i]
+        if service_is_usd and exchange_rate[i] > 1:
+            m = m / exchange_rate[i]
+        nm = m * (1 - avg_discount[i] / 100)
+        bm = m * (1 - best_discount[i] / 100)
+
+        if client_mrc > 0:
+            g = (client_mrc - m) / client_mrc * 100.0
+            ng = (client_mrc - nm) / client_mrc * 100.0
+            bg = (client_mrc - bm) / client_mrc * 100.0
+        else:
+            g = 0.0
+            ng = 0.0
+            bg = 0.0
+
+        mrc[i] = m
+        gm[i] = g
+        status[i] = (g >= 40) + (g >= 50)
+        neg_mrc[i] = nm
+        neg_gm[i] = ng
+        neg_status[i] = (ng >= 40) + (ng >= 50)
+        best_mrc[i] = bm
+        best_gm[i] = bg
+        best_status[i] = (bg >= 40) + (bg >= 50)
+
+    return mrc, gm, status, neg_mrc, neg_gm, neg_status, best_mrc, best_gm, best_status
+
+
+def _vpl_numpy(mrc_usd, nrc_usd, client_mrc, exchange_rate):
+    """NumPy implementation of the VPL scoring kernel"""
+    mrc = mrc_usd * exchange_rate
+    nrc = nrc_usd * exchange_rate
+    gm = np.where(mrc > 0, gross_margin(mrc, client_mrc), 0.0)
+    return mrc, nrc, gm, gm_status_codes(gm)
+
+
+def _vpl_loop(mrc_usd, nrc_usd, client_mrc, exchange_rate):
+    """Row loop version of the VPL scoring kernel, compiled with Numba"""
+    n = mrc_usd.shape[0]
+    mrc = np.empty(n)
+    nrc = np.empty(n)
+    gm = np.empty(n)
+    status = np.empty(n, np.int8)
+
+    for i in range(n):
+        m = mrc_usd[i] * exchange_rate
+        g = 0.0
+        if m > 0 and client_mrc > 0:
+            g = (client_mrc - m) / client_mrc * 100.0
+
+        mrc[i] = m
+        nrc[i] = nrc_usd[i] * exchange_rate
+        gm[i] = g
+        status[i] = (g >= 40) + (g >= 50)
+
+    return mrc, nrc, gm, status
+
+
+# No fastmath: results must match the NumPy path exactly
+if njit is not None:
+    _score_kernel = njit(cache=True)(_score_loop)
+    _vpl_kernel = njit(cache=True)(_vpl_loop)
+else:
+    _score_kernel = _score_numpy
+    _vpl_kernel = _vpl_numpy
+
+
+def warm_up():
+    """Compile the scoring kernels ahead of the first request (no-op without Numba)"""
+    one = np.ones(1)
+    _score_kernel(one, one, 1.0, True, one, one)
+    _vpl_kernel(one, one, 1.0, 1.0)
+
+
+def score_rows(
+    mrc_raw: np.ndarray,
+    exchange_rate: np.ndarray,
+    client_mrc: float,
+    service_is_usd: bool,
+    avg_discount: np.ndarray,
+    best_discount: np.ndarray
+) -> Dict[str, list]:
+    """
+    Score vendor quotes against the client MRC
+
+    VQ MRCs in local currency (exchange rate > 1) are converted to USD when
+    the service is billed in USD. Projected MRC/GM are computed for the
+    average and best historical discounts of each row's vendor.
+
+    Returns:
+        Dict of column name -> list (rounded, ready for JSON)
+    """
+    (mrc, gm, status,
+     neg_mrc, neg_gm, neg_status,
+     best_mrc, best_gm, best_status) = _score_kernel(
+        mrc_raw, exchange_rate, float(client_mrc or 0.0), bool(service_is_usd), avg_discount, best_discount
+    )
+
+    return {
+        'mrc_raw': rounded(mrc_raw, 2),
+        'converted': (mrc_raw != mrc).tolist(),
+        'mrc': rounded(mrc, 2),
+        'gm': rounded(gm, 1),
+        'gm_status': status_labels(status),
+        'neg_mrc': rounded(neg_mrc, 2),
+        'neg_gm': rounded(neg_gm, 1),
+        'neg_gm_status': status_labels(neg_status),
+        'best_mrc': rounded(best_mrc, 2),
+        'best_gm': rounded(best_gm, 1),
+        'best_gm_status': status_labels(best_status)
+    }
+
+
+def score_vpl_rows(
+    mrc_usd: np.ndarray,
+    nrc_usd: np.ndarray,
+    client_mrc: float,
+    exchange_rate: Optional[float]
+) -> Dict[str, list]:
+    """
+    Score VPL prices (always in USD) against the client MRC
+
+    Args:
+        mrc_usd: VPL MRC values in USD
+        nrc_usd: VPL NRC values in USD
+        client_mrc: Client MRC in service currency
+        exchange_rate: USD -> local rate, or None when the service is in USD
+
+    Returns:
+        Dict of column name -> list (rounded, ready for JSON)
+    """
+    # A rate of 1.0 leaves USD values unchanged (x * 1.0 == x exactly)
+    mrc, nrc, gm, status = _vpl_kernel(
+        mrc_usd, nrc_usd, float(client_mrc or 0.0), 1.0 if exchange_rate is None else float(exchange_rate)
+    )
+
+    return {
+        'mrc_usd': rounded(mrc_usd, 2),
+        'nrc_usd': rounded(nrc_usd, 2),
+        'mrc': rounded(mrc, 2),
+        'nrc': rounded(nrc, 2),
+        'gm': rounded(gm, 1),
+        'gm_status': status_labels(status)
+    }
+
+
+def closest_bandwidth_rows(bandwidth_bps: np.ndarray, service_bw: int) -> np.ndarray:
+    """
+    Rows whose bandwidth best matches the service bandwidth
+
+    Every exact match if there is one, else the first row with the closest
+    higher bandwidth, else the last row with the closest lower bandwidth.
+
+    Args:
+        bandwidth_bps: Bandwidth of each row in bps (0 when unknown)
+        service_bw: Service bandwidth in bps
+
+    Returns:
+        Row indices in ascending order (empty when there are no rows)
+    """
+    # Linear scans with masks; no sort needed for one service bandwidth
+    exact = np.flatnonzero(bandwidth_bps == service_bw)
+    if exact.size or not bandwidth_bps.size:
+        return exact
+
+    higher = argmin_where(bandwidth_bps, bandwidth_bps > service_bw)
+    if higher is not None:
+        return np.array([higher])
+
+    # Every row is lower: the highest one, last on ties
+    return np.array([bandwidth_bps.size - 1 - int(bandwidth_bps[::-1].argmax())])
+
+
+def select_vpl_options(
+    vendor_names: List[str],
+    bandwidth_bps: np.ndarray,
+    gm: np.ndarray,
+    service_bw: Optional[int]
+) -> List[Tuple[str, int]]:
+    """
+    Pick the most relevant VPL option per vendor
+
+    With a service bandwidth the pick is, in order of preference: the exact
+    bandwidth match with the best GM, the closest higher bandwidth, the
+    closest lower bandwidth. Without one it is the best GM option. Ties are
+    broken by lowest bandwidth, then by row order.
+
+    Args:
+        vendor_names: Vendor name of each VPL row
+        bandwidth_bps: Bandwidth of each row in bps (0 when unknown)
+        gm: Rounded GM % of each row
+        service_bw: Service bandwidth in bps, or None
+
+    Returns:
+        (vendor_name, row index) pairs in order of first appearance of the vendor
+    """
+    if not vendor_names:
+        return []
+
+    # Number vendors in order of first appearance
+    vendor_ids = {}
+    vendor_idx = np.fromiter(
+        (vendor_ids.setdefault(name, len(vendor_ids)) for name in vendor_names),
+        dtype=np.int64,
+        count=len(vendor_names)
+    )
+    rows = np.arange(len(vendor_names))
+
+    if service_bw:
+        exact = bandwidth_bps == service_bw
+        higher = bandwidth_bps > service_bw
+        # Tier 0 = exact (best GM first), 1 = higher (smallest first), 2 = lower (largest, last row first)
+        tier = np.where(exact, 0, np.where(higher, 1, 2))
+        key = np.where(exact, -gm, np.where(higher, bandwidth_bps, -bandwidth_bps))
+        row_key = np.where(tier == 2, -rows, rows)
+        order = np.lexsort((row_key, key, tier, vendor_idx))
+    else:
+        order = np.lexsort((rows, bandwidth_bps, -gm, vendor_idx))
+
+    # First row of each vendor group in the sorted order is that vendor's pick
+    sorted_vendor = vendor_idx[order]
+    is_first = np.empty(len(order), dtype=bool)
+    is_first[0] = True
+    np.not_equal(sorted_vendor[1:], sorted_vendor[:-1], out=is_first[1:])
+
+    names = list(vendor_ids)
+    return [(names[vendor], int(row)) for vendor, row in zip(sorted_vendor[is_first].tolist(), order[is_first].tolist())]